@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from app.core.metrics import chroma_errors_total, chroma_seconds
+
+if TYPE_CHECKING:
+    from chromadb.api.models.Collection import Collection
+
+
+class WorkerPool:
+    """
+    Thread pool started on first use.
+
+    `shutdown` waits for in-flight work; the next call starts a new pool, so
+    the app can be started and stopped again in one process (e.g. in tests).
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Wait for in-flight calls and stop the worker threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class AsyncCollection:
+    """
+    Async facade over a Chroma collection.
+
+    Chroma's client is synchronous, so every call is run on a bounded thread
+    pool instead of on the event loop. The pool is shared by all collections,
+    so its size caps how many storage calls run at the same time. Each call
+    is timed by verb.
+
+    The collection comes from `get_collection`, which is called on the
+    worker thread, so opening it lazily never blocks the event loop.
+    """
+
+    def __init__(self, get_collection: Callable[[], "Collection"], pool: WorkerPool):
+        self._get_collection = get_collection
+        self._pool = pool
+
+    @property
+    def collection(self) -> "Collection":
+        return self._get_collection()
+
+    def _call(self, verb: str, **kwargs: Any) -> Any:
+        return getattr(self.collection, verb)(**kwargs)
+
+    async def _run(self, verb: str, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            with chroma_seconds.time(verb=verb):
+                return await loop.run_in_executor(self._pool.get(), partial(self._call, verb, **kwargs))
+        except Exception:
+            chroma_errors_total.inc(verb=verb)
+            raise
+
+    async def add(self, **kwargs: Any) -> None:
+        await self._run("add", **kwargs)
+
+    async def upsert(self, **kwargs: Any) -> None:
+        await self._run("upsert", **kwargs)
+
+    async def get(self, **kwargs: Any) -> Any:
+        return await self._run("get", **kwargs)
+
+    async def query(self, **kwargs: Any) -> Any:
+        return await self._run("query", **kwargs)
+
+    async def update(self, **kwargs: Any) -> None:
+        await self._run("update", **kwargs)
+
+    async def delete(self, **kwargs: Any) -> None:
+        await self._run("delete", **kwargs)
+
+    async def count(self) -> int:
+        return await self._run("count")
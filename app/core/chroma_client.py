@@ -1,12 +1,137 @@
-import chromadb
-from chromadb.config import Settings
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-client = chromadb.PersistentClient(
-    path="./chroma_db",
-    settings=Settings()
+from app.core.async_collection import WorkerPool
+from app.core.config import (
+    CHROMA_INDEX_CACHE_SIZE,
+    CHROMA_MAX_WORKERS,
+    CHROMA_PATH,
+    HNSW_CONSTRUCTION_EF,
+    HNSW_M,
+    HNSW_SEARCH_EF,
+    NOTES_COLLECTION,
 )
+from app.core.logger import logger
 
-notes_collection = client.get_or_create_collection(
-    name="notes",
-    metadata={"hnsw:space": "cosine"}  # optional but recommended
-)
+if TYPE_CHECKING:
+    from chromadb.api import ClientAPI
+    from chromadb.api.models.Collection import Collection
+
+_lock = threading.Lock()
+_client: Optional["ClientAPI"] = None
+_notes_collection: Optional["Collection"] = None
+
+
+def hnsw_metadata(
+    m: int = HNSW_M,
+    construction_ef: int = HNSW_CONSTRUCTION_EF,
+    search_ef: int = HNSW_SEARCH_EF,
+) -> Dict[str, Any]:
+    """Collection metadata carrying the HNSW parameters (0 = Chroma default)."""
+    metadata: Dict[str, Any] = {"hnsw:space": "cosine"}
+    if m > 0:
+        metadata["hnsw:M"] = m
+    if construction_ef > 0:
+        metadata["hnsw:construction_ef"] = construction_ef
+    if search_ef > 0:
+        metadata["hnsw:search_ef"] = search_ef
+    return metadata
+
+
+def open_client(path: str, index_cache_size: int = CHROMA_INDEX_CACHE_SIZE) -> "ClientAPI":
+    """
+    A persistent Chroma client, keeping at most `index_cache_size` collection
+    HNSW indexes loaded (0 = Chroma's default).
+
+    Chroma sizes that cache from the open file limit only and has no setting
+    for it. This does what chromadb.PersistentClient does, but lowers the
+    cache size of the Rust bindings API (chromadb 1.x) before it starts;
+    where that API is different, a plain PersistentClient is returned.
+    """
+    import chromadb
+
+    if index_cache_size <= 0:
+        return chromadb.PersistentClient(path=path)
+
+    from chromadb.api import ServerAPI
+    from chromadb.api.client import Client
+    from chromadb.config import Settings, System
+
+    system = System(
+        Settings(chroma_api_impl="chromadb.api.rust.RustBindingsAPI", is_persistent=True, persist_directory=path)
+    )
+    api = system.instance(ServerAPI)
+    if not isinstance(getattr(api, "hnsw_cache_size", None), int):
+        logger.warning(
+            f"chromadb {chromadb.__version__} does not expose its HNSW index cache size; "
+            "CHROMA_INDEX_CACHE_SIZE is ignored"
+        )
+        return chromadb.PersistentClient(path=path)
+
+    api.hnsw_cache_size = min(api.hnsw_cache_size, index_cache_size)
+    system.start()
+    return Client.from_system(system)
+
+
+def get_client() -> "ClientAPI":
+    """
+    The persistent Chroma client for CHROMA_PATH, opened on first use.
+
+    chromadb is imported here rather than at module level, so importing the
+    app (or a script that never touches storage) does not pay for it.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = open_client(CHROMA_PATH)
+    return _client
+
+
+def get_collection(name: str) -> "Collection":
+    """A notes collection by name, created with the configured HNSW parameters if missing."""
+    collection = get_client().get_or_create_collection(name=name, metadata=hnsw_metadata())
+
+    # HNSW parameters are fixed at creation; an existing collection keeps its own.
+    configured = {k: v for k, v in hnsw_metadata().items() if k != "hnsw:space"}
+    current = collection.metadata or {}
+    if any(current.get(k) != v for k, v in configured.items()):
+        logger.warning(
+            f"Collection '{name}' was built with different HNSW parameters "
+            f"than configured ({configured}); run `python -m app.scripts.rebuild_index` to apply them"
+        )
+    return collection
+
+
+def get_notes_collection() -> "Collection":
+    """The default notes collection (NOTES_COLLECTION), opened on first use."""
+    global _notes_collection
+    if _notes_collection is None:
+        collection = get_collection(NOTES_COLLECTION)
+        with _lock:
+            if _notes_collection is None:
+                _notes_collection = collection
+    return _notes_collection
+
+
+def warm_index(collection: "Collection") -> int:
+    """
+    Load a collection's HNSW index into memory.
+
+    Chroma reads a collection's index from disk on its first query, so one
+    nearest-neighbour lookup with a stored vector is run up front instead of
+    on the first user search.
+
+    Returns:
+        int: Number of notes in the collection.
+    """
+    total = collection.count()
+    if total:
+        sample = collection.get(limit=1, include=["embeddings"]).get("embeddings")
+        if sample is not None and len(sample) > 0:
+            collection.query(query_embeddings=[list(sample[0])], n_results=1, include=[])
+    return total
+
+
+# Runs the Chroma calls of request handlers (see `AsyncCollection`), for every collection.
+chroma_pool = WorkerPool(CHROMA_MAX_WORKERS, thread_name_prefix="chroma")
@@ -0,0 +1,146 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _int_env(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to `default`."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _float_env(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to `default`."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+# ---- Embeddings ----
+# Provider: "gemini" (remote API), "onnx" (local CPU model) or "hashing" (deterministic, for tests).
+EMBED_PROVIDER = os.getenv("EMBED_PROVIDER", "gemini")
+GEN_API_KEY = os.getenv("GEN_API_KEY")
+# Override the Gemini API endpoint, e.g. to point at a local stand-in for load tests.
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")
+EMBED_MODEL = os.getenv("EMBED_MODEL", "gemini-embedding-001")
+# Keep only the first N dimensions of each vector (Matryoshka truncation,
+# re-normalized). 0 keeps the model's full output.
+EMBED_OUTPUT_DIM = _int_env("EMBED_OUTPUT_DIM", 0)
+
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "")
+ONNX_TOKENIZER_PATH = os.getenv("ONNX_TOKENIZER_PATH", "")
+ONNX_MAX_LENGTH = _int_env("ONNX_MAX_LENGTH", 256)
+ONNX_BATCH_SIZE = _int_env("ONNX_BATCH_SIZE", 32)
+
+HASHING_EMBED_DIMENSION = _int_env("HASHING_EMBED_DIMENSION", 256)
+
+# ---- Embedding batcher ----
+# Concurrent embed requests are collected for up to EMBED_BATCH_MAX_WAIT_MS
+# (or until EMBED_BATCH_MAX_SIZE texts are pending) and sent as one API call.
+EMBED_BATCH_MAX_SIZE = _int_env("EMBED_BATCH_MAX_SIZE", 100)
+EMBED_BATCH_MAX_WAIT_MS = _float_env("EMBED_BATCH_MAX_WAIT_MS", 5.0)
+# Maximum number of embedding API calls in flight at once.
+EMBED_MAX_CONCURRENCY = _int_env("EMBED_MAX_CONCURRENCY", 4)
+
+# ---- Embedding cache ----
+# Persistent, content-addressed cache of embeddings with an in-process LRU.
+EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "./embedding_cache.sqlite3")
+EMBED_CACHE_MEMORY_ENTRIES = _int_env("EMBED_CACHE_MEMORY_ENTRIES", 10_000)
+EMBED_CACHE_MAX_MB = _int_env("EMBED_CACHE_MAX_MB", 512)
+
+# ---- Search result cache ----
+# LRU + TTL cache for /notes/search, invalidated on every write. 0 disables it.
+SEARCH_CACHE_MAX_ENTRIES = _int_env("SEARCH_CACHE_MAX_ENTRIES", 1024)
+SEARCH_CACHE_TTL_SECONDS = _float_env("SEARCH_CACHE_TTL_SECONDS", 60.0)
+
+# ---- Exact search ----
+# Normalized note vectors mirrored into a memory-mapped matrix for exact
+# top-k search. "auto" searches use it while the collection has at most
+# EXACT_SEARCH_MAX_ROWS notes.
+EXACT_SEARCH_ENABLED = os.getenv("EXACT_SEARCH_ENABLED", "true").lower() in ("1", "true", "yes")
+EXACT_SEARCH_MAX_ROWS = _int_env("EXACT_SEARCH_MAX_ROWS", 20_000)
+VECTOR_MATRIX_PATH = os.getenv("VECTOR_MATRIX_PATH", "./vector_matrix")
+VECTOR_MATRIX_DTYPE = os.getenv("VECTOR_MATRIX_DTYPE", "float32")
+
+# ---- Lexical search ----
+# In-memory BM25 index over note titles and contents, built from Chroma on
+# first use. Hybrid searches fuse the top HYBRID_CANDIDATES of each ranking
+# with reciprocal-rank fusion (constant RRF_K).
+LEXICAL_SEARCH_ENABLED = os.getenv("LEXICAL_SEARCH_ENABLED", "true").lower() in ("1", "true", "yes")
+BM25_K1 = _float_env("BM25_K1", 1.2)
+BM25_B = _float_env("BM25_B", 0.75)
+HYBRID_CANDIDATES = _int_env("HYBRID_CANDIDATES", 50)
+RRF_K = _int_env("RRF_K", 60)
+
+# ---- Document ingest ----
+# Long documents are streamed in, split into overlapping chunks of
+# DOCUMENT_CHUNK_CHARS characters and stored as one note per chunk.
+# DOCUMENT_EMBED_BATCH chunks are embedded and written at a time. Searches
+# fetch SEARCH_CHUNK_OVERFETCH x top_k candidates so that collapsing chunks
+# to the best one per document still fills top_k.
+DOCUMENT_CHUNK_CHARS = _int_env("DOCUMENT_CHUNK_CHARS", 2000)
+DOCUMENT_CHUNK_OVERLAP = _int_env("DOCUMENT_CHUNK_OVERLAP", 200)
+DOCUMENT_EMBED_BATCH = _int_env("DOCUMENT_EMBED_BATCH", 32)
+DOCUMENT_MAX_MB = _int_env("DOCUMENT_MAX_MB", 50)
+SEARCH_CHUNK_OVERFETCH = max(_int_env("SEARCH_CHUNK_OVERFETCH", 3), 1)
+
+# ---- Async ingest queue ----
+# `mode=async` creates are stored in a SQLite queue and answered with 202 and
+# a job ID. A background worker embeds up to INGEST_BATCH_SIZE queued notes
+# per round trip and writes them, retrying a failed batch up to
+# INGEST_MAX_ATTEMPTS times. At most INGEST_MAX_QUEUED notes wait at once
+# (0 = unlimited); finished jobs are kept for INGEST_JOB_RETENTION_HOURS.
+INGEST_QUEUE_PATH = os.getenv("INGEST_QUEUE_PATH", "./ingest_queue.sqlite3")
+INGEST_BATCH_SIZE = max(_int_env("INGEST_BATCH_SIZE", 100), 1)
+INGEST_MAX_ATTEMPTS = max(_int_env("INGEST_MAX_ATTEMPTS", 3), 1)
+INGEST_MAX_QUEUED = _int_env("INGEST_MAX_QUEUED", 100_000)
+INGEST_POLL_SECONDS = _float_env("INGEST_POLL_SECONDS", 1.0)
+INGEST_JOB_RETENTION_HOURS = _float_env("INGEST_JOB_RETENTION_HOURS", 24.0)
+
+# ---- Ingest dedup ----
+# Creates can be checked against the stored notes before anything is
+# embedded: exact duplicates by content hash, near-duplicates by a 64-bit
+# SimHash over DEDUP_SHINGLE_SIZE-word shingles within DEDUP_MAX_DISTANCE
+# bits (notes of at least DEDUP_MIN_TOKENS words). DEDUP_POLICY is the
+# default for synchronous creates without `dedup`: "off", "reject", "merge"
+# or "link".
+DEDUP_POLICY = os.getenv("DEDUP_POLICY", "off").lower()
+if DEDUP_POLICY not in ("off", "reject", "merge", "link"):
+    raise ValueError(f"DEDUP_POLICY must be off, reject, merge or link, not {DEDUP_POLICY!r}")
+DEDUP_MAX_DISTANCE = _int_env("DEDUP_MAX_DISTANCE", 6)
+DEDUP_SHINGLE_SIZE = _int_env("DEDUP_SHINGLE_SIZE", 2)
+DEDUP_MIN_TOKENS = _int_env("DEDUP_MIN_TOKENS", 8)
+
+# ---- Vector store ----
+CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
+NOTES_COLLECTION = os.getenv("NOTES_COLLECTION", "notes")
+# HNSW index parameters, applied when the collection is created. 0 keeps
+# Chroma's default. Changing them for an existing collection needs
+# `python -m app.scripts.rebuild_index`.
+HNSW_M = _int_env("HNSW_M", 0)
+HNSW_CONSTRUCTION_EF = _int_env("HNSW_CONSTRUCTION_EF", 0)
+HNSW_SEARCH_EF = _int_env("HNSW_SEARCH_EF", 0)
+# Size of the thread pool that runs Chroma calls off the event loop.
+CHROMA_MAX_WORKERS = _int_env("CHROMA_MAX_WORKERS", 4)
+# Tenant namespaces (/tenants/{ns}/notes) kept open at once. Idle ones beyond
+# this are closed, dropping their in-memory lexical index and matrix mapping.
+NAMESPACE_CACHE_SIZE = max(_int_env("NAMESPACE_CACHE_SIZE", 32), 1)
+# Cap on the collection HNSW indexes Chroma keeps loaded (LRU-unloaded beyond
+# it, so indexes of closed namespaces are freed); 0 keeps Chroma's own size,
+# derived from the open file limit. Chroma 1.x can fail to reload an unloaded
+# index of a collection with fewer than ~1000 notes until restart, so only
+# set this when namespaces are large.
+CHROMA_INDEX_CACHE_SIZE = max(_int_env("CHROMA_INDEX_CACHE_SIZE", 0), 0)
+# Maximum number of notes accepted by one batch request.
+NOTES_BATCH_MAX_ITEMS = _int_env("NOTES_BATCH_MAX_ITEMS", 1000)
+# Maximum number of queries accepted by one batch search request.
+SEARCH_BATCH_MAX_QUERIES = _int_env("SEARCH_BATCH_MAX_QUERIES", 32)
+# Largest top_k accepted by the search endpoints.
+SEARCH_MAX_TOP_K = _int_env("SEARCH_MAX_TOP_K", 100)
+# Number of notes read per Chroma call when streaming an export.
+EXPORT_CHUNK_SIZE = _int_env("EXPORT_CHUNK_SIZE", 500)
@@ -0,0 +1,147 @@
+import hashlib
+import threading
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.core.lexical_index import tokenize
+
+EXACT = "exact"
+NEAR = "near"
+
+_BITS = np.arange(64, dtype=np.uint64)
+
+
+class DuplicateMatch(NamedTuple):
+    note_id: str
+    kind: str  # EXACT or NEAR
+    distance: int  # Hamming distance of the SimHash fingerprints (0 for exact matches)
+
+
+def content_hash(text: str) -> str:
+    """Hash of the content with Unicode compatibility forms and runs of whitespace folded."""
+    normalized = " ".join(unicodedata.normalize("NFKC", text).split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def simhash(tokens: Sequence[str], shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash over word shingles: each bit is set when most shingle
+    hashes have it set, so similar texts get fingerprints that differ in
+    few bits.
+    """
+    if len(tokens) <= shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i : i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    votes = ((hashes[:, None] >> _BITS) & np.uint64(1)).sum(axis=0)
+    return sum(1 << int(bit) for bit in np.flatnonzero(votes * 2 > len(shingles)))
+
+
+class DedupIndex:
+    """
+    In-memory index of note contents for duplicate detection at ingest.
+
+    Exact duplicates are found by content hash. Near-duplicates are found by
+    SimHash: fingerprints are split into `max_distance + 1` bands, so any two
+    within `max_distance` bits agree on at least one band and only notes
+    sharing a band are compared. Notes shorter than `min_tokens` words only
+    take part in exact matching.
+    """
+
+    def __init__(self, max_distance: int = 6, shingle_size: int = 2, min_tokens: int = 8):
+        self.max_distance = max(0, min(max_distance, 15))
+        self.shingle_size = max(shingle_size, 1)
+        self.min_tokens = min_tokens
+        self._bands = self.max_distance + 1
+        self._band_bits = 64 // self._bands
+        self._lock = threading.RLock()
+        self._by_hash: Dict[str, Set[str]] = {}
+        self._buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._stored: Dict[str, Tuple[str, Optional[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._stored)
+
+    def fingerprint(self, document: str) -> Tuple[str, Optional[int]]:
+        """Content hash and SimHash of a document (None when too short for near matching)."""
+        tokens = tokenize(document)
+        fingerprint = simhash(tokens, self.shingle_size) if len(tokens) >= self.min_tokens else None
+        return content_hash(document), fingerprint
+
+    def find(self, fingerprint: Tuple[str, Optional[int]]) -> Optional[DuplicateMatch]:
+        """The stored note the fingerprinted document duplicates, exact matches first; None if unique."""
+        digest, value = fingerprint
+        with self._lock:
+            exact = self._by_hash.get(digest)
+            if exact:
+                return DuplicateMatch(min(exact), EXACT, 0)
+            if value is None:
+                return None
+
+            candidates: Set[str] = set()
+            for key in self._band_keys(value):
+                candidates.update(self._buckets.get(key, ()))
+            matches = sorted(
+                (bin(value ^ self._stored[note_id][1]).count("1"), note_id) for note_id in candidates
+            )
+            if matches and matches[0][0] <= self.max_distance:
+                return DuplicateMatch(matches[0][1], NEAR, matches[0][0])
+            return None
+
+    def upsert(self, ids: Sequence[str], documents: Sequence[str]) -> None:
+        """Index (or re-index) the given notes."""
+        fingerprints = [self.fingerprint(document or "") for document in documents]
+        with self._lock:
+            for note_id, fingerprint in zip(ids, fingerprints):
+                self.add(note_id, fingerprint)
+
+    def add(self, note_id: str, fingerprint: Tuple[str, Optional[int]]) -> None:
+        """Index a note under an already computed fingerprint."""
+        with self._lock:
+            self._remove(note_id)
+            digest, value = fingerprint
+            self._by_hash.setdefault(digest, set()).add(note_id)
+            if value is not None:
+                for key in self._band_keys(value):
+                    self._buckets.setdefault(key, set()).add(note_id)
+            self._stored[note_id] = fingerprint
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            for note_id in ids:
+                self._remove(note_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_hash.clear()
+            self._buckets.clear()
+            self._stored.clear()
+
+    def _band_keys(self, value: int) -> List[Tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [(band, (value >> (band * self._band_bits)) & mask) for band in range(self._bands)]
+
+    def _remove(self, note_id: str) -> None:
+        stored = self._stored.pop(note_id, None)
+        if stored is None:
+            return
+        digest, value = stored
+        _discard(self._by_hash, digest, note_id)
+        if value is not None:
+            for key in self._band_keys(value):
+                _discard(self._buckets, key, note_id)
+
+
+def _discard(mapping: Dict, key: object, note_id: str) -> None:
+    members = mapping.get(key)
+    if members is not None:
+        members.discard(note_id)
+        if not members:
+            del mapping[key]
@@ -0,0 +1,155 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Union
+
+from app.core.logger import logger
+
+EmbedBatchFn = Callable[[List[str]], List[List[float]]]
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent embedding requests into batched API calls.
+
+    Callers submit single texts and receive a Future. A background worker
+    collects pending texts until either `max_batch_size` texts are waiting or
+    `max_wait_ms` has passed since the oldest one arrived, sends them in one
+    `embed_batch` call and resolves each caller's Future with its vector.
+
+    Identical texts that are pending or in flight share the same Future, so
+    they are only sent to the model once. At most `max_concurrency` batches
+    are in flight at any time.
+
+    When a batch fails, its texts are retried one at a time, so a text the
+    model rejects only fails the callers waiting for that text.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        max_batch_size: int = 100,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 1,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self.max_concurrency = max_concurrency
+
+        self._cond = threading.Condition()
+        # Texts waiting for the next batch, in arrival order.
+        self._pending: List[str] = []
+        self._pending_since: float = 0.0
+        # Every text that is pending or in flight, mapped to its shared Future.
+        self._futures: Dict[str, "Future[List[float]]"] = {}
+        self._workers: List[threading.Thread] = []
+
+    def submit(self, text: str) -> "Future[List[float]]":
+        """
+        Queue a text for embedding.
+
+        Args:
+            text (str): Text to embed.
+
+        Returns:
+            Future[List[float]]: Resolves to the embedding vector.
+        """
+        with self._cond:
+            future = self._futures.get(text)
+            if future is not None:
+                return future
+
+            future = Future()
+            self._futures[text] = future
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(text)
+            self._ensure_workers()
+            self._cond.notify()
+            return future
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a single text, blocking until its batch has been processed."""
+        return self.submit(text).result()
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, blocking until all of them are available."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def _ensure_workers(self) -> None:
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < self.max_concurrency:
+            worker = threading.Thread(
+                target=self._run,
+                name=f"embedding-batcher-{len(self._workers)}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_batch(self) -> List[str]:
+        """Block until a batch is ready to be sent, then take it off the queue."""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+
+                if len(self._pending) >= self.max_batch_size:
+                    break
+
+                remaining = self._pending_since + self.max_wait - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(timeout=remaining)
+
+            batch = self._pending[: self.max_batch_size]
+            # Leftover texts keep their original arrival time, so they go out
+            # with the next batch without waiting another full window.
+            del self._pending[: self.max_batch_size]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+
+            try:
+                results = self._embed_checked(batch)
+            except Exception as exc:
+                if len(batch) == 1:
+                    logger.error(f"Embedding failed: {exc}")
+                    results = [exc]
+                else:
+                    logger.warning(f"Embedding batch of {len(batch)} failed, retrying one by one: {exc}")
+                    results = [self._embed_one(text) for text in batch]
+
+            with self._cond:
+                futures = [self._futures.pop(text) for text in batch]
+
+            for future, result in zip(futures, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _embed_checked(self, batch: List[str]) -> List[List[float]]:
+        vectors = self._embed_batch(batch)
+        if len(vectors) != len(batch):
+            raise ValueError(f"Embedding model returned {len(vectors)} vectors for {len(batch)} texts")
+        return vectors
+
+    def _embed_one(self, text: str) -> Union[List[float], Exception]:
+        try:
+            return self._embed_checked([text])[0]
+        except Exception as exc:  # resolved into the callers waiting for this text
+            logger.error(f"Embedding failed: {exc}")
+            return exc
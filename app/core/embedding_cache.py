@@ -0,0 +1,224 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from app.core.logger import logger
+
+# Keys per `IN (...)` lookup, under SQLite's default bound-variable limit.
+_SQL_VARIABLES = 500
+
+
+def cache_key(model: str, dimension: Optional[int], text: str) -> str:
+    """Content address for an embedding: model name + output size + text hash."""
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(str(dimension or 0).encode("ascii"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache: an in-process LRU in front of a SQLite file.
+
+    Vectors are stored as float32 blobs keyed by `cache_key`. When the file
+    grows past `max_disk_bytes`, the least recently used entries are evicted
+    until it is back under 90% of the limit.
+
+    The memory level has its own lock and never waits for SQLite, so it can
+    be checked from the event loop; the disk level is meant to be read from
+    worker threads. Disk hits update `last_used` in batches, written with
+    the next `put_many` or once `touch_batch` hits are pending.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_entries: int = 10_000,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        touch_batch: int = 256,
+    ):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.touch_batch = touch_batch
+
+        self._lock = threading.Lock()  # memory level, stats and pending touches
+        self._db_lock = threading.Lock()  # the SQLite connection
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._db.commit()
+        self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def get_memory(self, key: str) -> Optional[List[float]]:
+        """Look up a vector in the memory level only; safe to call on the event loop."""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+            return vector
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up several vectors, in memory first and then with one disk read.
+
+        Args:
+            keys (List[str]): Keys built with `cache_key`.
+
+        Returns:
+            Dict[str, List[float]]: The cached vectors by key; misses are left out.
+        """
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self._stats["memory_hits"] += len(found)
+
+        wanted = list(dict.fromkeys(key for key in keys if key not in found))
+        rows = []
+        if wanted:
+            with self._db_lock:
+                for start in range(0, len(wanted), _SQL_VARIABLES):
+                    chunk = wanted[start : start + _SQL_VARIABLES]
+                    rows += self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+
+        now = time.time()
+        with self._lock:
+            for key, blob in rows:
+                vector = array("f", blob).tolist()
+                self._remember(key, vector)
+                self._touched[key] = now
+                found[key] = vector
+            self._stats["disk_hits"] += len(rows)
+            self._stats["misses"] += len(wanted) - len(rows)
+            flush = len(self._touched) >= self.touch_batch
+
+        if flush:
+            with self._db_lock:
+                self._write_touches()
+                self._db.commit()
+        return found
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Look up a cached vector.
+
+        Args:
+            key (str): Key built with `cache_key`.
+
+        Returns:
+            Optional[List[float]]: The vector, or None on a miss.
+        """
+        return self.get_many([key]).get(key)
+
+    def put_many(self, keys: List[str], vectors: List[List[float]]) -> None:
+        """Store vectors in both cache levels, evicting old disk entries if needed."""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+                blob = array("f", vector).tobytes()
+                rows.append((key, blob, len(blob), now))
+        if not rows:
+            return
+
+        with self._db_lock:
+            self._write_touches()
+            self._disk_bytes += self._replaced_size_delta(rows)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+            self._db.commit()
+        with self._lock:
+            self._stats["writes"] += len(rows)
+
+    def flush(self) -> None:
+        """Write pending `last_used` updates."""
+        with self._db_lock:
+            self._write_touches()
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters plus current cache sizes; does not wait for the disk level."""
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write_touches(self) -> None:
+        """Apply pending `last_used` updates; the caller holds `_db_lock` and commits."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            self._db.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?", [(at, key) for key, at in touched.items()]
+            )
+
+    def _replaced_size_delta(self, rows: List[tuple]) -> int:
+        """Bytes added by `rows`, net of the entries they overwrite."""
+        keys = [row[0] for row in rows]
+        placeholders = ",".join("?" * len(keys))
+        existing = self._db.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM embeddings WHERE key IN ({placeholders})", keys
+        ).fetchone()[0]
+        return sum(row[2] for row in rows) - existing
+
+    def _evict(self) -> None:
+        target = int(self.max_disk_bytes * 0.9)
+        cursor = self._db.execute("SELECT key, size FROM embeddings ORDER BY last_used")
+        evicted = []
+        freed = 0
+        for key, size in cursor:
+            if self._disk_bytes - freed <= target:
+                break
+            evicted.append((key,))
+            freed += size
+
+        self._db.executemany("DELETE FROM embeddings WHERE key = ?", evicted)
+        self._disk_bytes -= freed
+        with self._lock:
+            self._stats["evictions"] += len(evicted)
+        logger.info(f"Embedding cache evicted {len(evicted)} entries ({freed} bytes)")
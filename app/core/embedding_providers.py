@@ -0,0 +1,195 @@
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from app.core.config import (
+    EMBED_MODEL,
+    EMBED_OUTPUT_DIM,
+    EMBED_PROVIDER,
+    GEMINI_BASE_URL,
+    GEN_API_KEY,
+    HASHING_EMBED_DIMENSION,
+    ONNX_BATCH_SIZE,
+    ONNX_MAX_LENGTH,
+    ONNX_MODEL_PATH,
+    ONNX_TOKENIZER_PATH,
+)
+
+
+class EmbeddingProvider(ABC):
+    """
+    A backend that turns texts into embedding vectors.
+
+    `name` identifies the model that produced a vector (it is part of the
+    embedding cache key), so two providers must never share a name unless
+    their vectors are interchangeable.
+    """
+
+    name: str
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts (List[str]): Texts to embed.
+
+        Returns:
+            List[List[float]]: One vector per input text, in input order.
+        """
+
+
+class GeminiEmbeddingProvider(EmbeddingProvider):
+    """
+    Remote embeddings from the Gemini API.
+
+    When `output_dimensionality` is set the API returns truncated vectors,
+    which saves bandwidth; they still need re-normalizing by the caller.
+    `base_url` replaces the public endpoint (used by the load-test stand-in).
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        model: str = "gemini-embedding-001",
+        output_dimensionality: int = 0,
+        base_url: str = "",
+    ):
+        from google import genai
+        from google.genai import types
+
+        self.name = f"gemini/{model}"
+        self.model = model
+        http_options = types.HttpOptions(base_url=base_url) if base_url else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+        self.config = (
+            types.EmbedContentConfig(output_dimensionality=output_dimensionality)
+            if output_dimensionality > 0
+            else None
+        )
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.models.embed_content(
+            model=self.model,
+            contents=texts,
+            config=self.config,
+        )
+
+        embeddings = response.embeddings or []
+        if len(embeddings) != len(texts) or not all(e.values for e in embeddings):
+            raise ValueError("No embedding values returned from model")
+
+        return [list(e.values or []) for e in embeddings]
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """
+    Local CPU embeddings from a sentence-transformer style ONNX model.
+
+    Token embeddings are mean-pooled over the attention mask and
+    L2-normalized. Inputs are run through the model `batch_size` at a time.
+    """
+
+    def __init__(self, model_path: str, tokenizer_path: str, max_length: int = 256, batch_size: int = 32):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.name = f"onnx/{model_path}"
+        self.batch_size = batch_size
+        self.session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[i : i + self.batch_size]))
+        return vectors
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds: Dict[str, Any] = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+
+        output = self.session.run(None, feeds)[0]
+        if output.ndim == 3:
+            # (batch, tokens, dim) -> mean over real tokens
+            mask = attention_mask[:, :, None].astype(output.dtype)
+            output = (output * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        norms = np.linalg.norm(output, axis=1, keepdims=True)
+        output = output / np.clip(norms, 1e-12, None)
+        return output.astype(np.float32).tolist()
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic bag-of-words embeddings via feature hashing.
+
+    Needs no model or network, so it is meant for tests, benchmarks and
+    offline development. Texts sharing words get similar vectors.
+    """
+
+    _token_re = re.compile(r"\w+")
+
+    def __init__(self, dimension: int = 256):
+        self.name = f"hashing/{dimension}"
+        self.dimension = dimension
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in self._token_re.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimension] += sign
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            # Empty or symbol-only text: fall back to a fixed unit vector.
+            vector[0] = 1.0
+            return vector
+        return [v / norm for v in vector]
+
+
+def create_embedding_provider(kind: str = EMBED_PROVIDER) -> EmbeddingProvider:
+    """
+    Build the embedding provider selected by `EMBED_PROVIDER`.
+
+    Args:
+        kind (str): One of "gemini", "onnx" or "hashing".
+
+    Raises:
+        ValueError: If the provider is unknown or misconfigured.
+    """
+    kind = kind.lower()
+    if kind == "gemini":
+        return GeminiEmbeddingProvider(GEN_API_KEY, EMBED_MODEL, EMBED_OUTPUT_DIM, GEMINI_BASE_URL)
+    if kind == "onnx":
+        if not ONNX_MODEL_PATH or not ONNX_TOKENIZER_PATH:
+            raise ValueError("ONNX_MODEL_PATH and ONNX_TOKENIZER_PATH must be set for the onnx provider")
+        return OnnxEmbeddingProvider(
+            ONNX_MODEL_PATH,
+            ONNX_TOKENIZER_PATH,
+            max_length=ONNX_MAX_LENGTH,
+            batch_size=ONNX_BATCH_SIZE,
+        )
+    if kind == "hashing":
+        return HashingEmbeddingProvider(HASHING_EMBED_DIMENSION)
+    raise ValueError(f"Unknown embedding provider: {kind}")
@@ -1,20 +1,161 @@
-from typing import List
-from google import genai
-from dotenv import load_dotenv
-import os
-load_dotenv()
-client = genai.Client(api_key=os.getenv("GEN_API_KEY"))
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from app.core.config import (
+    EMBED_BATCH_MAX_SIZE,
+    EMBED_BATCH_MAX_WAIT_MS,
+    EMBED_CACHE_ENABLED,
+    EMBED_CACHE_MAX_MB,
+    EMBED_CACHE_MEMORY_ENTRIES,
+    EMBED_CACHE_PATH,
+    EMBED_MAX_CONCURRENCY,
+    EMBED_OUTPUT_DIM,
+)
+from app.core.embed_batcher import EmbeddingBatcher
+from app.core.embedding_cache import EmbeddingCache, cache_key
+from app.core.embedding_providers import EmbeddingProvider, create_embedding_provider
+from app.core.metrics import (
+    batch_size_label,
+    embed_cache,
+    embed_errors_total,
+    embed_seconds,
+    embed_texts_total,
+    embed_tokens_total,
+)
+from app.utils.vector_utils import truncate_embedding
+
+_lock = threading.Lock()
+_provider: Optional[EmbeddingProvider] = None
+_cache: Optional[EmbeddingCache] = None
+_cache_opened = False
+
+
+def get_provider() -> EmbeddingProvider:
+    """The configured embedding provider, built on first use (not at import)."""
+    global _provider
+    if _provider is None:
+        with _lock:
+            if _provider is None:
+                _provider = create_embedding_provider()
+    return _provider
+
+
+def get_cache() -> Optional[EmbeddingCache]:
+    """The embedding cache, opened on first use; None when it is disabled."""
+    global _cache, _cache_opened
+    if not _cache_opened:
+        with _lock:
+            if not _cache_opened:
+                if EMBED_CACHE_ENABLED:
+                    _cache = EmbeddingCache(
+                        EMBED_CACHE_PATH,
+                        memory_entries=EMBED_CACHE_MEMORY_ENTRIES,
+                        max_disk_bytes=EMBED_CACHE_MAX_MB * 1024 * 1024,
+                    )
+                _cache_opened = True
+    return _cache
+
+
+def _cache_key(text: str) -> str:
+    return cache_key(get_provider().name, EMBED_OUTPUT_DIM, text)
+
+
+def _embed_batch(texts: List[str]) -> List[List[float]]:
+    """
+    Resolve a batch of texts on a batcher worker thread: vectors found in the
+    cache (including its disk level) are reused, the rest are sent to the
+    embedding provider in a single call and cached.
+    """
+    cache = get_cache()
+    keys = [_cache_key(text) for text in texts]
+    cached = cache.get_many(keys) if cache is not None else {}
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if not missing:
+        return [cached[key] for key in keys]
+
+    fresh = _embed_with_provider([texts[i] for i in missing])
+    if len(fresh) != len(missing):
+        raise ValueError(f"Embedding model returned {len(fresh)} vectors for {len(missing)} texts")
+    if cache is not None:
+        cache.put_many([keys[i] for i in missing], fresh)
+    by_index = dict(zip(missing, fresh))
+    return [by_index[i] if i in by_index else cached[key] for i, key in enumerate(keys)]
+
+
+def _embed_with_provider(texts: List[str]) -> List[List[float]]:
+    """Send a list of texts to the embedding provider in a single call."""
+    embed_texts_total.inc(len(texts))
+    embed_tokens_total.inc(sum(len(text.split()) for text in texts))
+    try:
+        with embed_seconds.time(batch_size=batch_size_label(len(texts))):
+            vectors = get_provider().embed(texts)
+    except Exception:
+        embed_errors_total.inc()
+        raise
+    if EMBED_OUTPUT_DIM > 0:
+        vectors = [truncate_embedding(vector, EMBED_OUTPUT_DIM) for vector in vectors]
+    return vectors
+
+
+batcher = EmbeddingBatcher(
+    _embed_batch,
+    max_batch_size=EMBED_BATCH_MAX_SIZE,
+    max_wait_ms=EMBED_BATCH_MAX_WAIT_MS,
+    max_concurrency=EMBED_MAX_CONCURRENCY,
+)
+
+
+def _submit(text: str) -> "Future[List[float]]":
+    """
+    Resolve a text from the cache's memory level, or queue it on the batcher.
+
+    Runs on the event loop for the async helpers, so it never touches the
+    cache's SQLite file; disk lookups happen in `_embed_batch`.
+    """
+    cache = get_cache()
+    if cache is not None:
+        vector = cache.get_memory(_cache_key(text))
+        if vector is not None:
+            future: "Future[List[float]]" = Future()
+            future.set_result(vector)
+            return future
+    return batcher.submit(text)
+
 
 def embed_text(text: str) -> List[float]:
-    response = client.models.embed_content(
-        model="gemini-embedding-001",
-        contents=text,
-    )
-
-    # Safely get first embedding values
-    if response.embeddings and response.embeddings[0].values:
-#         print(list(response.embeddings[0].values)
-# )
-        return list(response.embeddings[0].values)
-
-    raise ValueError("No embedding values returned from model")
+    """Embed a single text. Concurrent callers are coalesced into one API call."""
+    return _submit(text).result()
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed several texts, preserving input order."""
+    futures = [_submit(text) for text in texts]
+    return [future.result() for future in futures]
+
+
+async def embed_text_async(text: str) -> List[float]:
+    """
+    Embed a single text without blocking the event loop.
+
+    The request is handed to the batcher's worker threads and awaited, so
+    other requests keep being served while the model call is in flight.
+    The shared future is shielded so a cancelled request does not cancel the
+    embedding for other callers waiting on the same text.
+    """
+    return await asyncio.shield(asyncio.wrap_future(_submit(text)))
+
+
+async def embed_texts_async(texts: List[str]) -> List[List[float]]:
+    """Embed several texts without blocking the event loop, preserving input order."""
+    return list(await asyncio.gather(*(embed_text_async(text) for text in texts)))
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss counters of the embedding cache (empty when it is disabled)."""
+    cache = get_cache()
+    stats = cache.stats() if cache is not None else {}
+    for stat, value in stats.items():
+        embed_cache.set(value, stat=stat)
+    return stats
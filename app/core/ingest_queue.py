@@ -0,0 +1,164 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Job states, in order.
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class IngestQueue:
+    """
+    Durable FIFO of notes waiting to be embedded and written, in a SQLite file.
+
+    Each job is one note; its ID is also the ID the note is stored under, so
+    a batch that is retried after a crash cannot create duplicates. Jobs go
+    queued -> processing -> done, or back to queued on a failed attempt
+    until `max_attempts` is reached (then failed). Jobs left in processing
+    by a crash are queued again when the queue is opened.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " namespace TEXT,"
+            " title TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+        self._db.execute("UPDATE jobs SET status = ? WHERE status = ?", (QUEUED, PROCESSING))
+        self._db.commit()
+
+    def enqueue(
+        self,
+        namespace: Optional[str],
+        ids: Sequence[str],
+        notes: Sequence[Tuple[str, str]],
+        max_queued: int = 0,
+    ) -> int:
+        """
+        Queue notes given as (title, content) pairs under the given job/note IDs.
+
+        The depth check and the insert run in one write transaction, so
+        concurrent callers (in this or another process) cannot overfill the queue.
+
+        Returns:
+            int: Number of jobs waiting or being processed, including the new ones.
+
+        Raises:
+            ValueError: If the jobs would take the queue past `max_queued` (0 = unbounded).
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                depth = self._count_pending()
+                if max_queued > 0 and depth + len(ids) > max_queued:
+                    raise ValueError("Ingest queue is full")
+                self._db.executemany(
+                    "INSERT INTO jobs (id, namespace, title, content, status, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(job_id, namespace, title, content, QUEUED, now, now) for job_id, (title, content) in zip(ids, notes)],
+                )
+            except BaseException:
+                self._db.rollback()
+                raise
+            self._db.commit()
+        return depth + len(ids)
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Mark up to `limit` of the oldest queued jobs as processing and return them.
+
+        Returns:
+            List[dict]: Jobs with id, namespace, title, content and attempts.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, namespace, title, content, attempts FROM jobs"
+                " WHERE status = ? ORDER BY created_at LIMIT ?",
+                (QUEUED, limit),
+            ).fetchall()
+            if rows:
+                self._db.executemany(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    [(PROCESSING, time.time(), row["id"]) for row in rows],
+                )
+                self._db.commit()
+        return [{**dict(row), "attempts": row["attempts"] + 1} for row in rows]
+
+    def complete(self, ids: Sequence[str]) -> None:
+        """Mark jobs as done; their content is dropped since the note now holds it."""
+        with self._lock:
+            self._db.executemany(
+                "UPDATE jobs SET status = ?, content = '', error = NULL, updated_at = ? WHERE id = ?",
+                [(DONE, time.time(), job_id) for job_id in ids],
+            )
+            self._db.commit()
+
+    def fail(self, ids: Sequence[str], error: str) -> int:
+        """
+        Record a failed attempt: jobs with attempts left are queued again,
+        the others are marked failed.
+
+        Returns:
+            int: Number of jobs that failed for good.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,"
+                " error = ?, updated_at = ? WHERE id = ?",
+                [(self.max_attempts, FAILED, QUEUED, error, now, job_id) for job_id in ids],
+            )
+            failed = self._db.execute(
+                f"SELECT COUNT(*) FROM jobs WHERE status = ? AND id IN ({','.join('?' * len(ids))})",
+                (FAILED, *ids),
+            ).fetchone()[0] if ids else 0
+            self._db.commit()
+        return failed
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's status record (without its content), or None if unknown."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, namespace, status, attempts, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def depth(self) -> int:
+        """Number of jobs waiting or being processed."""
+        with self._lock:
+            return self._count_pending()
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Delete finished (done or failed) jobs last updated more than `older_than_seconds` ago."""
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            deleted = self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            ).rowcount
+            self._db.commit()
+        return deleted
+
+    def _count_pending(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, PROCESSING)
+        ).fetchone()[0]
@@ -0,0 +1,69 @@
+import threading
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class JournaledIndex(Generic[T]):
+    """
+    Holder of an in-memory index that mirrors a namespace's notes and is
+    rebuilt from Chroma without holding up the writes mirrored into it.
+
+    Writes go through `apply`, which only takes a short lock. `rebuild` fills
+    a fresh index (from `factory`) without that lock, journals the writes
+    applied meanwhile, replays them onto the new index and then swaps it in.
+    Until the first build, writes are dropped: the build will read them.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._build_lock = threading.RLock()
+        self._journal: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
+        self.index: T = factory()
+        self.built = False
+
+    def rebuild(self, load: Callable[[T], None]) -> T:
+        """Build a new index with `load(index)` and swap it in; returns it."""
+        with self._build_lock:
+            with self._lock:
+                self._journal = []
+
+            index = self._factory()
+            try:
+                load(index)
+            except BaseException:
+                with self._lock:
+                    self._journal = None
+                raise
+
+            with self._lock:
+                for method, args in self._journal or []:
+                    getattr(index, method)(*args)
+                self.index = index
+                self._journal = None
+                self.built = True
+        return index
+
+    def ensure(self, build: Callable[[], Any]) -> T:
+        """The index, built on first use by `build()` (which calls `rebuild`)."""
+        if not self.built:
+            with self._build_lock:
+                if not self.built:
+                    build()
+        return self.index
+
+    def apply(self, method: str, *args: Any) -> None:
+        """Call `index.<method>(*args)` once built, journaling it for a rebuild in progress."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((method, args))
+            if self.built:
+                getattr(self.index, method)(*args)
+
+    def reset(self) -> None:
+        """Drop the index; it is built again on next use."""
+        with self._lock:
+            self.index = self._factory()
+            self.built = False
+            self._journal = None
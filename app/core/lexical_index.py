@@ -0,0 +1,122 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, with Unicode compatibility forms folded."""
+    return _TOKEN.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+class LexicalIndex:
+    """
+    In-memory BM25 inverted index over note titles and contents.
+
+    Each note is indexed as its title tokens (counted `title_weight` times)
+    followed by its content tokens. The title, content and metadata are kept
+    alongside the postings so a lexical search can be answered without
+    reading the vector store.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._stored: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, note_id: str) -> bool:
+        return note_id in self._lengths
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Optional[Dict[str, Any]]],
+    ) -> None:
+        """Index (or re-index) the given notes."""
+        with self._lock:
+            for note_id, document, metadata in zip(ids, documents, metadatas):
+                self._remove(note_id)
+                metadata = dict(metadata or {})
+                tokens = tokenize(str(metadata.get("title") or "")) * self.title_weight + tokenize(document or "")
+
+                counts: Dict[str, int] = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, count in counts.items():
+                    self._postings.setdefault(token, {})[note_id] = count
+
+                self._lengths[note_id] = len(tokens)
+                self._total_length += len(tokens)
+                self._stored[note_id] = (document or "", metadata)
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            for note_id in ids:
+                self._remove(note_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._stored.clear()
+            self._total_length = 0
+
+    def _remove(self, note_id: str) -> None:
+        if note_id not in self._lengths:
+            return
+        document, metadata = self._stored.pop(note_id)
+        tokens = set(tokenize(str(metadata.get("title") or ""))) | set(tokenize(document))
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(note_id, None)
+                if not postings:
+                    del self._postings[token]
+        self._total_length -= self._lengths.pop(note_id)
+
+    def get(self, note_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Stored (content, metadata) of a note, or None if it is not indexed."""
+        return self._stored.get(note_id)
+
+    def search(self, query: str, k: int, ids: Optional[Collection[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k notes by BM25 score for the query terms, optionally only among `ids`.
+
+        Returns:
+            List[Tuple[str, float]]: (note ID, score), best first. Notes that
+            share no term with the query are not returned.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            total = len(self._lengths)
+            if not terms or total == 0 or k <= 0:
+                return []
+            average_length = self._total_length / total or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+                for note_id, tf in postings.items():
+                    if ids is not None and note_id not in ids:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[note_id] / average_length)
+                    scores[note_id] = scores.get(note_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
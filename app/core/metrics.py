@@ -0,0 +1,197 @@
+from abc import ABC, abstractmethod
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every label combination."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, set explicitly."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed values (seconds by convention)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the `with` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+_M = TypeVar("_M", bound=_Metric)
+
+
+class Registry:
+    """Collection of metrics rendered together in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: "_M") -> "_M":
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def batch_size_label(size: int) -> str:
+    """Power-of-two bucket for a batch size, keeping label cardinality small."""
+    upper = 1
+    while upper < size:
+        upper *= 2
+    return str(upper)
+
+
+# ---- Embeddings ----
+embed_seconds = registry.register(Histogram(
+    "notes_embed_seconds", "Embedding provider call latency by batch size (upper power of two).", ["batch_size"]
+))
+embed_texts_total = registry.register(Counter("notes_embed_texts_total", "Texts sent to the embedding provider."))
+embed_tokens_total = registry.register(Counter(
+    "notes_embed_tokens_total", "Approximate tokens (whitespace-separated words) sent to the embedding provider."
+))
+embed_errors_total = registry.register(Counter("notes_embed_errors_total", "Failed embedding provider calls."))
+embed_cache = registry.register(Gauge("notes_embed_cache", "Embedding cache counters and sizes.", ["stat"]))
+
+# ---- Vector store ----
+chroma_seconds = registry.register(Histogram("notes_chroma_seconds", "Chroma operation latency by verb.", ["verb"]))
+chroma_errors_total = registry.register(Counter("notes_chroma_errors_total", "Failed Chroma operations by verb.", ["verb"]))
+
+# ---- Async ingest ----
+ingest_jobs_total = registry.register(Counter(
+    "notes_ingest_jobs_total", "Async ingest jobs by outcome (queued, done, retried, failed).", ["status"]
+))
+ingest_queue_depth = registry.register(Gauge("notes_ingest_queue_depth", "Async ingest jobs waiting or in progress."))
+
+# ---- Ingest dedup ----
+dedup_matches_total = registry.register(Counter(
+    "notes_dedup_matches_total", "Created notes found to duplicate another, by match kind and policy.", ["kind", "policy"]
+))
+dedup_avoided_total = registry.register(Counter(
+    "notes_dedup_avoided_total", "Embedding calls and note writes skipped because of duplicates.", ["operation"]
+))
+
+# ---- Responses ----
+serialization_seconds = registry.register(Histogram(
+    "notes_serialization_seconds", "Time spent building and encoding response bodies by route.", ["route"]
+))
+http_request_seconds = registry.register(Histogram(
+    "notes_http_request_seconds", "Total request time by method, route and status.", ["method", "route", "status"]
+))
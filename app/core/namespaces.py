@@ -0,0 +1,200 @@
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional
+
+from app.core.async_collection import AsyncCollection
+from app.core.chroma_client import chroma_pool, get_collection, get_notes_collection
+from app.core.config import (
+    BM25_B,
+    BM25_K1,
+    DEDUP_MAX_DISTANCE,
+    DEDUP_MIN_TOKENS,
+    DEDUP_SHINGLE_SIZE,
+    NAMESPACE_CACHE_SIZE,
+    NOTES_COLLECTION,
+    VECTOR_MATRIX_PATH,
+)
+from app.core.dedup_index import DedupIndex
+from app.core.journaled_index import JournaledIndex
+from app.core.lexical_index import LexicalIndex
+from app.core.logger import logger
+from app.core.vector_matrix import VectorMatrix
+
+if TYPE_CHECKING:
+    from chromadb.api.models.Collection import Collection
+
+# Lowercase letters, digits and inner hyphens; keeps derived collection names valid for Chroma.
+NAMESPACE_PATTERN = r"^[a-z0-9](?:[a-z0-9-]{0,30}[a-z0-9])?$"
+
+# Search cache versions are unique across namespaces and across reopenings of one.
+_versions = itertools.count(1)
+
+
+def is_valid_namespace(name: str) -> bool:
+    return re.fullmatch(NAMESPACE_PATTERN, name) is not None
+
+
+def _lexical_index() -> LexicalIndex:
+    return LexicalIndex(k1=BM25_K1, b=BM25_B)
+
+
+def _dedup_index() -> DedupIndex:
+    return DedupIndex(
+        max_distance=DEDUP_MAX_DISTANCE, shingle_size=DEDUP_SHINGLE_SIZE, min_tokens=DEDUP_MIN_TOKENS
+    )
+
+
+class Namespace:
+    """
+    One isolated set of notes: its own Chroma collection (and HNSW graph),
+    vector matrix, lexical index, dedup index and search cache version.
+
+    The default namespace (`name=None`) is the NOTES_COLLECTION collection
+    served under /notes; tenant namespaces map to "<NOTES_COLLECTION>-<name>".
+    Only the handle is created here; the collection is opened by its first
+    call and the indexes are built by the search services on first use.
+
+    Raises:
+        ValueError: If the name does not match NAMESPACE_PATTERN.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        if name is not None and not is_valid_namespace(name):
+            raise ValueError(f"Invalid namespace: {name!r}")
+        self.name = name
+        if name is None:
+            self.collection_name = NOTES_COLLECTION
+            self.matrix_path = VECTOR_MATRIX_PATH
+        else:
+            self.collection_name = f"{NOTES_COLLECTION}-{name}"
+            self.matrix_path = f"{VECTOR_MATRIX_PATH.rstrip('/')}-{name}"
+        self.store = AsyncCollection(self.collection, pool=chroma_pool)
+
+        self._collection: Optional["Collection"] = None
+        self._collection_lock = threading.Lock()
+
+        # Exact search state (see app.service.exact_search_service)
+        self.matrix_lock = threading.RLock()
+        self.matrix: Optional[VectorMatrix] = None
+        self.matrix_checked = False
+
+        # Lexical search and ingest dedup indexes (see app.service.lexical_search_service
+        # and app.service.dedup_service)
+        self.lexical: JournaledIndex[LexicalIndex] = JournaledIndex(_lexical_index)
+        self.dedup: JournaledIndex[DedupIndex] = JournaledIndex(_dedup_index)
+
+        # Search cache version (see app.service.search_cache)
+        self.version = next(_versions)
+        # Requests currently using the namespace; busy namespaces are never closed.
+        self.active = 0
+
+    def collection(self) -> "Collection":
+        """The Chroma collection, opened (and created if missing) on first use."""
+        if self._collection is None:
+            if self.name is None:
+                collection = get_notes_collection()
+            else:
+                collection = get_collection(self.collection_name)
+            with self._collection_lock:
+                if self._collection is None:
+                    self._collection = collection
+        return self._collection
+
+    def bump_version(self) -> int:
+        self.version = next(_versions)
+        return self.version
+
+    def flush(self) -> None:
+        with self.matrix_lock:
+            if self.matrix is not None:
+                self.matrix.flush()
+
+    def close(self) -> None:
+        """
+        Drop the in-memory indexes and the collection handle; they are rebuilt if reopened.
+
+        The matrix rows are written through their shared mappings, so only
+        its row count may still need saving. Chroma keeps the collection's
+        HNSW index loaded until it falls out of its cache (see
+        CHROMA_INDEX_CACHE_SIZE).
+        """
+        with self.matrix_lock:
+            if self.matrix is not None:
+                self.matrix.save_meta()
+            self.matrix = None
+            self.matrix_checked = False
+        self.lexical.reset()
+        self.dedup.reset()
+        with self._collection_lock:
+            self._collection = None
+
+
+class NamespaceRegistry:
+    """
+    LRU of open tenant namespaces.
+
+    At most `max_open` tenant namespaces are kept; when another one is
+    opened, the least recently used idle ones are closed, so memory for
+    lexical indexes and matrix mappings is bounded by the busiest tenants
+    rather than by the number of tenants. A namespace acquired by a request
+    is not closed until it is released. The default namespace is always open.
+    """
+
+    def __init__(self, max_open: int = NAMESPACE_CACHE_SIZE):
+        self.max_open = max_open
+        self.default = Namespace()
+        self._lock = threading.Lock()
+        self._open: "OrderedDict[str, Namespace]" = OrderedDict()
+
+    def acquire(self, name: Optional[str] = None) -> Namespace:
+        """
+        Open (or reuse) a namespace and mark it busy until `release`.
+
+        Raises:
+            ValueError: If the name does not match NAMESPACE_PATTERN.
+        """
+        if name is None:
+            namespace = self.default
+            with self._lock:
+                namespace.active += 1
+            return namespace
+
+        with self._lock:
+            namespace = self._open.get(name)
+            if namespace is None:
+                namespace = self._open[name] = Namespace(name)
+            self._open.move_to_end(name)
+            namespace.active += 1
+            evicted = self._evict()
+        self._close(evicted)
+        return namespace
+
+    def release(self, namespace: Namespace) -> None:
+        with self._lock:
+            namespace.active -= 1
+            evicted = self._evict()
+        self._close(evicted)
+
+    def open_namespaces(self) -> List[Namespace]:
+        """The default namespace and every open tenant namespace, least recently used first."""
+        with self._lock:
+            return [self.default, *self._open.values()]
+
+    def _evict(self) -> List[Namespace]:
+        evicted = []
+        for name in list(self._open):
+            if len(self._open) <= self.max_open:
+                break
+            if self._open[name].active == 0:
+                evicted.append(self._open.pop(name))
+        return evicted
+
+    def _close(self, evicted: List[Namespace]) -> None:
+        for namespace in evicted:
+            logger.info(f"Closing idle namespace '{namespace.name}'")
+            namespace.close()
+
+
+namespaces = NamespaceRegistry()
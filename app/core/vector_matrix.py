@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Note IDs are stored as fixed-width bytes next to the vectors; longer ones
+# are kept in `meta.json` by row instead.
+ID_WIDTH = 64
+# Rows scored per block, so float16 matrices are upcast a slice at a time.
+SEARCH_BLOCK_ROWS = 65_536
+# `meta.json` is rewritten at most this often by writes (and on flush).
+META_SAVE_SECONDS = 1.0
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a 2-D array (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class VectorMatrix:
+    """
+    Dense matrix of normalized note vectors in memory-mapped files.
+
+    Vectors live in `vectors.bin` (one row per note), note IDs in `ids.bin`
+    (those over ID_WIDTH bytes in `meta.json`) and the row count/shape in
+    `meta.json`. Rows are kept packed: deleting a
+    note moves the last row into its slot. Exact cosine search is a single
+    matrix-vector product followed by `argpartition`.
+
+    Rows are written through the mappings; `meta.json` is saved at most every
+    META_SAVE_SECONDS and on `flush`. After a crash the saved row count can
+    lag behind, which `ensure_matrix_synced` detects and rebuilds from.
+    """
+
+    def __init__(self, directory: str, dtype: str = "float32"):
+        if dtype not in ("float32", "float16"):
+            raise ValueError("dtype must be float32 or float16")
+
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.RLock()
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._vectors_path = os.path.join(directory, "vectors.bin")
+        self._ids_path = os.path.join(directory, "ids.bin")
+
+        self.dim = 0
+        self.count = 0
+        self.capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        self._rows: Dict[str, int] = {}
+        self._long_ids: Dict[int, str] = {}
+        self._meta_dirty = False
+        self._meta_saved_at = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("dtype") != self.dtype.name:
+            # Stored with another precision: start over, the caller rebuilds.
+            return
+
+        self.dim, self.count, self.capacity = meta["dim"], meta["count"], meta["capacity"]
+        self._long_ids = {int(row): note_id for row, note_id in meta.get("long_ids", {}).items()}
+        if self.capacity:
+            self._open()
+            self._rows = {self._id_at(i): i for i in range(self.count)}
+
+    def _open(self) -> None:
+        self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r+", shape=(self.capacity, self.dim))
+        self._ids = np.memmap(self._ids_path, dtype=f"S{ID_WIDTH}", mode="r+", shape=(self.capacity,))
+
+    def _save_meta(self) -> None:
+        tmp = f"{self._meta_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "count": self.count,
+                    "capacity": self.capacity,
+                    "dtype": self.dtype.name,
+                    "long_ids": {str(row): note_id for row, note_id in self._long_ids.items()},
+                },
+                f,
+            )
+        os.replace(tmp, self._meta_path)
+        self._meta_dirty = False
+        self._meta_saved_at = time.monotonic()
+
+    def _meta_changed(self) -> None:
+        self._meta_dirty = True
+        if time.monotonic() - self._meta_saved_at >= META_SAVE_SECONDS:
+            self._save_meta()
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(self.capacity, 1024)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._ids.flush()
+        self._vectors = self._ids = None
+
+        for path, row_bytes in ((self._vectors_path, self.dim * self.dtype.itemsize), (self._ids_path, ID_WIDTH)):
+            with open(path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        self.capacity = capacity
+        self._open()
+
+    def _id_at(self, row: int) -> str:
+        long_id = self._long_ids.get(int(row))
+        return long_id if long_id is not None else self._ids[row].decode("utf-8")
+
+    def _set_id(self, row: int, note_id: str) -> None:
+        encoded = note_id.encode("utf-8")
+        if len(encoded) > ID_WIDTH:
+            self._long_ids[row] = note_id
+            self._ids[row] = b""
+        else:
+            self._long_ids.pop(row, None)
+            self._ids[row] = encoded
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, note_id: str) -> bool:
+        return note_id in self._rows
+
+    def upsert(self, ids: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """
+        Insert or replace the vectors of the given notes.
+
+        Raises:
+            ValueError: If the vectors do not match the matrix dimension.
+        """
+        if not ids:
+            return
+        data = normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+        with self._lock:
+            if self.dim == 0:
+                self.dim = data.shape[1]
+            if data.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-d vectors, got {data.shape[1]}-d")
+
+            new_ids = [note_id for note_id in dict.fromkeys(ids) if note_id not in self._rows]
+            self._grow(self.count + len(new_ids))
+            for note_id in new_ids:
+                self._rows[note_id] = self.count
+                self._set_id(self.count, note_id)
+                self.count += 1
+
+            rows = [self._rows[note_id] for note_id in ids]
+            self._vectors[rows] = data.astype(self.dtype)
+            self._meta_changed()
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Remove notes from the matrix, keeping rows packed."""
+        with self._lock:
+            for note_id in ids:
+                row = self._rows.pop(note_id, None)
+                if row is None:
+                    continue
+                last = self.count - 1
+                if row != last:
+                    moved = self._id_at(last)
+                    self._vectors[row] = self._vectors[last]
+                    self._set_id(row, moved)
+                    self._rows[moved] = row
+                self._long_ids.pop(last, None)
+                self.count = last
+            self._meta_changed()
+
+    def clear(self) -> None:
+        """Drop every row and forget the dimension (files are reused on the next upsert)."""
+        with self._lock:
+            self._rows.clear()
+            self._long_ids.clear()
+            self._vectors = self._ids = None
+            self.dim = self.count = self.capacity = 0
+            self._save_meta()
+
+    def save_meta(self) -> None:
+        """Save `meta.json` if rows were written since it was last saved."""
+        with self._lock:
+            if self._meta_dirty:
+                self._save_meta()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._ids.flush()
+            if self._meta_dirty:
+                self._save_meta()
+
+    def search(self, query: Sequence[float], k: int, ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Exact cosine-similarity top-k.
+
+        Args:
+            query (Sequence[float]): Query vector (normalized here).
+            k (int): Number of results.
+            ids (Optional[Iterable[str]]): Only score these notes (e.g. the
+                ones matching a metadata filter). None scores every row.
+
+        Returns:
+            List[Tuple[str, float]]: (note ID, cosine similarity), best first.
+        """
+        with self._lock:
+            n = self.count
+            if n == 0 or k <= 0:
+                return []
+
+            q = normalize_rows(np.asarray([query], dtype=np.float32))[0]
+            if q.shape[0] != self.dim:
+                raise ValueError(f"Expected a {self.dim}-d query, got {q.shape[0]}-d")
+
+            if ids is not None:
+                rows = np.array(sorted(self._rows[i] for i in set(ids) if i in self._rows), dtype=np.int64)
+                if rows.size == 0:
+                    return []
+                scores = np.empty(rows.size, dtype=np.float32)
+                for start in range(0, rows.size, SEARCH_BLOCK_ROWS):
+                    block = rows[start:start + SEARCH_BLOCK_ROWS]
+                    scores[start:start + block.size] = self._vectors[block].astype(np.float32, copy=False) @ q
+            else:
+                rows = None
+                scores = np.empty(n, dtype=np.float32)
+                for start in range(0, n, SEARCH_BLOCK_ROWS):
+                    stop = min(start + SEARCH_BLOCK_ROWS, n)
+                    scores[start:stop] = self._vectors[start:stop].astype(np.float32, copy=False) @ q
+
+            k = min(k, scores.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            if rows is not None:
+                return [(self._id_at(rows[i]), float(scores[i])) for i in top]
+            return [(self._id_at(i), float(scores[i])) for i in top]
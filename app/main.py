@@ -1,15 +1,37 @@
-from typing import Dict
-from fastapi import FastAPI, status, Request            
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+from fastapi import Depends, FastAPI, status, Request            
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.embeddings import cache_stats
 from app.core.exceptions import generic_exception_handler, validation_exception_handler
-from app.routes import notes_route
+from app.core.metrics import http_request_seconds, registry
+from app.routes import notes_route, tenant_namespace
+from app.service.ingest_service import ingest_worker
+from app.service.startup_service import is_ready, shut_down, warm_up, warm_up_error
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers while the indexes load;
+    # /ready reports when they are in memory.
+    warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    ingest_worker.start()
+    yield
+    await ingest_worker.stop()
+    await warm_up_task
+    await asyncio.to_thread(shut_down)
 
 app = FastAPI(
     title="chroma-fastapi-embeddings",
     description="API to manage notes with embeddings",
     version="1",
+    lifespan=lifespan,
     openapi_tags=[
         {"name": "notes", "description": "Notes CRUD operations"},
+        {"name": "tenants", "description": "Notes CRUD operations within a tenant namespace"},
         {"name": "system", "description": "System and health endpoints"},
     ],
 )
@@ -23,8 +45,39 @@ async def request_validation_handler(request: Request, exc: RequestValidationErr
 async def all_exception_handler(request: Request, exc: Exception):
     return await generic_exception_handler(request, exc)
 
+def route_template(request: Request) -> str:
+    """Path with parameter values replaced by `{name}`, so ids don't explode label cardinality."""
+    if request.scope.get("route") is None:
+        return "unmatched"
+    names = {str(value): name for name, value in request.path_params.items()}
+    segments = request.url.path.split("/")
+    return "/".join("{" + names[s] + "}" if s in names else s for s in segments)
+
+# Request timing by route template
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        http_request_seconds.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route_template(request),
+            status=str(status_code),
+        )
+
 # Routes
 app.include_router(notes_route, prefix="/notes", tags=["notes"])
+app.include_router(
+    notes_route,
+    prefix="/tenants/{ns}/notes",
+    tags=["tenants"],
+    dependencies=[Depends(tenant_namespace)],
+)
 
 @app.get("/", tags=["system"], status_code=status.HTTP_200_OK)
 async def root():
@@ -33,3 +86,21 @@ async def root():
 @app.get("/health", tags=["system"], status_code=status.HTTP_200_OK)
 async def health_check() -> Dict[str, str]:
     return {"status": "healthy"}
+
+@app.get("/ready", tags=["system"], status_code=status.HTTP_200_OK)
+async def readiness_check():
+    if is_ready():
+        return {"status": "ready"}
+    error = warm_up_error()
+    content = {"status": "failed", "error": error} if error else {"status": "starting"}
+    return JSONResponse(content, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+@app.get("/health/embedding-cache", tags=["system"], status_code=status.HTTP_200_OK)
+async def embedding_cache_stats() -> Dict[str, Any]:
+    stats = cache_stats()
+    return {"enabled": bool(stats), "stats": stats}
+
+@app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    cache_stats()  # refresh the embedding cache gauges
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
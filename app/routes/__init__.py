@@ -1,3 +1,3 @@
-from app.routes.notes import notes_route
+from app.routes.notes import notes_route, tenant_namespace
 
-__all__ = ["notes_route"]
\ No newline at end of file
+__all__ = ["notes_route", "tenant_namespace"]
\ No newline at end of file
@@ -1,55 +1,236 @@
-from typing import Any, Dict, List
-from fastapi import APIRouter, HTTPException, status
+import codecs
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from app.core.embeddings import embed_text
-from app.schemas.note_schema import Note, NoteCreate, NoteListResponse, NoteUpdate
+from app.core.config import DEDUP_POLICY, DOCUMENT_MAX_MB, NOTES_BATCH_MAX_ITEMS, SEARCH_BATCH_MAX_QUERIES, SEARCH_MAX_TOP_K
+from app.core.embeddings import embed_text_async
+from app.core.metrics import serialization_seconds
+from app.core.namespaces import NAMESPACE_PATTERN, Namespace, is_valid_namespace, namespaces
+from app.schemas.note_schema import (
+    DocumentIngestResponse,
+    NoteBatchCreateResponse,
+    NoteBatchDelete,
+    NoteBatchDuplicate,
+    NoteBatchError,
+    NoteBatchJobsAcceptedResponse,
+    NoteBatchSearchRequest,
+    NoteBatchSearchResponse,
+    NoteBatchUpdateItem,
+    NoteBatchWriteResponse,
+    NoteCreate,
+    NoteDuplicate,
+    NoteFilters,
+    NoteJobAcceptedResponse,
+    NoteJobStatus,
+    NoteListResponse,
+    NoteUpdate,
+)
 from app.service.note_service import (
     list_notes_service,
     create_note_service,
+    create_notes_dedup_service,
     update_note_service,
+    has_content,
+    update_notes_batch_service,
     delete_note_service,
+    delete_notes_batch_service,
+    delete_notes_older_than_service,
 )
-from app.service.search_service import search_notes_service
+from app.service.document_service import delete_document_service, ingest_document_service
+from app.service.export_service import iter_notes_ndjson
+from app.service.ingest_service import enqueue_notes_service, get_job_service
+from app.service.search_service import search_notes_batch_service, search_notes_service
 from app.utils.datetime_utils import parse_datetime
+from app.utils.response_utils import json_response
 
 notes_route = APIRouter()
 
 
+LIST_FIELDS = ("title", "content", "created_at", "updated_at")
+
+WRITE_MODE_DESCRIPTION = (
+    "`sync` embeds and stores before answering (201). `async` queues the notes and answers 202 with "
+    "job IDs at once; poll `GET /notes/jobs/{job_id}` for their status."
+)
+
+DedupPolicy = Literal["off", "reject", "merge", "link"]
+
+DEDUP_DESCRIPTION = (
+    "What to do with notes whose content duplicates a stored note (or an earlier note of the batch), "
+    "exactly or nearly: `off` stores them, `reject` fails them, `merge` returns the existing note's ID "
+    "without storing anything, `link` stores them with the existing note's embedding. Duplicates are "
+    f"never embedded. Defaults to `{DEDUP_POLICY}`; only with `mode=sync`."
+)
+
+
+def tenant_namespace(
+    ns: str = Path(
+        ...,
+        pattern=NAMESPACE_PATTERN,
+        description="Tenant namespace (lowercase letters, digits and hyphens). Each has its own collection.",
+    ),
+) -> str:
+    """Path parameter of the tenant-scoped notes routes, mounted under `/tenants/{ns}/notes`."""
+    return ns
+
+
+async def notes_namespace(request: Request) -> AsyncIterator[Namespace]:
+    """
+    The namespace a notes route works on: the tenant of the `/tenants/{ns}`
+    prefix, or the default namespace under `/notes`. It stays open (is not
+    evicted from the namespace cache) until the request is done.
+    """
+    name = request.path_params.get("ns")
+    if name is not None and not is_valid_namespace(name):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid namespace")
+
+    namespace = namespaces.acquire(name)
+    try:
+        yield namespace
+    finally:
+        namespaces.release(namespace)
+
+
+def note_filters(
+    created_after: Optional[datetime] = Query(None, description="Only notes created after this time."),
+    created_before: Optional[datetime] = Query(None, description="Only notes created before this time."),
+    updated_after: Optional[datetime] = Query(None, description="Only notes updated after this time."),
+    updated_before: Optional[datetime] = Query(None, description="Only notes updated before this time."),
+    title: Optional[str] = Query(None, description="Only notes with exactly this title."),
+    contains: Optional[str] = Query(None, description="Only notes whose content contains this text."),
+) -> NoteFilters:
+    """Filter query parameters shared by the list and search routes."""
+    return NoteFilters(
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        title=title,
+        contains=contains,
+    )
+
+
 @notes_route.get(
     "/",
     response_model=NoteListResponse,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
-    summary="List all notes",
-    description="Fetch and return all saved notes including their metadata and timestamps.",
+    summary="List notes",
+    description=(
+        "Fetch one page of saved notes including their metadata and timestamps. "
+        "The total number of notes is returned in the X-Total-Count header."
+    ),
 )
-async def list_notes() -> NoteListResponse:
+async def list_notes(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of notes to return."),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page."),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return besides `id` (title, content, created_at, updated_at).",
+    ),
+    sort: Optional[Literal["updated_at", "-updated_at"]] = Query(
+        None, description="Order by last update; prefix with `-` for newest first."
+    ),
+    filters: NoteFilters = Depends(note_filters),
+    namespace: Namespace = Depends(notes_namespace),
+) -> Response:
     """
-    Retrieve all notes stored in the system.
+    Retrieve a page of notes stored in the system.
+
+    Args:
+        limit: Page size.
+        cursor: Opaque cursor returned as `next_cursor` by the previous page.
+        fields: Optional projection; omitted fields are left out of each note.
+        sort: Optional ordering by `updated_at`.
+        filters: Timestamp ranges, exact title and content substring filters.
+        namespace: Tenant namespace, or the default one under /notes.
 
     Returns:
-        A list of notes containing ID, title, content, created_at, and updated_at fields.
+        A page of notes and the cursor for the next page (null on the last page).
     """
-    result = await list_notes_service()
+    offset = 0
+    if cursor is not None:
+        if not cursor.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        offset = int(cursor)
+
+    selected = LIST_FIELDS
+    if fields is not None:
+        selected = tuple(f.strip() for f in fields.split(",") if f.strip())
+        unknown = set(selected) - set(LIST_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+
+    result, total = await list_notes_service(
+        namespace,
+        limit=limit,
+        offset=offset,
+        include_content="content" in selected,
+        sort=sort,
+        filters=filters,
+    )
 
     ids = result.get("ids") or []
     documents = result.get("documents") or []
     metadatas = result.get("metadatas") or []
 
-    notes: List[Note] = []
-
-    for i, note_id in enumerate(ids):
-        metadata = metadatas[i] or {}
-        notes.append(
-            Note(
-                id=str(note_id),
-                title=str(metadata.get("title", "")),
-                content=documents[i],
-                created_at=parse_datetime(metadata.get("created_at")),
-                updated_at=parse_datetime(metadata.get("updated_at")),
-            )
+    next_offset = offset + len(ids)
+    with serialization_seconds.time(route="list"):
+        # Plain dicts shaped like NoteListResponse (unset fields left out), encoded with orjson
+        notes: List[Dict[str, Any]] = []
+        for i, note_id in enumerate(ids):
+            metadata = metadatas[i] or {}
+            values: Dict[str, Any] = {"id": str(note_id)}
+            if "title" in selected:
+                values["title"] = str(metadata.get("title", ""))
+            if "content" in selected:
+                values["content"] = documents[i]
+            if "created_at" in selected:
+                values["created_at"] = parse_datetime(metadata.get("created_at"))
+            if "updated_at" in selected:
+                values["updated_at"] = parse_datetime(metadata.get("updated_at"))
+            notes.append(values)
+
+        return json_response(
+            {
+                "message": "Notes fetched successfully",
+                "notes": notes,
+                "next_cursor": str(next_offset) if ids and next_offset < total else None,
+            },
+            headers={"X-Total-Count": str(total)},
         )
 
-    return NoteListResponse(message="Notes fetched successfully", notes=notes)
+
+@notes_route.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all notes as NDJSON",
+    description="Stream every note as newline-delimited JSON, reading the collection in fixed-size chunks.",
+    response_class=StreamingResponse,
+)
+def export_notes(
+    include_embeddings: bool = Query(False, description="Include the stored embedding vectors."),
+    namespace: Namespace = Depends(notes_namespace),
+) -> StreamingResponse:
+    """
+    Stream the whole collection without loading it into memory.
+
+    Args:
+        include_embeddings: Whether each line should carry the note's vector.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        An `application/x-ndjson` stream with one note per line.
+    """
+    return StreamingResponse(
+        iter_notes_ndjson(namespace.collection(), include_embeddings),
+        media_type="application/x-ndjson",
+    )
 
 
 @notes_route.post(
@@ -57,20 +238,362 @@ async def list_notes() -> NoteListResponse:
     status_code=status.HTTP_201_CREATED,
     summary="Create a new note",
     description="Create and save a new note with text embedding for semantic search.",
+    responses={
+        status.HTTP_200_OK: {"description": "Duplicate of an existing note, which is returned (`dedup=merge`)."},
+        status.HTTP_202_ACCEPTED: {"model": NoteJobAcceptedResponse, "description": "Queued (`mode=async`)."},
+        status.HTTP_409_CONFLICT: {"description": "Duplicate of an existing note (`dedup=reject`)."},
+    },
 )
-async def create_note(item: NoteCreate):
+async def create_note(
+    item: NoteCreate,
+    mode: Literal["sync", "async"] = Query("sync", description=WRITE_MODE_DESCRIPTION),
+    dedup: Optional[DedupPolicy] = Query(None, description=DEDUP_DESCRIPTION),
+    namespace: Namespace = Depends(notes_namespace),
+):
     """
     Create a note and generate an embedding for semantic search.
 
     Args:
         item: NoteCreate schema containing `title` and `content`.
+        mode: Write now, or queue for the background ingest worker.
+        dedup: Duplicate policy, DEDUP_POLICY by default.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        Newly created note ID with success message, or the job ID when queued.
+        Duplicates also get the note they duplicate under `duplicate`.
+    """
+    if mode == "async":
+        _check_async_dedup(dedup)
+        job_ids = await _enqueue(namespace, [item])
+        return json_response(
+            {"message": "Note queued", "job_id": job_ids[0]},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    policy = dedup or DEDUP_POLICY
+    if policy == "off":
+        embedding = await embed_text_async(item.content)
+        note_id = await create_note_service(namespace, item, embedding)
+        return {"message": "Note created successfully", "note_id": note_id}
+
+    note_ids, errors, duplicates = await create_notes_dedup_service(namespace, [item], policy)
+    match = duplicates.get(0)
+    if match is None:
+        if errors:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=errors[0])
+        return {"message": "Note created successfully", "note_id": note_ids[0]}
+
+    duplicate = NoteDuplicate(note_id=match.note_id, match=match.kind, distance=match.distance).model_dump()
+    if policy == "reject":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=errors[0])
+    if policy == "merge":
+        return json_response(
+            {"message": "Note already exists", "note_id": note_ids[0], "duplicate": duplicate},
+            status_code=status.HTTP_200_OK,
+        )
+    return {"message": "Note created successfully", "note_id": note_ids[0], "duplicate": duplicate}
+
+
+@notes_route.post(
+    "/batch",
+    response_model=NoteBatchCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many notes",
+    description=(
+        "Create several notes in one request. Contents are embedded in batched provider calls "
+        "and all notes are written with a single vector-store insert."
+    ),
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": NoteBatchJobsAcceptedResponse, "description": "Queued (`mode=async`)."},
+    },
+)
+async def create_notes_batch(
+    items: List[NoteCreate],
+    mode: Literal["sync", "async"] = Query("sync", description=WRITE_MODE_DESCRIPTION),
+    dedup: Optional[DedupPolicy] = Query(None, description=DEDUP_DESCRIPTION),
+    namespace: Namespace = Depends(notes_namespace),
+) -> NoteBatchCreateResponse:
+    """
+    Create a batch of notes.
+
+    Args:
+        items: List of NoteCreate objects.
+        mode: Write now, or queue for the background ingest worker.
+        dedup: Duplicate policy, DEDUP_POLICY by default.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        Note IDs (job IDs when queued) in input order, null for items that
+        failed, per-item errors and the duplicates found.
+    """
+    if len(items) > NOTES_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {NOTES_BATCH_MAX_ITEMS} notes can be created per request",
+        )
+
+    errors: List[NoteBatchError] = []
+    valid = [i for i, item in enumerate(items) if item.content.strip() != ""]
+    for i in sorted(set(range(len(items))) - set(valid)):
+        errors.append(NoteBatchError(index=i, error="Content must not be empty"))
+
+    if mode == "async":
+        _check_async_dedup(dedup)
+        job_ids: List[Optional[str]] = [None] * len(items)
+        for i, job_id in zip(valid, await _enqueue(namespace, [items[i] for i in valid])):
+            job_ids[i] = job_id
+        return json_response(
+            {
+                "message": f"Queued {len(valid)} of {len(items)} notes",
+                "job_ids": job_ids,
+                "errors": [error.model_dump() for error in errors],
+            },
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    policy = dedup or DEDUP_POLICY
+    note_ids: List[Optional[str]] = [None] * len(items)
+    created, failures, matches = await create_notes_dedup_service(namespace, [items[i] for i in valid], policy)
+    for position, i in enumerate(valid):
+        note_ids[i] = created[position]
+        if position in failures:
+            errors.append(NoteBatchError(index=i, error=failures[position]))
+
+    duplicates = [
+        NoteBatchDuplicate(index=valid[position], note_id=match.note_id, match=match.kind, distance=match.distance)
+        for position, match in sorted(matches.items())
+    ]
+    stored = sum(note_id is not None for note_id in created)
+    if policy == "merge":
+        stored -= sum(position not in failures for position in matches)
+
+    errors.sort(key=lambda e: e.index)
+    return NoteBatchCreateResponse(
+        message=f"Created {stored} of {len(items)} notes",
+        note_ids=note_ids,
+        errors=errors,
+        duplicates=duplicates,
+    )
+
+
+def _check_async_dedup(dedup: Optional[str]) -> None:
+    if dedup not in (None, "off"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="dedup is only supported with mode=sync",
+        )
+
+
+async def _enqueue(namespace: Namespace, items: List[NoteCreate]) -> List[str]:
+    try:
+        return await enqueue_notes_service(namespace, items)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+@notes_route.get(
+    "/jobs/{job_id}",
+    response_model=NoteJobStatus,
+    status_code=status.HTTP_200_OK,
+    summary="Get an ingest job",
+    description="Status of a note queued with `mode=async`. Once `done`, the note is stored under `note_id`.",
+)
+async def get_job(job_id: str, namespace: Namespace = Depends(notes_namespace)) -> NoteJobStatus:
+    """
+    Look up a queued note's ingest job.
+
+    Args:
+        job_id: Job ID returned when the note was queued.
+        namespace: Tenant namespace, or the default one under /notes.
 
     Returns:
-        Newly created note ID with success message.
+        The job status, attempts so far and the last error, if any.
     """
-    embedding = embed_text(item.content)
-    note_id = await create_note_service(item, embedding)
-    return {"message": "Note created successfully", "note_id": note_id}
+    job = await get_job_service(namespace, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return NoteJobStatus(**job)
+
+
+@notes_route.post(
+    "/documents",
+    response_model=DocumentIngestResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Ingest a long document",
+    description=(
+        "Stream a long UTF-8 text document as the raw request body. It is split into overlapping "
+        "chunks while it is read, chunks are embedded in batches and stored as notes sharing a "
+        "`parent_id`. Searches return at most the best chunk per document."
+    ),
+    openapi_extra={
+        "requestBody": {"required": True, "content": {"text/plain": {"schema": {"type": "string"}}}},
+    },
+)
+async def ingest_document(
+    request: Request,
+    title: str = Query(..., min_length=1, description="Title stored on every chunk."),
+    namespace: Namespace = Depends(notes_namespace),
+) -> DocumentIngestResponse:
+    """
+    Ingest a document of any length without reading it into memory at once.
+
+    Args:
+        request: Gives access to the streamed request body.
+        title: Title of the document.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        The parent ID shared by the chunks and the number of chunks stored.
+    """
+    max_bytes = DOCUMENT_MAX_MB * 1024 * 1024
+
+    async def pieces() -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        received = 0
+        try:
+            async for block in request.stream():
+                received += len(block)
+                if received > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Documents are limited to {DOCUMENT_MAX_MB} MB",
+                    )
+                yield decoder.decode(block)
+            yield decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Document must be UTF-8 text")
+
+    parent_id, chunks = await ingest_document_service(namespace, title, pieces())
+    if chunks == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Document must not be empty")
+    return DocumentIngestResponse(
+        message=f"Document stored as {chunks} chunks",
+        parent_id=parent_id,
+        chunks=chunks,
+    )
+
+
+@notes_route.delete(
+    "/documents/{parent_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a document",
+    description="Delete every chunk of a document ingested through /notes/documents.",
+)
+async def delete_document(parent_id: str, namespace: Namespace = Depends(notes_namespace)):
+    """
+    Delete a document by its parent ID.
+
+    Args:
+        parent_id: `parent_id` returned when the document was ingested.
+        namespace: Tenant namespace, or the default one under /notes.
+    """
+    if not await delete_document_service(namespace, parent_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+
+@notes_route.put(
+    "/batch",
+    response_model=NoteBatchWriteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update many notes",
+    description=(
+        "Update several notes in one request. Existence is checked with one lookup, only notes whose "
+        "content changed are re-embedded (in a batched call), and all changes are applied in one write."
+    ),
+)
+async def update_notes_batch(
+    items: List[NoteBatchUpdateItem],
+    namespace: Namespace = Depends(notes_namespace),
+) -> NoteBatchWriteResponse:
+    """
+    Update a batch of notes.
+
+    Args:
+        items: Note IDs with optional title/content changes.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        IDs of updated notes and IDs that were not found.
+    """
+    if len(items) > NOTES_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {NOTES_BATCH_MAX_ITEMS} notes can be updated per request",
+        )
+
+    try:
+        updated, not_found = await update_notes_batch_service(namespace, items)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    return NoteBatchWriteResponse(
+        message=f"Updated {len(updated)} of {len(items)} notes",
+        note_ids=updated,
+        not_found=not_found,
+    )
+
+
+@notes_route.delete(
+    "/batch",
+    response_model=NoteBatchWriteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete many notes",
+    description="Delete several notes by ID with one existence check and one delete.",
+)
+async def delete_notes_batch(
+    body: NoteBatchDelete,
+    namespace: Namespace = Depends(notes_namespace),
+) -> NoteBatchWriteResponse:
+    """
+    Delete a batch of notes.
+
+    Args:
+        body: IDs of the notes to delete.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        IDs of deleted notes and IDs that were not found.
+    """
+    if len(body.ids) > NOTES_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {NOTES_BATCH_MAX_ITEMS} notes can be deleted per request",
+        )
+
+    deleted, not_found = await delete_notes_batch_service(namespace, body.ids)
+    return NoteBatchWriteResponse(
+        message=f"Deleted {len(deleted)} notes",
+        note_ids=deleted,
+        not_found=not_found,
+    )
+
+
+@notes_route.delete(
+    "/",
+    response_model=NoteBatchWriteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete notes older than a timestamp",
+    description="Delete every note whose created_at or updated_at is older than `older_than`.",
+)
+async def delete_notes_by_filter(
+    older_than: datetime = Query(..., description="ISO timestamp; naive values are treated as UTC."),
+    field: Literal["created_at", "updated_at"] = Query("updated_at", description="Timestamp to compare."),
+    namespace: Namespace = Depends(notes_namespace),
+) -> NoteBatchWriteResponse:
+    """
+    Delete notes by age.
+
+    Args:
+        older_than: Cutoff timestamp.
+        field: Which timestamp to compare against the cutoff.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        IDs of the deleted notes.
+    """
+    deleted = await delete_notes_older_than_service(namespace, older_than, field)
+    return NoteBatchWriteResponse(message=f"Deleted {len(deleted)} notes", note_ids=deleted)
 
 
 @notes_route.put(
@@ -79,13 +602,14 @@ async def create_note(item: NoteCreate):
     summary="Update an existing note",
     description="Update an existing note. Embedding is regenerated only if content is changed.",
 )
-async def update_note(note_id: str, item: NoteUpdate):
+async def update_note(note_id: str, item: NoteUpdate, namespace: Namespace = Depends(notes_namespace)):
     """
     Update an existing note.
 
     Args:
         note_id: ID of the note to update.
         item: NoteUpdate schema with optional title/content changes.
+        namespace: Tenant namespace, or the default one under /notes.
 
     Returns:
         Success message with ID of updated note.
@@ -93,10 +617,10 @@ async def update_note(note_id: str, item: NoteUpdate):
     try:
         embedding = None
 
-        if item.content is not None and item.content.strip() != "":
-            embedding = embed_text(item.content)
+        if has_content(item.content):
+            embedding = await embed_text_async(item.content)
 
-        await update_note_service(note_id, item, embedding)
+        await update_note_service(namespace, note_id, item, embedding)
         return {"message": "Note updated successfully", "note_id": note_id}
 
     except ValueError:
@@ -109,35 +633,105 @@ async def update_note(note_id: str, item: NoteUpdate):
     summary="Delete a note",
     description="Delete a note permanently by its unique ID.",
 )
-async def delete_note(note_id: str):
+async def delete_note(note_id: str, namespace: Namespace = Depends(notes_namespace)):
     """
     Delete a note by ID.
 
     Args:
         note_id: ID of the note to delete.
+        namespace: Tenant namespace, or the default one under /notes.
     """
     try:
-        await delete_note_service(note_id)
+        await delete_note_service(namespace, note_id)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
 
 
 @notes_route.get(
     "/search",
+    response_model=Dict[str, Any],
     status_code=status.HTTP_200_OK,
-    summary="Semantic search notes",
-    description="Perform vector similarity search across all notes based on meaning.",
+    summary="Search notes",
+    description="Search notes by meaning (vector), by keywords (lexical, BM25) or by both (hybrid).",
 )
-async def search_notes(q: str, top_k: int = 5) -> Dict[str, Any]:
+async def search_notes(
+    q: str,
+    top_k: int = Query(5, ge=1, le=SEARCH_MAX_TOP_K, description="Number of results to return."),
+    engine: Literal["auto", "hnsw", "exact"] = Query(
+        "auto", description="`exact` scans every vector; `auto` does so for small collections."
+    ),
+    mode: Literal["vector", "lexical", "hybrid"] = Query(
+        "vector",
+        description=(
+            "`vector` scores are cosine distances (lower is closer); `lexical` scores are BM25 "
+            "and `hybrid` scores are reciprocal-rank fusion scores (higher is better)."
+        ),
+    ),
+    filters: NoteFilters = Depends(note_filters),
+    namespace: Namespace = Depends(notes_namespace),
+) -> Response:
     """
-    Perform semantic search on notes based on the meaning of the query text.
+    Search notes by the meaning of the query text, its keywords, or both.
 
     Args:
         q: The text query to search for.
         top_k: Number of results to return (default=5).
+        engine: Vector search engine: HNSW index, exact scan, or automatic choice.
+        mode: Ranking: vector similarity, BM25 keywords, or their fusion.
+        filters: Timestamp ranges, exact title and content substring filters,
+            applied before ranking.
+        namespace: Tenant namespace, or the default one under /notes.
+
+    Returns:
+        List of notes ranked by relevance.
+    """
+    results = await search_notes_service(namespace, q, top_k, engine, mode, filters)
+    with serialization_seconds.time(route="search"):
+        return json_response({"message": "Search results", "results": results})
+
+
+@notes_route.post(
+    "/search/batch",
+    response_model=NoteBatchSearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Search notes with several queries",
+    description=(
+        "Vector search for several queries in one request. Queries are embedded in one batched "
+        "provider call and sent to the vector store as one multi-query lookup; with `merge`, "
+        "results are also fused across queries with reciprocal-rank fusion and deduplicated."
+    ),
+)
+async def search_notes_batch(
+    body: NoteBatchSearchRequest,
+    engine: Literal["auto", "hnsw", "exact"] = Query(
+        "auto", description="`exact` scans every vector; `auto` does so for small collections."
+    ),
+    filters: NoteFilters = Depends(note_filters),
+    namespace: Namespace = Depends(notes_namespace),
+) -> Response:
+    """
+    Search notes with a batch of queries, e.g. paraphrases of one question.
+
+    Args:
+        body: The queries, results per query and whether to merge them.
+        engine: Vector search engine: HNSW index, exact scan, or automatic choice.
+        filters: Timestamp ranges, exact title and content substring filters,
+            applied before ranking.
+        namespace: Tenant namespace, or the default one under /notes.
 
     Returns:
-        List of notes ranked by semantic relevance.
+        Results per query in input order, plus the fused list when `merge` is set.
     """
-    results: List[Any] = await search_notes_service(q, top_k)
-    return {"message": "Search results", "results": results}
+    if not body.queries:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one query is required")
+    if len(body.queries) > SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {SEARCH_BATCH_MAX_QUERIES} queries can be searched per request",
+        )
+
+    results, merged = await search_notes_batch_service(
+        namespace, body.queries, body.top_k, engine, filters, body.merge
+    )
+    with serialization_seconds.time(route="search_batch"):
+        return json_response({"message": "Search results", "results": results, "merged": merged})
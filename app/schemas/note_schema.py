@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Literal, Optional, List
+from pydantic import BaseModel, Field
+
+from app.core.config import SEARCH_MAX_TOP_K
 
 
 # ---- Base Metadata ----
@@ -8,17 +10,30 @@ class NoteMetadata(BaseModel):
     title: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # Set on chunks of documents ingested through /notes/documents
+    parent_id: Optional[str] = None
+    chunk_index: Optional[int] = None
 
 
 # ---- Core Note Model ----
 class Note(BaseModel):
     id: str
-    title: str
-    content: str
+    title: Optional[str] = None
+    content: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
 
+# ---- Filters (list and search) ----
+class NoteFilters(BaseModel):
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    title: Optional[str] = None
+    contains: Optional[str] = None
+
+
 # ---- Create Note ----
 class NoteCreate(BaseModel):
     title: str
@@ -31,6 +46,44 @@ class NoteUpdate(BaseModel):
     content: Optional[str] = None
 
 
+# ---- Batch Create ----
+class NoteBatchError(BaseModel):
+    index: int
+    error: str
+
+
+class NoteDuplicate(BaseModel):
+    note_id: str
+    match: Literal["exact", "near"]
+    distance: int
+
+
+class NoteBatchDuplicate(NoteDuplicate):
+    index: int
+
+
+class NoteBatchCreateResponse(BaseModel):
+    message: str
+    note_ids: List[Optional[str]]
+    errors: List[NoteBatchError]
+    duplicates: List[NoteBatchDuplicate] = []
+
+
+# ---- Batch Update / Delete ----
+class NoteBatchUpdateItem(NoteUpdate):
+    id: str
+
+
+class NoteBatchDelete(BaseModel):
+    ids: List[str]
+
+
+class NoteBatchWriteResponse(BaseModel):
+    message: str
+    note_ids: List[str]
+    not_found: List[str] = []
+
+
 # ---- Search Result ----
 class NoteSearchResult(BaseModel):
     id: str
@@ -39,10 +92,53 @@ class NoteSearchResult(BaseModel):
     metadata: Optional[NoteMetadata] = None
 
 
+# ---- Batch Search ----
+class NoteBatchSearchRequest(BaseModel):
+    queries: List[str]
+    top_k: int = Field(5, ge=1, le=SEARCH_MAX_TOP_K)
+    merge: bool = False
+
+
+class NoteBatchSearchResponse(BaseModel):
+    message: str
+    results: List[List[NoteSearchResult]]
+    merged: Optional[List[NoteSearchResult]] = None
+
+
+# ---- Document Ingest ----
+class DocumentIngestResponse(BaseModel):
+    message: str
+    parent_id: str
+    chunks: int
+
+
+# ---- Async Ingest ----
+class NoteJobAcceptedResponse(BaseModel):
+    message: str
+    job_id: str
+
+
+class NoteBatchJobsAcceptedResponse(BaseModel):
+    message: str
+    job_ids: List[Optional[str]]
+    errors: List[NoteBatchError]
+
+
+class NoteJobStatus(BaseModel):
+    job_id: str
+    status: Literal["queued", "processing", "done", "failed"]
+    note_id: Optional[str] = None
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 # ---- List Notes Response ----
 class NoteListResponse(BaseModel):
     message: str
     notes: List[Note]
+    next_cursor: Optional[str] = None
 
 
 # ---- Single Note Detail Response ----
@@ -0,0 +1,66 @@
+"""
+Add epoch-millisecond timestamps to notes written before they existed.
+
+Notes store `created_at`/`updated_at` as ISO strings; range filters on list,
+search and delete-by-age compare the numeric `created_at_ms`/`updated_at_ms`
+fields instead. This reads note metadata in chunks (no documents or vectors)
+and fills in the numeric fields wherever they are missing. Safe to re-run.
+
+Usage:
+    python -m app.scripts.backfill_timestamps
+    python -m app.scripts.backfill_timestamps --dry-run
+"""
+import argparse
+from typing import Any, Dict, List
+
+from app.core.chroma_client import get_client
+from app.core.config import EXPORT_CHUNK_SIZE, NOTES_COLLECTION
+from app.utils.datetime_utils import parse_datetime, to_epoch_ms
+
+FIELDS = ("created_at", "updated_at")
+
+
+def missing_timestamps(metadata: Dict[str, Any]) -> Dict[str, int]:
+    """Numeric timestamps that can be derived from the ISO strings but are not stored yet."""
+    values = {}
+    for field in FIELDS:
+        parsed = parse_datetime(metadata.get(field))
+        if parsed is not None and f"{field}_ms" not in metadata:
+            values[f"{field}_ms"] = to_epoch_ms(parsed)
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill numeric note timestamps.")
+    parser.add_argument("--collection", default=NOTES_COLLECTION, help="Collection to update.")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Notes per read/write.")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the notes that need it.")
+    args = parser.parse_args()
+
+    client = get_client()
+    collection = client.get_collection(args.collection)
+    total = collection.count()
+    print(f"🚀 Checking {total} notes in '{args.collection}'...")
+
+    updated = 0
+    for offset in range(0, total, args.chunk_size):
+        chunk = collection.get(limit=args.chunk_size, offset=offset, include=["metadatas"])
+        ids: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for note_id, metadata in zip(chunk["ids"], chunk.get("metadatas") or []):
+            values = missing_timestamps(metadata or {})
+            if values:
+                ids.append(note_id)
+                metadatas.append({**(metadata or {}), **values})
+
+        if ids and not args.dry_run:
+            collection.update(ids=ids, metadatas=metadatas)
+        updated += len(ids)
+        print(f"✅ {min(offset + args.chunk_size, total)}/{total} notes checked")
+
+    verb = "need" if args.dry_run else "got"
+    print(f"🎉 {updated} notes {verb} numeric timestamps")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,45 @@
-import sys
+"""
+Bulk-import notes into the vector store.
+
+Reads notes from JSONL files (one {"title": ..., "content": ...} object per
+line) or CSV files (with `title` and `content` columns), or the built-in
+sample notes when no file is given. Batches are embedded concurrently,
+rate-limit errors are retried with exponential backoff, and progress is
+checkpointed so an interrupted run resumes where it stopped. Note IDs are
+derived from the source position and content, and rows are upserted, so a
+rerun never creates duplicates.
+
+Notes are written straight to Chroma, so a running server does not see them
+in its exact-search matrix, lexical and dedup indexes or cached search
+results. Restart the server after an import; the indexes are rebuilt from
+Chroma at startup.
+
+Usage:
+    python -m app.scripts.bulk_import notes.jsonl more_notes.csv --workers 4
+"""
+import argparse
+import csv
+import hashlib
+import json
 import os
-from uuid import uuid4
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from dotenv import load_dotenv
-from core.embeddings import embed_text
-from core.chroma_client import notes_collection
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+from uuid import NAMESPACE_URL, uuid5
 
-# ✅ Ensure project root is added to PYTHONPATH
-ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.append(ROOT_DIR)
+# ✅ Ensure project root is on PYTHONPATH when run as a plain script
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
-load_dotenv()  # load .env variables
+from app.core.chroma_client import get_notes_collection  # noqa: E402
+from app.core.embeddings import embed_texts  # noqa: E402
+from app.utils.datetime_utils import timestamp_fields  # noqa: E402
 
-# ✅ Import after adjusting path
+T = TypeVar("T")
 
 # ✅ Your sample notes (title, content)
 notes = [
@@ -440,46 +467,196 @@ notes = [
     ("pluto", "Pluto is a dwarf planet."),
 ]
 
-
 BATCH_SIZE = 50
-def bulk_import():
-    total = len(notes)
-    print(f"🚀 Starting bulk import of {total} notes in batches of {BATCH_SIZE}...")
+WORKERS = 4
+MAX_RETRIES = 6
+CHECKPOINT_FILE = ".bulk_import_checkpoint.json"
+BUILTIN_SOURCE = "<builtin>"
+
+# (source, position, title, content)
+Record = Tuple[str, int, str, str]
+
+
+def iter_records(paths: List[str]) -> Iterator[Record]:
+    """Stream notes from JSONL/CSV files, or the built-in samples if no path is given."""
+    if not paths:
+        for position, (title, content) in enumerate(notes):
+            yield BUILTIN_SOURCE, position, title, content
+        return
+
+    for path in paths:
+        source = os.path.abspath(path)
+        if path.endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                for position, row in enumerate(csv.DictReader(f)):
+                    yield source, position, row.get("title") or "", row.get("content") or ""
+        else:
+            with open(path, encoding="utf-8") as f:
+                for position, line in enumerate(f):
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    yield source, position, row.get("title") or "", row.get("content") or ""
+
+
+def note_id_for(record: Record) -> str:
+    """Deterministic ID, so re-importing the same record overwrites instead of duplicating."""
+    source, position, _, content = record
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return str(uuid5(NAMESPACE_URL, f"{source}#{position}#{digest}"))
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Best-effort detection of provider rate-limit / quota errors."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    message = str(exc)
+    return code == 429 or "429" in message or "RESOURCE_EXHAUSTED" in message
+
+
+def with_backoff(fn: Callable[[], T], max_retries: int = MAX_RETRIES, base_delay: float = 1.0) -> T:
+    """Call `fn`, retrying rate-limit errors with exponential backoff and jitter."""
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt == max_retries or not is_rate_limited(exc):
+                raise
+            delay = base_delay * (2 ** attempt) * (0.5 + random.random())
+            print(f"⏳ Rate limited, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+    raise RuntimeError("unreachable")
+
+
+def load_checkpoint(path: str) -> Dict[str, int]:
+    """Map of source -> last position that is known to be stored."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, int]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def import_batch(batch: List[Record], max_retries: int) -> int:
+    """Embed and upsert one batch. Returns the number of notes written."""
+    contents = [content for _, _, _, content in batch]
+    vectors = with_backoff(lambda: embed_texts(contents), max_retries)
+    now = datetime.now(timezone.utc)
+
+    get_notes_collection().upsert(
+        ids=[note_id_for(record) for record in batch],
+        documents=contents,
+        embeddings=vectors,
+        metadatas=[{
+            "title": title,
+            **timestamp_fields("created_at", now),
+            **timestamp_fields("updated_at", now)
+        } for _, _, title, _ in batch],
+    )
+    return len(batch)
+
+
+def iter_batches(records: Iterator[Record], checkpoint: Dict[str, int], batch_size: int) -> Iterator[List[Record]]:
+    """Group records into batches, skipping anything the checkpoint says is done."""
+    batch: List[Record] = []
+    for record in records:
+        source, position, _, content = record
+        if position <= checkpoint.get(source, -1) or not content.strip():
+            continue
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_import(
+    paths: Optional[List[str]] = None,
+    batch_size: int = BATCH_SIZE,
+    workers: int = WORKERS,
+    max_retries: int = MAX_RETRIES,
+    checkpoint_path: str = CHECKPOINT_FILE,
+) -> int:
+    """
+    Run the import pipeline.
+
+    At most `workers` batches are embedded and written at the same time and
+    at most twice that many are buffered, so memory stays bounded no matter
+    how large the input is. The checkpoint only advances past a batch once
+    it and every earlier batch have been stored.
+
+    Returns:
+        int: Number of notes written in this run.
+    """
+    checkpoint = load_checkpoint(checkpoint_path)
+    print(f"🚀 Starting bulk import in batches of {batch_size} with {workers} workers...")
+
+    started = time.perf_counter()
+    imported = 0
+    batches = enumerate(iter_batches(iter_records(paths or []), checkpoint, batch_size))
+
+    in_flight: Dict["Future[int]", Tuple[int, List[Record]]] = {}
+    done: Dict[int, List[Record]] = {}
+    next_to_commit = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < workers * 2:
+                item = next(batches, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, batch = item
+                in_flight[executor.submit(import_batch, batch, max_retries)] = (index, batch)
+
+            if not in_flight:
+                break
+
+            finished: Set["Future[int]"] = wait(in_flight, return_when=FIRST_COMPLETED).done
+            for future in finished:
+                index, batch = in_flight.pop(future)
+                imported += future.result()
+                done[index] = batch
 
-    for i in range(0, total, BATCH_SIZE):
-        batch = notes[i : i + BATCH_SIZE]
+            # Advance the checkpoint over the contiguous prefix of stored batches
+            while next_to_commit in done:
+                for source, position, _, _ in done.pop(next_to_commit):
+                    checkpoint[source] = max(checkpoint.get(source, -1), position)
+                next_to_commit += 1
+            save_checkpoint(checkpoint_path, checkpoint)
 
-        ids = []
-        documents = []
-        embeddings = []
-        metadatas = []
+            elapsed = time.perf_counter() - started
+            print(f"✅ Imported {imported} notes ({imported / elapsed:.1f} notes/sec)")
 
-        for title, content in batch:
-            vector = embed_text(content)
-            note_id = str(uuid4())
-            now = datetime.now(timezone.utc).isoformat()
+    elapsed = time.perf_counter() - started
+    rate = imported / elapsed if elapsed > 0 else 0.0
+    print(f"🎉 Bulk import completed: {imported} notes in {elapsed:.1f}s ({rate:.1f} notes/sec)")
+    print("Restart the server to pick up the imported notes in its search indexes.")
+    return imported
 
-            ids.append(note_id)
-            documents.append(content)
-            embeddings.append(vector)
-            metadatas.append({
-                "title": title,
-                "created_at": now,
-                "updated_at": now
-            })
 
-        # ✅ Insert batch
-        notes_collection.add(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas
-        )
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-import notes from JSONL/CSV files.")
+    parser.add_argument("paths", nargs="*", help="JSONL or CSV files (default: built-in sample notes).")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Notes per embedding call.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Batches processed concurrently.")
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES, help="Retries on rate-limit errors.")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="Progress file used to resume.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over.")
+    args = parser.parse_args()
 
-        print(f"✅ Imported {len(batch)} notes (batch {i//BATCH_SIZE + 1})")
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
 
-    print("🎉 Bulk import completed successfully!")
+    bulk_import(args.paths, args.batch_size, args.workers, args.max_retries, args.checkpoint)
 
 
 if __name__ == "__main__":
-    bulk_import()
\ No newline at end of file
+    main()
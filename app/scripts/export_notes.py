@@ -0,0 +1,36 @@
+"""
+Stream the notes collection to an NDJSON file.
+
+Usage:
+    python -m app.scripts.export_notes --output notes.ndjson [--include-embeddings]
+"""
+import argparse
+import sys
+
+from app.core.chroma_client import get_notes_collection
+from app.core.config import EXPORT_CHUNK_SIZE
+from app.service.export_service import iter_notes_ndjson
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export all notes as NDJSON.")
+    parser.add_argument("--output", "-o", default="-", help="Output file (default: stdout).")
+    parser.add_argument("--include-embeddings", action="store_true", help="Include stored vectors.")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Notes read per batch.")
+    args = parser.parse_args()
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    count = 0
+    try:
+        for line in iter_notes_ndjson(get_notes_collection(), args.include_embeddings, args.chunk_size):
+            out.write(line)
+            count += 1
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    print(f"✅ Exported {count} notes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure HNSW recall@k against exact search.
+
+Stored note vectors are sampled as queries, searched with the HNSW index and
+with the exact vector matrix, and the overlap of the two top-k lists is
+reported. Also rebuilds the vector matrix with `--rebuild`.
+
+Usage:
+    python -m app.scripts.measure_recall --k 10 --queries 200 [--rebuild] [--namespace acme]
+"""
+import argparse
+import random
+
+from app.core.namespaces import Namespace
+from app.service.exact_search_service import measure_hnsw_recall, rebuild_notes_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure HNSW recall@k against exact search.")
+    parser.add_argument("--k", type=int, default=10, help="Number of neighbours compared.")
+    parser.add_argument("--queries", type=int, default=100, help="Number of sampled query vectors.")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed.")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the vector matrix from Chroma first.")
+    parser.add_argument("--namespace", default=None, help="Tenant namespace (default: the /notes collection).")
+    args = parser.parse_args()
+
+    ns = Namespace(args.namespace)
+    if args.rebuild:
+        print(f"🔁 Rebuilt vector matrix with {rebuild_notes_matrix(ns)} rows")
+
+    total = ns.collection().count()
+    if total == 0:
+        print("Collection is empty")
+        return
+
+    rng = random.Random(args.seed)
+    offsets = rng.sample(range(total), min(args.queries, total))
+    queries = [
+        ns.collection().get(limit=1, offset=offset, include=["embeddings"])["embeddings"][0].tolist()
+        for offset in offsets
+    ]
+
+    recall = measure_hnsw_recall(ns, queries, args.k)
+    print(f"recall@{args.k} over {len(queries)} queries ({total} notes): {recall:.4f}")
+
+
+if __name__ == "__main__":
+    main()
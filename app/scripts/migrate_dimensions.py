@@ -0,0 +1,70 @@
+"""
+Rewrite the notes collection with reduced-dimension embeddings.
+
+Stored vectors are truncated to `--dim` dimensions and re-normalized
+(Matryoshka truncation), so the embedding API is never called. The result is
+written to a new collection in chunks; with `--swap` it then replaces the live
+collection, which is kept under a `_backup_<timestamp>` name.
+
+Set EMBED_OUTPUT_DIM to the same value before restarting the server, so new
+notes and queries are embedded at the matching size.
+
+Usage:
+    python -m app.scripts.migrate_dimensions --dim 768 --swap
+"""
+import argparse
+import sys
+
+from app.core.chroma_client import get_client
+from app.core.config import EXPORT_CHUNK_SIZE, NOTES_COLLECTION
+from app.service.collection_admin import copy_collection, swap_collections
+from app.utils.vector_utils import truncate_embedding
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate notes to lower-dimension embeddings.")
+    parser.add_argument("--dim", type=int, required=True, help="Target number of dimensions.")
+    parser.add_argument("--source", default=NOTES_COLLECTION, help="Collection to migrate.")
+    parser.add_argument("--target", help="New collection name (default: <source>_d<dim>).")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Notes per read/write.")
+    parser.add_argument("--swap", action="store_true", help="Replace the source collection when done.")
+    args = parser.parse_args()
+
+    client = get_client()
+    source = client.get_collection(args.source)
+    target_name = args.target or f"{args.source}_d{args.dim}"
+
+    sample = source.get(limit=1, include=["embeddings"])
+    sample_embeddings = sample.get("embeddings")
+    if sample_embeddings is None or len(sample_embeddings) == 0:
+        print("Source collection is empty, nothing to migrate", file=sys.stderr)
+        return
+    current_dim = len(sample_embeddings[0])
+    if args.dim >= current_dim:
+        sys.exit(f"Target dimension {args.dim} must be smaller than the current {current_dim}")
+
+    target = client.get_or_create_collection(name=target_name, metadata=source.metadata)
+    total = source.count()
+    print(f"🚀 Migrating {total} notes from {current_dim} to {args.dim} dimensions into '{target_name}'...")
+
+    copied = copy_collection(
+        source,
+        target,
+        transform=lambda vector: truncate_embedding(vector, args.dim),
+        chunk_size=args.chunk_size,
+        progress=lambda n: print(f"✅ {n}/{total} notes migrated"),
+    )
+
+    if target.count() != source.count():
+        sys.exit(f"Count mismatch after copy ({target.count()} vs {source.count()}); not swapping")
+
+    if args.swap:
+        backup = swap_collections(client, args.source, target_name)
+        print(f"🔁 '{args.source}' now holds {args.dim}-d vectors; previous collection kept as '{backup}'")
+        print("Restart the server with EMBED_OUTPUT_DIM set to pick up the new collection.")
+
+    print(f"🎉 Migration completed: {copied} notes")
+
+
+if __name__ == "__main__":
+    main()
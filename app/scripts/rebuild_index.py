@@ -0,0 +1,60 @@
+"""
+Rebuild the notes collection with the configured HNSW parameters.
+
+HNSW_M, HNSW_CONSTRUCTION_EF and HNSW_SEARCH_EF only take effect when a
+collection is created. This copies every note (with its stored vector, so the
+embedding API is not called) into a new collection built with the current
+settings and swaps it in, keeping the old one as a backup.
+
+Usage:
+    HNSW_M=32 HNSW_CONSTRUCTION_EF=200 python -m app.scripts.rebuild_index
+"""
+import argparse
+import sys
+import time
+
+from app.core.chroma_client import get_client, hnsw_metadata
+from app.core.config import EXPORT_CHUNK_SIZE, NOTES_COLLECTION
+from app.service.collection_admin import copy_collection, swap_collections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the notes HNSW index with new parameters.")
+    parser.add_argument("--source", default=NOTES_COLLECTION, help="Collection to rebuild.")
+    parser.add_argument("--m", type=int, help="HNSW M (default: HNSW_M).")
+    parser.add_argument("--construction-ef", type=int, help="HNSW construction_ef (default: HNSW_CONSTRUCTION_EF).")
+    parser.add_argument("--search-ef", type=int, help="HNSW search_ef (default: HNSW_SEARCH_EF).")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Notes per read/write.")
+    args = parser.parse_args()
+
+    overrides = {
+        "m": args.m,
+        "construction_ef": args.construction_ef,
+        "search_ef": args.search_ef,
+    }
+    metadata = hnsw_metadata(**{k: v for k, v in overrides.items() if v is not None})
+
+    client = get_client()
+    source = client.get_collection(args.source)
+    target_name = f"{args.source}_rebuild_{int(time.time())}"
+    target = client.create_collection(name=target_name, metadata=metadata)
+    total = source.count()
+    print(f"🚀 Rebuilding '{args.source}' ({total} notes) with {metadata}...")
+
+    started = time.perf_counter()
+    copy_collection(
+        source,
+        target,
+        chunk_size=args.chunk_size,
+        progress=lambda n: print(f"✅ {n}/{total} notes copied"),
+    )
+    if target.count() != total:
+        sys.exit(f"Count mismatch after copy ({target.count()} vs {total}); not swapping")
+
+    backup = swap_collections(client, args.source, target_name)
+    print(f"🎉 Rebuilt in {time.perf_counter() - started:.1f}s; previous collection kept as '{backup}'")
+    print("Restart the server to pick up the new index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from app.service.export_service import iter_notes
+
+if TYPE_CHECKING:
+    from chromadb.api import ClientAPI
+    from chromadb.api.models.Collection import Collection
+
+VectorTransform = Callable[[List[float]], List[float]]
+
+
+def copy_collection(
+    source: "Collection",
+    target: "Collection",
+    transform: Optional[VectorTransform] = None,
+    chunk_size: int = 500,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Copy every note (document, metadata and stored vector) into another collection.
+
+    Notes are read and written `chunk_size` at a time, so memory use does not
+    depend on the collection size. Vectors are reused as stored, optionally
+    passed through `transform`; the embedding provider is never called.
+
+    Args:
+        source (Collection): Collection to read.
+        target (Collection): Collection to upsert into.
+        transform (Optional[VectorTransform]): Applied to each stored vector.
+        chunk_size (int): Notes per read/write.
+        progress (Optional[Callable[[int], None]]): Called with the running total after each chunk.
+
+    Returns:
+        int: Number of notes copied.
+    """
+    copied = 0
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[dict] = []
+    embeddings: List[List[float]] = []
+
+    def flush() -> None:
+        nonlocal copied
+        if not ids:
+            return
+        target.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+        copied += len(ids)
+        ids.clear()
+        documents.clear()
+        metadatas.clear()
+        embeddings.clear()
+        if progress is not None:
+            progress(copied)
+
+    for row in iter_notes(source, include_embeddings=True, chunk_size=chunk_size):
+        vector = [float(v) for v in row["embedding"]]
+        ids.append(row["id"])
+        documents.append(row["content"])
+        metadatas.append(row["metadata"])
+        embeddings.append(transform(vector) if transform is not None else vector)
+        if len(ids) >= chunk_size:
+            flush()
+    flush()
+
+    return copied
+
+
+def swap_collections(client: "ClientAPI", live_name: str, replacement_name: str) -> str:
+    """
+    Put `replacement_name` in place of `live_name`, keeping the old one as a backup.
+
+    Chroma collections are renamed rather than copied, so the swap is cheap.
+    Running servers hold a handle to the old collection and must be
+    restarted to pick up the new one.
+
+    Returns:
+        str: Name the previous live collection was renamed to.
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    backup_name = f"{live_name}_backup_{stamp}"
+
+    client.get_collection(live_name).modify(name=backup_name)
+    client.get_collection(replacement_name).modify(name=live_name)
+    return backup_name
@@ -0,0 +1,77 @@
+import asyncio
+from typing import List, Optional, Sequence
+
+from app.core.config import EXPORT_CHUNK_SIZE
+from app.core.dedup_index import DedupIndex, DuplicateMatch
+from app.core.logger import logger
+from app.core.namespaces import Namespace
+from app.service.export_service import iter_notes
+
+
+def rebuild_dedup_index(ns: Namespace, chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """
+    Reload the namespace's dedup index from the notes stored in Chroma,
+    without holding up writes (see `JournaledIndex`).
+
+    Returns:
+        int: Number of indexed notes.
+    """
+    index = ns.dedup.rebuild(lambda index: _load(ns, index, chunk_size))
+    logger.info(f"Built dedup index of '{ns.collection_name}' with {len(index)} notes")
+    return len(index)
+
+
+def _load(ns: Namespace, index: DedupIndex, chunk_size: int) -> None:
+    for row in iter_notes(ns.collection(), include_embeddings=False, chunk_size=chunk_size):
+        index.upsert([row["id"]], [row["content"]])
+
+
+def ensure_dedup_index(ns: Namespace) -> DedupIndex:
+    """The namespace's dedup index, built from Chroma on first use."""
+    return ns.dedup.ensure(lambda: rebuild_dedup_index(ns))
+
+
+def dedup_upsert(ns: Namespace, ids: Sequence[str], documents: Sequence[str]) -> None:
+    """Mirror written notes into the index. Called by the note services."""
+    if ids:
+        ns.dedup.apply("upsert", list(ids), list(documents))
+
+
+def dedup_delete(ns: Namespace, ids: Sequence[str]) -> None:
+    """Mirror deletions into the index. Called by the note services."""
+    if ids:
+        ns.dedup.apply("delete", list(ids))
+
+
+async def find_duplicates(
+    ns: Namespace,
+    note_ids: Sequence[str],
+    contents: Sequence[str],
+) -> List[Optional[DuplicateMatch]]:
+    """
+    For each new note, the note its content duplicates, if any.
+
+    A note is matched against the stored notes first and otherwise against
+    the earlier unique notes of the same batch, whose match then carries
+    the new note's ID from `note_ids`. The check is not atomic with the
+    write, so concurrent requests can still store the same content twice.
+
+    Returns:
+        List[Optional[DuplicateMatch]]: One entry per note, in input order.
+    """
+    if not ns.dedup.built:
+        await asyncio.to_thread(ensure_dedup_index, ns)
+    index = ns.dedup.index
+
+    def match() -> List[Optional[DuplicateMatch]]:
+        batch = DedupIndex(max_distance=index.max_distance, shingle_size=index.shingle_size, min_tokens=index.min_tokens)
+        matches: List[Optional[DuplicateMatch]] = []
+        for note_id, content in zip(note_ids, contents):
+            fingerprint = index.fingerprint(content)
+            found = index.find(fingerprint) or batch.find(fingerprint)
+            if found is None:
+                batch.add(note_id, fingerprint)
+            matches.append(found)
+        return matches
+
+    return await asyncio.to_thread(match)
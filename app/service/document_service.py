@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from uuid import uuid4
+
+from app.core.namespaces import Namespace
+from app.core.config import DOCUMENT_CHUNK_CHARS, DOCUMENT_CHUNK_OVERLAP, DOCUMENT_EMBED_BATCH
+from app.core.embeddings import embed_texts_async
+from app.core.logger import logger
+from app.service.dedup_service import dedup_delete, dedup_upsert
+from app.service.exact_search_service import matrix_delete, matrix_upsert
+from app.service.lexical_search_service import lexical_delete, lexical_upsert
+from app.service.search_cache import bump_collection_version
+from app.utils.datetime_utils import timestamp_fields
+from app.utils.text_chunker import TextChunker
+
+
+def chunk_id(parent_id: str, index: int) -> str:
+    return f"{parent_id}:{index}"
+
+
+async def _write_chunks(
+    ns: Namespace,
+    parent_id: str,
+    title: str,
+    first_index: int,
+    chunks: List[str],
+    timestamps: Dict[str, Any],
+) -> None:
+    """Embed one batch of chunks and store it with a single vector-store insert."""
+    embeddings = await embed_texts_async(chunks)
+    ids = [chunk_id(parent_id, first_index + i) for i in range(len(chunks))]
+    metadatas: List[Dict[str, Any]] = [{
+        "title": title,
+        "parent_id": parent_id,
+        "chunk_index": first_index + i,
+        **timestamps
+    } for i in range(len(chunks))]
+
+    await ns.store.add(ids=ids, documents=chunks, metadatas=metadatas, embeddings=embeddings)
+    await matrix_upsert(ns, ids, embeddings)
+    lexical_upsert(ns, ids, chunks, metadatas)
+    dedup_upsert(ns, ids, chunks)
+
+
+async def ingest_document_service(
+    ns: Namespace,
+    title: str,
+    pieces: AsyncIterator[str],
+    chunk_size: int = DOCUMENT_CHUNK_CHARS,
+    overlap: int = DOCUMENT_CHUNK_OVERLAP,
+    batch_size: int = DOCUMENT_EMBED_BATCH,
+) -> Tuple[str, int]:
+    """
+    Store a long document as overlapping chunk notes sharing a parent ID.
+
+    Text is consumed from `pieces` as it arrives and split incrementally, and
+    every `batch_size` chunks are embedded in one batched call and written,
+    so neither the whole document nor all its vectors are held in memory.
+    Each chunk is a note with `parent_id` and `chunk_index` metadata. If
+    anything fails, the chunks written so far are removed again.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        title (str): Title given to every chunk.
+        pieces (AsyncIterator[str]): The document text, in arbitrary pieces.
+        chunk_size (int): Maximum characters per chunk.
+        overlap (int): Characters repeated at the start of the next chunk.
+        batch_size (int): Chunks embedded and written per round trip.
+
+    Returns:
+        Tuple[str, int]: The parent ID and the number of chunks stored.
+    """
+    parent_id = str(uuid4())
+    now = datetime.now(timezone.utc)
+    timestamps = {**timestamp_fields("created_at", now), **timestamp_fields("updated_at", now)}
+    chunker = TextChunker(chunk_size, overlap)
+    pending: List[str] = []
+    written = 0
+
+    try:
+        async for piece in pieces:
+            pending.extend(chunker.feed(piece))
+            while len(pending) >= batch_size:
+                await _write_chunks(ns, parent_id, title, written, pending[:batch_size], timestamps)
+                written += batch_size
+                pending = pending[batch_size:]
+
+        pending.extend(chunker.finish())
+        if pending:
+            await _write_chunks(ns, parent_id, title, written, pending, timestamps)
+            written += len(pending)
+    except BaseException:
+        if written:
+            logger.warning(f"Document ingest failed after {written} chunks; removing them")
+            await delete_document_service(ns, parent_id)
+        raise
+
+    if written:
+        bump_collection_version(ns)
+    return parent_id, written
+
+
+async def delete_document_service(ns: Namespace, parent_id: str) -> List[str]:
+    """
+    Delete every chunk of a document.
+
+    Returns:
+        List[str]: IDs of the deleted chunk notes (empty if the document does not exist).
+    """
+    result = await ns.store.get(where={"parent_id": parent_id}, include=[])
+    deleted = list(result.get("ids") or [])
+
+    if deleted:
+        await ns.store.delete(ids=deleted)
+        await matrix_delete(ns, deleted)
+        lexical_delete(ns, deleted)
+        dedup_delete(ns, deleted)
+        bump_collection_version(ns)
+    return deleted
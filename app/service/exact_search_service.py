@@ -0,0 +1,171 @@
+import asyncio
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import (
+    EXACT_SEARCH_ENABLED,
+    EXACT_SEARCH_MAX_ROWS,
+    EXPORT_CHUNK_SIZE,
+    VECTOR_MATRIX_DTYPE,
+)
+from app.core.logger import logger
+from app.core.namespaces import Namespace
+from app.core.vector_matrix import VectorMatrix
+from app.service.export_service import iter_notes
+
+
+def get_notes_matrix(ns: Namespace) -> Optional[VectorMatrix]:
+    """The namespace's sidecar vector matrix, or None when exact search is disabled."""
+    if not EXACT_SEARCH_ENABLED:
+        return None
+    matrix = ns.matrix
+    if matrix is not None:
+        return matrix
+    with ns.matrix_lock:
+        if ns.matrix is None:
+            ns.matrix = VectorMatrix(ns.matrix_path, VECTOR_MATRIX_DTYPE)
+        return ns.matrix
+
+
+def rebuild_notes_matrix(ns: Namespace, chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """
+    Reload the namespace's vector matrix from the vectors stored in Chroma.
+
+    Returns:
+        int: Number of rows in the rebuilt matrix.
+    """
+    matrix = get_notes_matrix(ns)
+    if matrix is None:
+        return 0
+
+    # Writes mirrored while this runs wait for the lock and are applied after it.
+    with ns.matrix_lock:
+        matrix.clear()
+        ids: List[str] = []
+        vectors: List[Sequence[float]] = []
+        for row in iter_notes(ns.collection(), include_embeddings=True, chunk_size=chunk_size):
+            ids.append(row["id"])
+            vectors.append(row["embedding"])
+            if len(ids) >= chunk_size:
+                matrix.upsert(ids, vectors)
+                ids, vectors = [], []
+        matrix.upsert(ids, vectors)
+        matrix.flush()
+
+    logger.info(f"Rebuilt vector matrix of '{ns.collection_name}' with {len(matrix)} rows")
+    return len(matrix)
+
+
+def ensure_matrix_synced(ns: Namespace) -> Optional[VectorMatrix]:
+    """
+    Return the namespace's matrix, rebuilding it once per opening if its row
+    count does not match the collection (e.g. after a bulk import or a crash).
+    """
+    matrix = get_notes_matrix(ns)
+    if matrix is None or ns.matrix_checked:
+        return matrix
+
+    with ns.matrix_lock:
+        if ns.matrix_checked:
+            return matrix
+        if len(matrix) != ns.collection().count() or _dimension_changed(ns, matrix):
+            rebuild_notes_matrix(ns)
+        ns.matrix_checked = True
+    return matrix
+
+
+def _dimension_changed(ns: Namespace, matrix: VectorMatrix) -> bool:
+    sample = ns.collection().get(limit=1, include=["embeddings"]).get("embeddings")
+    return sample is not None and len(sample) > 0 and len(sample[0]) != matrix.dim
+
+
+async def matrix_upsert(ns: Namespace, ids: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+    """
+    Mirror written vectors into the matrix. Called by the note services.
+
+    Runs on a worker thread: it waits for a rebuild in progress, which must
+    not hold up the event loop.
+    """
+    if not EXACT_SEARCH_ENABLED or not ids:
+        return
+
+    def upsert() -> None:
+        matrix = get_notes_matrix(ns)
+        with ns.matrix_lock:
+            try:
+                matrix.upsert(ids, vectors)
+            except ValueError as exc:
+                # e.g. the embedding size changed; the next search rebuilds the matrix
+                logger.warning(f"Vector matrix out of sync: {exc}")
+                ns.matrix_checked = False
+
+    await asyncio.to_thread(upsert)
+
+
+async def matrix_delete(ns: Namespace, ids: Sequence[str]) -> None:
+    """Mirror deletions into the matrix on a worker thread. Called by the note services."""
+    if not EXACT_SEARCH_ENABLED or not ids:
+        return
+
+    def delete() -> None:
+        matrix = get_notes_matrix(ns)
+        with ns.matrix_lock:
+            matrix.delete(ids)
+
+    await asyncio.to_thread(delete)
+
+
+async def use_exact_search(ns: Namespace, engine: str) -> bool:
+    """
+    Decide whether a search should use the exact engine.
+
+    "exact" always does (when enabled); "auto" does while the collection has
+    at most EXACT_SEARCH_MAX_ROWS notes; "hnsw" never does.
+    """
+    if engine == "hnsw" or not EXACT_SEARCH_ENABLED:
+        return False
+    if engine == "exact":
+        return True
+    matrix = get_notes_matrix(ns) if ns.matrix_checked else await asyncio.to_thread(ensure_matrix_synced, ns)
+    return matrix is not None and 0 < len(matrix) <= EXACT_SEARCH_MAX_ROWS
+
+
+async def exact_search(
+    ns: Namespace,
+    query_embedding: Sequence[float],
+    top_k: int,
+    ids: Optional[Iterable[str]] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Exact top-k over the vector matrix, run off the event loop. With `ids`,
+    only those notes are scored.
+
+    Returns:
+        List[Tuple[str, float]]: (note ID, cosine distance), nearest first.
+    """
+    def run() -> List[Tuple[str, float]]:
+        matrix = ensure_matrix_synced(ns)
+        if matrix is None:
+            return []
+        return [(note_id, 1.0 - similarity) for note_id, similarity in matrix.search(query_embedding, top_k, ids)]
+
+    return await asyncio.to_thread(run)
+
+
+def measure_hnsw_recall(ns: Namespace, query_embeddings: Sequence[Sequence[float]], k: int) -> float:
+    """
+    Recall@k of the HNSW index against exact search for the given queries.
+
+    Returns:
+        float: Mean fraction of the exact top-k that HNSW also returned.
+    """
+    matrix = ensure_matrix_synced(ns)
+    if matrix is None or not query_embeddings or len(matrix) == 0:
+        return 0.0
+
+    k = min(k, len(matrix))
+    approx = ns.collection().query(query_embeddings=list(query_embeddings), n_results=k, include=[])
+    total = 0.0
+    for i, query in enumerate(query_embeddings):
+        truth = {note_id for note_id, _ in matrix.search(query, k)}
+        total += len(truth & set(approx["ids"][i])) / k
+    return total / len(query_embeddings)
@@ -0,0 +1,68 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List
+
+import orjson
+
+from app.core.config import EXPORT_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from chromadb.api.models.Collection import Collection
+
+
+def iter_notes(
+    collection: "Collection",
+    include_embeddings: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every note in the collection, reading it `chunk_size` rows at a time.
+
+    Only one chunk is held in memory, so memory use does not grow with the
+    collection. Notes written or deleted while the export runs may be skipped
+    or seen twice, since chunks are addressed by offset.
+
+    Args:
+        collection (Collection): Chroma collection to read.
+        include_embeddings (bool): Whether to include the stored vectors.
+        chunk_size (int): Number of notes read per Chroma call.
+
+    Yields:
+        dict: `id`, `content`, `metadata` and optionally `embedding` of a note.
+    """
+    include: List[Any] = ["documents", "metadatas"]
+    if include_embeddings:
+        include.append("embeddings")
+
+    offset = 0
+    while True:
+        chunk = collection.get(limit=chunk_size, offset=offset, include=include)
+        ids = chunk.get("ids") or []
+        if not ids:
+            return
+
+        documents = chunk.get("documents") or []
+        metadatas = chunk.get("metadatas") or []
+        embeddings = chunk.get("embeddings") if include_embeddings else None
+
+        for i, note_id in enumerate(ids):
+            row: Dict[str, Any] = {
+                "id": note_id,
+                "content": documents[i],
+                "metadata": metadatas[i] or {},
+            }
+            if embeddings is not None:
+                row["embedding"] = embeddings[i]
+            yield row
+
+        if len(ids) < chunk_size:
+            return
+        offset += len(ids)
+
+
+def iter_notes_ndjson(
+    collection: "Collection",
+    include_embeddings: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Serialize `iter_notes` as newline-delimited JSON, one note per line."""
+    for row in iter_notes(collection, include_embeddings, chunk_size):
+        yield orjson.dumps(row, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
@@ -0,0 +1,209 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from app.core.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_JOB_RETENTION_HOURS,
+    INGEST_MAX_ATTEMPTS,
+    INGEST_MAX_QUEUED,
+    INGEST_POLL_SECONDS,
+    INGEST_QUEUE_PATH,
+)
+from app.core.embeddings import embed_text_async
+from app.core.ingest_queue import DONE, IngestQueue
+from app.core.logger import logger
+from app.core.metrics import ingest_jobs_total, ingest_queue_depth
+from app.core.namespaces import Namespace, namespaces
+from app.schemas.note_schema import NoteCreate
+from app.service.note_service import create_notes_batch_service
+
+_lock = threading.Lock()
+_queue: Optional[IngestQueue] = None
+
+
+def get_ingest_queue() -> IngestQueue:
+    """The ingest queue, opened on first use."""
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                _queue = IngestQueue(INGEST_QUEUE_PATH, max_attempts=INGEST_MAX_ATTEMPTS)
+    return _queue
+
+
+async def enqueue_notes_service(ns: Namespace, items: List[NoteCreate]) -> List[str]:
+    """
+    Queue notes to be embedded and stored by the ingest worker.
+
+    Args:
+        ns (Namespace): Namespace the notes are written to.
+        items (List[NoteCreate]): Titles and contents of the notes.
+
+    Returns:
+        List[str]: One job ID per item, in input order. Each note is stored
+        under its job ID once the job is done.
+
+    Raises:
+        ValueError: If the queue already holds INGEST_MAX_QUEUED jobs.
+    """
+    if not items:
+        return []
+
+    queue = await asyncio.to_thread(get_ingest_queue)
+    job_ids = [str(uuid4()) for _ in items]
+
+    depth = await asyncio.to_thread(
+        queue.enqueue, ns.name, job_ids, [(item.title, item.content) for item in items], INGEST_MAX_QUEUED
+    )
+    ingest_queue_depth.set(depth)
+    ingest_jobs_total.inc(len(job_ids), status="queued")
+    ingest_worker.notify()
+    return job_ids
+
+
+async def get_job_service(ns: Namespace, job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Status of an ingest job, or None if it does not exist in this namespace.
+
+    Returns:
+        Optional[dict]: job_id, status, note_id (once done), attempts, last
+        error and timestamps.
+    """
+    queue = await asyncio.to_thread(get_ingest_queue)
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None or job["namespace"] != ns.name:
+        return None
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "note_id": job["id"] if job["status"] == DONE else None,
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "created_at": datetime.fromtimestamp(job["created_at"], timezone.utc),
+        "updated_at": datetime.fromtimestamp(job["updated_at"], timezone.utc),
+    }
+
+
+class IngestWorker:
+    """
+    Background task that drains the ingest queue.
+
+    Up to `batch_size` queued notes are claimed at a time, embedded (the
+    requests are batched into provider calls) and written with one insert
+    per namespace; only the notes that failed are retried. The worker
+    sleeps until notes are queued (or `poll_seconds` pass), and also for
+    `poll_seconds` after a failed batch before retrying. It is started and
+    stopped by the app lifespan; a batch in progress is finished first.
+    """
+
+    def __init__(self, batch_size: int = INGEST_BATCH_SIZE, poll_seconds: float = INGEST_POLL_SECONDS):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def notify(self) -> None:
+        """Wake the worker up because notes were queued."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self.notify()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        queue = await asyncio.to_thread(get_ingest_queue)
+        pruned_at = 0.0
+        while not self._stopping:
+            self._wake.clear()
+            try:
+                jobs = await asyncio.to_thread(queue.claim, self.batch_size)
+                if jobs:
+                    if await self._process(queue, jobs):
+                        continue
+                else:
+                    ingest_queue_depth.set(0)
+                if time.monotonic() - pruned_at > 3600:
+                    pruned_at = time.monotonic()
+                    await asyncio.to_thread(queue.prune, INGEST_JOB_RETENTION_HOURS * 3600)
+            except Exception:
+                logger.exception("Ingest worker iteration failed")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, queue: IngestQueue, jobs: List[Dict[str, Any]]) -> bool:
+        """
+        Embed and write claimed jobs, per namespace. Returns False if any job failed.
+
+        Each note is embedded on its own request (merged into batched provider
+        calls by the embedding batcher), so a note the provider rejects fails
+        only its own job; the others of its group are still written together.
+        """
+        succeeded = True
+        by_namespace: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        for job in jobs:
+            by_namespace.setdefault(job["namespace"], []).append(job)
+
+        for name, group in by_namespace.items():
+            failures: Dict[str, List[str]] = {}
+            written: List[str] = []
+            try:
+                ns = namespaces.acquire(name)
+                try:
+                    items = [NoteCreate(title=job["title"], content=job["content"]) for job in group]
+                    results = await asyncio.gather(
+                        *(embed_text_async(item.content) for item in items), return_exceptions=True
+                    )
+                    ok = [i for i, result in enumerate(results) if not isinstance(result, BaseException)]
+                    for i, result in enumerate(results):
+                        if isinstance(result, BaseException):
+                            failures.setdefault(_error(result), []).append(group[i]["id"])
+                    if ok:
+                        ids = [group[i]["id"] for i in ok]
+                        await create_notes_batch_service(
+                            ns, [items[i] for i in ok], [results[i] for i in ok], note_ids=ids
+                        )
+                        written = ids
+                finally:
+                    namespaces.release(ns)
+            except Exception as e:
+                failed_ids = {job_id for ids in failures.values() for job_id in ids}
+                failures.setdefault(_error(e), []).extend(
+                    job["id"] for job in group if job["id"] not in failed_ids
+                )
+
+            if written:
+                await asyncio.to_thread(queue.complete, written)
+                ingest_jobs_total.inc(len(written), status="done")
+            for error, ids in failures.items():
+                failed = await asyncio.to_thread(queue.fail, ids, error)
+                ingest_jobs_total.inc(len(ids) - failed, status="retried")
+                ingest_jobs_total.inc(failed, status="failed")
+                logger.warning(f"Ingest of {len(ids)} notes failed ({failed} for good): {error}")
+                succeeded = False
+
+        ingest_queue_depth.set(await asyncio.to_thread(queue.depth))
+        return succeeded
+
+
+def _error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+ingest_worker = IngestWorker()
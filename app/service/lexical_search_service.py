@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import EXPORT_CHUNK_SIZE, LEXICAL_SEARCH_ENABLED
+from app.core.lexical_index import LexicalIndex
+from app.core.logger import logger
+from app.core.namespaces import Namespace
+from app.service.export_service import iter_notes
+
+
+def rebuild_lexical_index(ns: Namespace, chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """
+    Reload the namespace's lexical index from the notes stored in Chroma.
+
+    The new index is built while writes keep going to the old one, and swapped
+    in once it has caught up (see `JournaledIndex`).
+
+    Returns:
+        int: Number of indexed notes.
+    """
+    index = ns.lexical.rebuild(lambda index: _load(ns, index, chunk_size))
+    logger.info(f"Built lexical index of '{ns.collection_name}' with {len(index)} notes")
+    return len(index)
+
+
+def _load(ns: Namespace, index: LexicalIndex, chunk_size: int) -> None:
+    for row in iter_notes(ns.collection(), include_embeddings=False, chunk_size=chunk_size):
+        index.upsert([row["id"]], [row["content"]], [row["metadata"]])
+
+
+def ensure_lexical_index(ns: Namespace) -> Optional[LexicalIndex]:
+    """The namespace's lexical index, built from Chroma on first use; None when disabled."""
+    if not LEXICAL_SEARCH_ENABLED:
+        return None
+    return ns.lexical.ensure(lambda: rebuild_lexical_index(ns))
+
+
+def lexical_upsert(
+    ns: Namespace,
+    ids: Sequence[str],
+    documents: Sequence[str],
+    metadatas: Sequence[Optional[Dict[str, Any]]],
+) -> None:
+    """Mirror written notes into the index. Called by the note services."""
+    if ids:
+        ns.lexical.apply("upsert", list(ids), list(documents), list(metadatas))
+
+
+def lexical_delete(ns: Namespace, ids: Sequence[str]) -> None:
+    """Mirror deletions into the index. Called by the note services."""
+    if ids:
+        ns.lexical.apply("delete", list(ids))
+
+
+async def lexical_search(
+    ns: Namespace,
+    query: str,
+    top_k: int,
+    ids: Optional[Collection[str]] = None,
+) -> List[Tuple[str, float, str, Dict[str, Any]]]:
+    """
+    BM25 top-k over note titles and contents, optionally only among `ids`.
+
+    Once the index is built the search runs inline: it is an in-memory
+    lookup and cheaper than a hop to a worker thread.
+
+    Returns:
+        List[Tuple[str, float, str, dict]]: (note ID, BM25 score, content,
+        metadata), best first.
+    """
+    if not LEXICAL_SEARCH_ENABLED:
+        return []
+    if not ns.lexical.built:
+        await asyncio.to_thread(ensure_lexical_index, ns)
+
+    index = ns.lexical.index
+    hits = []
+    for note_id, score in index.search(query, top_k, ids):
+        stored = index.get(note_id)
+        if stored is not None:
+            hits.append((note_id, score, stored[0], stored[1]))
+    return hits
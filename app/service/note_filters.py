@@ -0,0 +1,68 @@
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from app.core.namespaces import Namespace
+from app.schemas.note_schema import NoteFilters
+from app.utils.datetime_utils import to_epoch_ms
+
+# filter field -> (metadata key, Chroma operator)
+_RANGES = {
+    "created_after": ("created_at_ms", "$gt"),
+    "created_before": ("created_at_ms", "$lt"),
+    "updated_after": ("updated_at_ms", "$gt"),
+    "updated_before": ("updated_at_ms", "$lt"),
+}
+
+
+def has_filters(filters: Optional[NoteFilters]) -> bool:
+    return filters is not None and bool(filters.model_dump(exclude_none=True))
+
+
+def build_where(filters: Optional[NoteFilters]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Translate note filters into Chroma `where` and `where_document` clauses.
+
+    Timestamp ranges compare the epoch-millisecond metadata written next to
+    the ISO strings (see `app.scripts.backfill_timestamps` for older notes).
+
+    Returns:
+        Tuple[Optional[dict], Optional[dict]]: The `where` and `where_document`
+        arguments, each None when there is nothing to filter on.
+    """
+    if not has_filters(filters):
+        return None, None
+
+    conditions: List[Dict[str, Any]] = []
+    for field, (key, operator) in _RANGES.items():
+        value = getattr(filters, field)
+        if value is not None:
+            conditions.append({key: {operator: to_epoch_ms(value)}})
+    if filters.title is not None:
+        conditions.append({"title": {"$eq": filters.title}})
+
+    where: Optional[Dict[str, Any]] = None
+    if len(conditions) == 1:
+        where = conditions[0]
+    elif conditions:
+        where = {"$and": conditions}
+
+    where_document = {"$contains": filters.contains} if filters.contains else None
+    return where, where_document
+
+
+def filters_cache_key(filters: Optional[NoteFilters]) -> Tuple[Hashable, ...]:
+    """Hashable form of the filters, for search cache keys."""
+    if not has_filters(filters):
+        return ()
+    return tuple(sorted(filters.model_dump(exclude_none=True).items()))
+
+
+async def filtered_note_ids(ns: Namespace, filters: Optional[NoteFilters]) -> Optional[Set[str]]:
+    """
+    IDs of the notes matching the filters, read from Chroma without documents
+    or vectors. None when there are no filters (every note matches).
+    """
+    where, where_document = build_where(filters)
+    if where is None and where_document is None:
+        return None
+    result = await ns.store.get(where=where, where_document=where_document, include=[])
+    return set(result.get("ids") or [])
@@ -1,57 +1,273 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime, timezone
 
-from app.core.chroma_client import notes_collection
-from app.schemas.note_schema import NoteCreate, NoteUpdate
+from app.core.dedup_index import DuplicateMatch
+from app.core.namespaces import Namespace
+from app.core.embeddings import embed_text_async, embed_texts_async
+from app.core.metrics import dedup_avoided_total, dedup_matches_total
+from app.schemas.note_schema import NoteBatchUpdateItem, NoteCreate, NoteFilters, NoteUpdate
+from app.service.dedup_service import dedup_delete, dedup_upsert, find_duplicates
+from app.service.exact_search_service import matrix_delete, matrix_upsert
+from app.service.lexical_search_service import lexical_delete, lexical_upsert
+from app.service.note_filters import build_where
+from app.service.search_cache import bump_collection_version
+from app.utils.datetime_utils import parse_datetime, timestamp_fields, to_epoch_ms
 
 
-async def list_notes_service():
+def has_content(content: Optional[str]) -> bool:
+    """Whether an update's content replaces the stored one; blank content counts as unchanged."""
+    return content is not None and content.strip() != ""
+
+
+async def list_notes_service(
+    ns: Namespace,
+    limit: int = 100,
+    offset: int = 0,
+    include_content: bool = True,
+    sort: Optional[str] = None,
+    filters: Optional[NoteFilters] = None,
+) -> Tuple[Dict[str, Any], int]:
     """
-    Retrieve all stored notes from the vector database.
+    Retrieve one page of stored notes from the vector database.
+
+    Without `sort`, `limit`/`offset` are pushed down into Chroma so only the
+    requested page is read. Chroma cannot order by metadata, so sorting by
+    `updated_at` reads the metadata of every note (no documents or vectors),
+    sorts the ids and then fetches only the page. Filters are pushed down as
+    Chroma `where` / `where_document` clauses in both cases.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        limit (int): Maximum number of notes to return.
+        offset (int): Number of notes to skip.
+        include_content (bool): Whether to read the note documents.
+        sort (Optional[str]): "updated_at" or "-updated_at" (descending).
+        filters (Optional[NoteFilters]): Timestamp ranges, title and content filters.
 
     Returns:
-        dict: A Chroma result object containing ids, documents, and metadata.
+        Tuple[dict, int]: A Chroma result object containing ids, documents and
+        metadata for the page, and the total number of matching notes.
     """
-    return notes_collection.get()
+    include: List[Any] = ["metadatas", "documents"] if include_content else ["metadatas"]
+    where, where_document = build_where(filters)
+    filtered = where is not None or where_document is not None
 
+    if sort is None:
+        if filtered:
+            matching = await ns.store.get(where=where, where_document=where_document, include=[])
+            total = len(matching.get("ids") or [])
+        else:
+            total = await ns.store.count()
+        result = await ns.store.get(
+            limit=limit, offset=offset, where=where, where_document=where_document, include=include
+        )
+        return result, total
 
-async def create_note_service(data: NoteCreate, embedding: List[float]) -> str:
+    # The sort scan reads every matching id anyway, so it also gives the total.
+    everything = await ns.store.get(where=where, where_document=where_document, include=["metadatas"])
+    all_ids = everything.get("ids") or []
+    all_metas = everything.get("metadatas") or []
+    total = len(all_ids)
+    updated = {
+        note_id: str((meta or {}).get("updated_at") or "")
+        for note_id, meta in zip(all_ids, all_metas)
+    }
+    ordered = sorted(all_ids, key=updated.__getitem__, reverse=sort.startswith("-"))
+    page_ids = ordered[offset : offset + limit]
+    if not page_ids:
+        return {"ids": [], "documents": [], "metadatas": []}, total
+
+    page = await ns.store.get(ids=page_ids, include=include)
+    # get(ids=...) does not guarantee input order
+    position = {note_id: i for i, note_id in enumerate(page.get("ids") or [])}
+    rows = [position[note_id] for note_id in page_ids if note_id in position]
+    documents = page.get("documents") or []
+    metadatas = page.get("metadatas") or []
+    return {
+        "ids": [page["ids"][i] for i in rows],
+        "documents": [documents[i] for i in rows] if include_content else None,
+        "metadatas": [metadatas[i] for i in rows],
+    }, total
+
+
+async def create_note_service(ns: Namespace, data: NoteCreate, embedding: List[float]) -> str:
     """
     Create a new note and insert it into the vector store.
 
     Args:
+        ns (Namespace): Namespace holding the notes.
         data (NoteCreate): Title and content of the note.
         embedding (List[float]): Embedding vector generated from the note content.
 
     Returns:
         str: The UUID of the newly created note.
     """
-    note_id = str(uuid4())
-    now = datetime.now(timezone.utc).isoformat()
-
-    notes_collection.add(
-        ids=[note_id],
-        documents=[data.content],
-        metadatas=[{
-            "title": data.title,
-            "created_at": now,
-            "updated_at": now
-        }],
-        embeddings=[embedding]
+    note_ids = await create_notes_batch_service(ns, [data], [embedding])
+    return note_ids[0]
+
+
+async def create_notes_batch_service(
+    ns: Namespace,
+    items: List[NoteCreate],
+    embeddings: List[List[float]],
+    note_ids: Optional[List[str]] = None,
+    duplicate_of: Optional[List[Optional[str]]] = None,
+) -> List[str]:
+    """
+    Create several notes with a single vector-store write.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        items (List[NoteCreate]): Titles and contents of the notes.
+        embeddings (List[List[float]]): One embedding per item, in the same order.
+        note_ids (Optional[List[str]]): IDs to store the notes under (new UUIDs
+            by default). Chroma skips IDs that already exist, so a retried
+            write with the same IDs does not duplicate notes.
+        duplicate_of (Optional[List[Optional[str]]]): Per item, the note it
+            was found to duplicate, recorded in its metadata.
+
+    Returns:
+        List[str]: The IDs of the new notes, in input order.
+    """
+    if not items:
+        return []
+
+    if note_ids is None:
+        note_ids = [str(uuid4()) for _ in items]
+    now = datetime.now(timezone.utc)
+
+    documents = [item.content for item in items]
+    metadatas: List[Dict[str, Any]] = [{
+        "title": item.title,
+        **timestamp_fields("created_at", now),
+        **timestamp_fields("updated_at", now)
+    } for item in items]
+    for metadata, source in zip(metadatas, duplicate_of or []):
+        if source is not None:
+            metadata["duplicate_of"] = source
+
+    await ns.store.add(
+        ids=note_ids,
+        documents=documents,
+        metadatas=metadatas,
+        embeddings=embeddings
+    )
+    await matrix_upsert(ns, note_ids, embeddings)
+    lexical_upsert(ns, note_ids, documents, metadatas)
+    dedup_upsert(ns, note_ids, documents)
+    bump_collection_version(ns)
+
+    return note_ids
+
+
+async def create_notes_dedup_service(
+    ns: Namespace,
+    items: List[NoteCreate],
+    policy: str,
+) -> Tuple[List[Optional[str]], Dict[int, str], Dict[int, DuplicateMatch]]:
+    """
+    Embed and create notes, handling duplicate contents by `policy`.
+
+    Duplicates (see `find_duplicates`) are never embedded: "reject" fails
+    them, "merge" answers with the ID of the note they duplicate without
+    writing anything, and "link" stores them with that note's embedding
+    and its ID as `duplicate_of` metadata. With "off" every note is
+    embedded and stored. The per-note embedding requests are merged into
+    provider calls by the embedding batcher, which retries a failed call one
+    text at a time, so a provider error only fails the notes it rejects
+    (and the duplicates that depend on them).
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        items (List[NoteCreate]): Titles and non-empty contents of the notes.
+        policy (str): "off", "reject", "merge" or "link".
+
+    Returns:
+        Tuple[List[Optional[str]], Dict[int, str], Dict[int, DuplicateMatch]]:
+        Per item, the ID of its stored (or merged) note, None if it failed;
+        errors by item index; and the duplicates found, by item index.
+    """
+    new_ids = [str(uuid4()) for _ in items]
+    matches: List[Optional[DuplicateMatch]] = [None] * len(items)
+    if policy != "off" and items:
+        matches = await find_duplicates(ns, new_ids, [item.content for item in items])
+    duplicates = {i: match for i, match in enumerate(matches) if match is not None}
+    position = {note_id: i for i, note_id in enumerate(new_ids)}
+
+    errors: Dict[int, str] = {}
+    embeddings: Dict[int, List[float]] = {}
+    if policy == "link":
+        # Stored notes can be deleted after the match; their duplicates are then embedded after all.
+        stored = list({match.note_id for match in duplicates.values() if match.note_id not in position})
+        vectors: Dict[str, Any] = {}
+        if stored:
+            result = await ns.store.get(ids=stored, include=["embeddings"])
+            vectors = dict(zip(result.get("ids") or [], result.get("embeddings")))
+        for i, match in list(duplicates.items()):
+            if match.note_id in vectors:
+                embeddings[i] = [float(v) for v in vectors[match.note_id]]
+            elif match.note_id not in position:
+                del duplicates[i]
+
+    for i, match in duplicates.items():
+        dedup_matches_total.inc(kind=match.kind, policy=policy)
+
+    unique = [i for i in range(len(items)) if i not in duplicates]
+    results = await asyncio.gather(
+        *(embed_text_async(items[i].content) for i in unique),
+        return_exceptions=True,
     )
+    for i, result in zip(unique, results):
+        if isinstance(result, BaseException):
+            errors[i] = f"Embedding failed: {result}"
+        else:
+            embeddings[i] = result
 
-    return note_id
+    note_ids: List[Optional[str]] = [None] * len(items)
+    write: List[int] = []
+    for i in range(len(items)):
+        match = duplicates.get(i)
+        source = position.get(match.note_id) if match is not None else None
+        if source is not None and source in errors:
+            errors[i] = errors[source]
+        elif match is None or policy == "link":
+            if i not in errors:
+                write.append(i)
+                if match is not None and source is not None:
+                    embeddings[i] = embeddings[source]
+        elif policy == "reject":
+            errors[i] = f"Duplicate of note {match.note_id}"
+        else:
+            note_ids[i] = match.note_id
+
+    created = await create_notes_batch_service(
+        ns,
+        [items[i] for i in write],
+        [embeddings[i] for i in write],
+        note_ids=[new_ids[i] for i in write],
+        duplicate_of=[duplicates[i].note_id if i in duplicates else None for i in write],
+    )
+    for i, note_id in zip(write, created):
+        note_ids[i] = note_id
+
+    dedup_avoided_total.inc(len(duplicates), operation="embed")
+    if policy in ("reject", "merge"):
+        dedup_avoided_total.inc(len(duplicates), operation="write")
+    return note_ids, errors, duplicates
 
 
-async def update_note_service(note_id: str, data: NoteUpdate, embedding: Optional[List[float]]) -> str:
+async def update_note_service(ns: Namespace, note_id: str, data: NoteUpdate, embedding: Optional[List[float]]) -> str:
     """
     Update an existing note. If content changes, embedding is updated too.
 
     Args:
+        ns (Namespace): Namespace holding the notes.
         note_id (str): ID of the note to update.
         data (NoteUpdate): Fields to update (title/content).
         embedding (Optional[List[float]]): New embedding only if content changed.
+            Without one (or with blank content) the stored content is kept.
 
     Returns:
         str: The updated note's ID.
@@ -59,7 +275,7 @@ async def update_note_service(note_id: str, data: NoteUpdate, embedding: Optiona
     Raises:
         ValueError: If the note does not exist.
     """
-    result = notes_collection.get(ids=[note_id])
+    result = await ns.store.get(ids=[note_id])
     if not result or not result.get("ids"):
         raise ValueError("Note not found")
 
@@ -69,42 +285,213 @@ async def update_note_service(note_id: str, data: NoteUpdate, embedding: Optiona
     metadata = dict(metadatas[0])
     current_content = documents[0]
 
-    # Merge updates with existing data
-    new_content = data.content or current_content
+    # Merge updates with existing data; blank content leaves the stored one in place.
+    if has_content(data.content) and embedding is not None:
+        new_content = data.content
+    else:
+        new_content, embedding = current_content, None
     new_title = data.title or metadata.get("title", "")
 
     updated_metadata: Dict[str,Any] = {
         **metadata,
         "title": new_title,
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        **timestamp_fields("updated_at", datetime.now(timezone.utc))
     }
 
     update_params: Dict[str, Any] = {
         "ids": [note_id],
-        "documents": [new_content],
         "metadatas": [updated_metadata]
     }
 
-    # Only update embeddings if content changed
+    # Only update the document and embedding if content changed. Chroma
+    # re-embeds documents sent without embeddings with its own model.
     if embedding is not None:
+        update_params["documents"] = [new_content]
         update_params["embeddings"] = [embedding]
 
-    notes_collection.update(**update_params)
+    await ns.store.update(**update_params)
+    if embedding is not None:
+        await matrix_upsert(ns, [note_id], [embedding])
+    lexical_upsert(ns, [note_id], [new_content], [updated_metadata])
+    dedup_upsert(ns, [note_id], [new_content])
+    bump_collection_version(ns)
     return note_id
 
 
-async def delete_note_service(note_id: str) -> None:
+async def delete_note_service(ns: Namespace, note_id: str) -> None:
     """
     Delete a note from the vector store.
 
     Args:
+        ns (Namespace): Namespace holding the notes.
         note_id (str): ID of the note to delete.
 
     Raises:
         ValueError: If the note does not exist.
     """
-    result = notes_collection.get(ids=[note_id])
+    result = await ns.store.get(ids=[note_id])
     if not result or not result.get("ids"):
         raise ValueError("Note not found")
 
-    notes_collection.delete(ids=[note_id])
+    await ns.store.delete(ids=[note_id])
+    await matrix_delete(ns, [note_id])
+    lexical_delete(ns, [note_id])
+    dedup_delete(ns, [note_id])
+    bump_collection_version(ns)
+
+
+async def update_notes_batch_service(ns: Namespace, items: List[NoteBatchUpdateItem]) -> Tuple[List[str], List[str]]:
+    """
+    Update several notes with one existence check and one vector-store write.
+
+    Only notes whose content actually changed (blank content counts as
+    unchanged) are re-embedded, in one batched call. Chroma's `update` takes either no embeddings or one per id, so the
+    stored vectors of the other notes are passed through unchanged. When no
+    content changed, documents are not sent at all, since Chroma would
+    re-embed them with its own model.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        items (List[NoteBatchUpdateItem]): Note IDs with their title/content changes.
+
+    Returns:
+        Tuple[List[str], List[str]]: IDs of updated notes and IDs that do not exist.
+
+    Raises:
+        ValueError: If the same note ID appears more than once.
+    """
+    ids = [item.id for item in items]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Duplicate note IDs in batch")
+    if not ids:
+        return [], []
+
+    wants_content = any(has_content(item.content) for item in items)
+    include: List[Any] = ["documents", "metadatas"]
+    if wants_content:
+        include.append("embeddings")
+    result = await ns.store.get(ids=ids, include=include)
+
+    found_ids = result.get("ids") or []
+    documents = result.get("documents") or []
+    metadatas = result.get("metadatas") or []
+    stored_embeddings = result.get("embeddings") if wants_content else None
+    position = {note_id: i for i, note_id in enumerate(found_ids)}
+
+    found = [item for item in items if item.id in position]
+    not_found = [item.id for item in items if item.id not in position]
+    if not found:
+        return [], not_found
+
+    changed = [
+        item for item in found
+        if has_content(item.content) and item.content != documents[position[item.id]]
+    ]
+    new_embeddings = dict(zip(
+        (item.id for item in changed),
+        await embed_texts_async([item.content for item in changed]),
+    ))
+
+    updated_at = timestamp_fields("updated_at", datetime.now(timezone.utc))
+    update_params: Dict[str, Any] = {"ids": [], "documents": [], "metadatas": []}
+    embeddings: List[Any] = []
+
+    for item in found:
+        i = position[item.id]
+        metadata = dict(metadatas[i] or {})
+        update_params["ids"].append(item.id)
+        update_params["documents"].append(item.content if item.id in new_embeddings else documents[i])
+        update_params["metadatas"].append({
+            **metadata,
+            "title": item.title or metadata.get("title", ""),
+            **updated_at
+        })
+        if stored_embeddings is not None:
+            vector = new_embeddings.get(item.id)
+            embeddings.append(vector if vector is not None else [float(v) for v in stored_embeddings[i]])
+
+    # Only send documents and embeddings if some content changed
+    documents_after = update_params["documents"]
+    if new_embeddings:
+        update_params["embeddings"] = embeddings
+    else:
+        del update_params["documents"]
+
+    await ns.store.update(**update_params)
+    await matrix_upsert(ns, list(new_embeddings), list(new_embeddings.values()))
+    lexical_upsert(ns, update_params["ids"], documents_after, update_params["metadatas"])
+    dedup_upsert(ns, update_params["ids"], documents_after)
+    bump_collection_version(ns)
+    return update_params["ids"], not_found
+
+
+async def delete_notes_batch_service(ns: Namespace, note_ids: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Delete several notes with one existence check and one vector-store delete.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        note_ids (List[str]): IDs of the notes to delete.
+
+    Returns:
+        Tuple[List[str], List[str]]: IDs of deleted notes and IDs that do not exist.
+    """
+    note_ids = list(dict.fromkeys(note_ids))
+    if not note_ids:
+        return [], []
+
+    result = await ns.store.get(ids=note_ids, include=[])
+    existing = set(result.get("ids") or [])
+    deleted = [note_id for note_id in note_ids if note_id in existing]
+    not_found = [note_id for note_id in note_ids if note_id not in existing]
+
+    if deleted:
+        await ns.store.delete(ids=deleted)
+        await matrix_delete(ns, deleted)
+        lexical_delete(ns, deleted)
+        dedup_delete(ns, deleted)
+        bump_collection_version(ns)
+    return deleted, not_found
+
+
+async def delete_notes_older_than_service(ns: Namespace, cutoff: datetime, field: str = "updated_at") -> List[str]:
+    """
+    Delete every note whose `field` timestamp is older than `cutoff`.
+
+    The comparison is pushed down to Chroma on the epoch-millisecond
+    metadata. Notes written before that metadata existed (not yet updated by
+    `app.scripts.backfill_timestamps`) are found by comparing their ISO
+    timestamps instead, which reads the metadata of every note.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        cutoff (datetime): Notes strictly older than this are deleted.
+        field (str): "created_at" or "updated_at".
+
+    Returns:
+        List[str]: IDs of the deleted notes.
+    """
+    key, cutoff_ms = f"{field}_ms", to_epoch_ms(cutoff)
+    older = await ns.store.get(where={key: {"$lt": cutoff_ms}}, include=[])
+    newer = await ns.store.get(where={key: {"$gte": cutoff_ms}}, include=[])
+    deleted = list(older.get("ids") or [])
+    indexed = set(deleted).union(newer.get("ids") or [])
+
+    if len(indexed) < await ns.store.count():
+        if cutoff.tzinfo is None:
+            cutoff = cutoff.replace(tzinfo=timezone.utc)
+        everything = await ns.store.get(include=["metadatas"])
+        for note_id, metadata in zip(everything.get("ids") or [], everything.get("metadatas") or []):
+            if note_id in indexed:
+                continue
+            timestamp = parse_datetime((metadata or {}).get(field))
+            if timestamp is not None and timestamp < cutoff:
+                deleted.append(note_id)
+
+    if deleted:
+        await ns.store.delete(ids=deleted)
+        await matrix_delete(ns, deleted)
+        lexical_delete(ns, deleted)
+        dedup_delete(ns, deleted)
+        bump_collection_version(ns)
+    return deleted
@@ -0,0 +1,59 @@
+import threading
+import unicodedata
+from typing import Any, Hashable, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.core.config import SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL_SECONDS
+from app.core.namespaces import Namespace
+
+_lock = threading.Lock()
+_results: "TTLCache[Hashable, Any]" = TTLCache(
+    maxsize=max(SEARCH_CACHE_MAX_ENTRIES, 1),
+    ttl=SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+def collection_version(ns: Namespace) -> int:
+    """Current version of the namespace's notes collection; bumped on every write."""
+    return ns.version
+
+
+def bump_collection_version(ns: Namespace) -> int:
+    """
+    Mark the namespace's notes collection as changed.
+
+    The version is part of every cache key, so the namespace's cached search
+    results become unreachable and age out of the LRU/TTL cache; other
+    namespaces keep theirs.
+
+    Returns:
+        int: The new collection version.
+    """
+    return ns.bump_version()
+
+
+def search_cache_key(ns: Namespace, query: str, *params: Hashable) -> Tuple[Hashable, ...]:
+    """Build a cache key from the namespace and its version, the normalized query and search parameters."""
+    return (ns.collection_name, collection_version(ns), normalize_query(query), *params)
+
+
+def get_cached_results(key: Tuple[Hashable, ...]) -> Optional[Any]:
+    if SEARCH_CACHE_MAX_ENTRIES <= 0:
+        return None
+    with _lock:
+        return _results.get(key)
+
+
+def cache_results(ns: Namespace, key: Tuple[Hashable, ...], results: Any) -> None:
+    if SEARCH_CACHE_MAX_ENTRIES <= 0:
+        return
+    with _lock:
+        # A write may have landed while this search was running.
+        if key[1] == ns.version:
+            _results[key] = results
@@ -1,57 +1,300 @@
-from typing import List
-from app.core.embeddings import embed_text
-from app.core.chroma_client import notes_collection
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.embeddings import embed_text_async, embed_texts_async
+from app.core.namespaces import Namespace
+from app.core.config import HYBRID_CANDIDATES, LEXICAL_SEARCH_ENABLED, RRF_K, SEARCH_CHUNK_OVERFETCH
 from app.utils.datetime_utils import parse_datetime
-from app.schemas.note_schema import NoteMetadata, NoteSearchResult
+from app.utils.rank_utils import reciprocal_rank_fusion
+from app.schemas.note_schema import NoteFilters
+from app.service.exact_search_service import exact_search, use_exact_search
+from app.service.lexical_search_service import lexical_search
+from app.service.note_filters import build_where, filtered_note_ids, filters_cache_key, has_filters
+from app.service.search_cache import cache_results, get_cached_results, search_cache_key
 
+# One search hit, shaped like `NoteSearchResult`.
+SearchResult = Dict[str, Any]
 
-async def search_notes_service(query: str, top_k: int = 5) -> List[NoteSearchResult]:
+
+async def _exact_query(
+    ns: Namespace,
+    query_embedding: List[float],
+    top_k: int,
+    ids: Optional[Set[str]] = None,
+) -> Dict[str, Any]:
+    """Exact top-k over the vector matrix (only `ids` if given), shaped like a Chroma query result."""
+    hits = await exact_search(ns, query_embedding, top_k, ids)
+    if not hits:
+        return {}
+
+    found = await ns.store.get(ids=[note_id for note_id, _ in hits], include=["documents", "metadatas"])
+    position = {note_id: i for i, note_id in enumerate(found.get("ids") or [])}
+    documents = found.get("documents") or []
+    metadatas = found.get("metadatas") or []
+    hits = [(note_id, distance) for note_id, distance in hits if note_id in position]
+
+    return {
+        "ids": [[note_id for note_id, _ in hits]],
+        "documents": [[documents[position[note_id]] for note_id, _ in hits]],
+        "distances": [[distance for _, distance in hits]],
+        "metadatas": [[metadatas[position[note_id]] for note_id, _ in hits]],
+    }
+
+
+def _build_results(
+    ids: List[str],
+    docs: List[str],
+    scores: List[float],
+    metas: List[Any],
+) -> List[SearchResult]:
+    """Turn Chroma's column-oriented result lists into result dicts, without per-row models."""
+    matches: List[SearchResult] = []
+
+    for id_, doc, score, meta in zip(ids, docs, scores, metas):
+        metadata = None
+
+        if isinstance(meta, dict):
+            metadata = {
+                "title": str(meta.get("title")),
+                "created_at": parse_datetime(meta.get("created_at")),
+                "updated_at": parse_datetime(meta.get("updated_at")),
+                "parent_id": meta.get("parent_id"),
+                "chunk_index": meta.get("chunk_index")
+            }
+
+        matches.append({"id": id_, "content": doc, "score": score, "metadata": metadata})
+
+    return matches
+
+
+def _collapse_chunks(matches: List[SearchResult], top_k: int) -> List[SearchResult]:
+    """Keep only the best-ranked chunk of each document, then the first top_k results."""
+    seen: Set[str] = set()
+    collapsed: List[SearchResult] = []
+    for match in matches:
+        key = (match["metadata"] or {}).get("parent_id") or match["id"]
+        if key not in seen:
+            seen.add(key)
+            collapsed.append(match)
+            if len(collapsed) == top_k:
+                break
+    return collapsed
+
+
+async def _vector_query(
+    ns: Namespace,
+    query: str,
+    top_k: int,
+    exact: bool,
+    filters: Optional[NoteFilters],
+    ids: Optional[Set[str]],
+) -> Dict[str, Any]:
+    query_embedding = await embed_text_async(query)
+
+    if exact:
+        return await _exact_query(ns, query_embedding, top_k, ids)
+    where, where_document = build_where(filters)
+    return await ns.store.query(
+        query_embeddings=[query_embedding],
+        n_results=top_k,
+        where=where,
+        where_document=where_document
+    ) or {}
+
+
+def _first_row(results: Dict[str, Any], field: str) -> List[Any]:
+    return (results.get(field) or [[]])[0]
+
+
+def _query_row(results: Dict[str, Any], n: int) -> Dict[str, Any]:
+    """The n-th query of a multi-query Chroma result, as a single-query result."""
+    row: Dict[str, Any] = {}
+    for field in ("ids", "documents", "distances", "metadatas"):
+        values = results.get(field) or []
+        row[field] = [values[n] if n < len(values) else []]
+    return row
+
+
+async def search_notes_service(
+    ns: Namespace,
+    query: str,
+    top_k: int = 5,
+    engine: str = "auto",
+    mode: str = "vector",
+    filters: Optional[NoteFilters] = None,
+) -> List[SearchResult]:
     """
-    Perform semantic search on saved notes.
+    Perform semantic, keyword or hybrid search on saved notes.
+
+    In "vector" mode the query text is embedded and matched against the
+    Chroma vector store by nearest-neighbor similarity; scores are cosine
+    distances (lower is closer). "lexical" mode ranks notes by BM25 over
+    titles and contents from the in-memory lexical index, without calling
+    the embedding provider; scores are BM25 scores (higher is better).
+    "hybrid" fuses both rankings with reciprocal-rank fusion; scores are
+    fused RRF scores (higher is better). Results are cached per normalized
+    query until the collection changes.
+
+    With `engine="exact"` (or "auto" on small collections) the HNSW index
+    is bypassed for an exact scan of the memory-mapped vector matrix.
 
-    This function converts the input query text into an embedding vector,
-    performs a nearest-neighbor similarity search in the Chroma vector store,
-    and returns the top matched notes ordered by semantic relevance.
+    Chunks of ingested documents are collapsed to the best-ranked chunk per
+    parent document; SEARCH_CHUNK_OVERFETCH x top_k candidates are ranked so
+    that top_k results remain afterwards.
+
+    Filters shrink the candidate set before ranking: HNSW queries pass them
+    to Chroma as `where` clauses; the exact and lexical engines first read
+    the matching IDs from Chroma and only score those.
 
     Args:
+        ns (Namespace): Namespace holding the notes.
         query (str): The search phrase to match against note content.
         top_k (int): Number of most relevant notes to return. Defaults to 5.
+        engine (str): "auto", "hnsw" or "exact". Defaults to "auto".
+        mode (str): "vector", "lexical" or "hybrid". Defaults to "vector".
+            Falls back to "vector" when lexical search is disabled.
+        filters (Optional[NoteFilters]): Timestamp ranges, title and content filters.
 
     Returns:
-        List[NoteSearchResult]: A list of search results including note content,
-        score, and metadata such as title and timestamps.
+        List[dict]: Search results shaped like `NoteSearchResult` (note
+        content, score, and metadata such as title and timestamps), as plain
+        dicts so routes can encode them without building models.
     """
-    query_embedding = embed_text(query)
-
-    results = notes_collection.query(
-        query_embeddings=[query_embedding],
-        n_results=top_k
-    ) or {}
+    if not LEXICAL_SEARCH_ENABLED:
+        mode = "vector"
+    exact = mode != "lexical" and await use_exact_search(ns, engine)
+    cache_key = search_cache_key(ns, query, top_k, exact, mode, filters_cache_key(filters))
+    cached = get_cached_results(cache_key)
+    if cached is not None:
+        return cached
 
-    ids = (results.get("ids") or [[]])[0]
-    docs = (results.get("documents") or [[]])[0]
-    scores = (results.get("distances") or [[]])[0]
-    metas = (results.get("metadatas") or [[]])[0]
+    ids: Optional[Set[str]] = None
+    if has_filters(filters) and (exact or mode != "vector"):
+        ids = await filtered_note_ids(ns, filters)
+        if not ids:
+            cache_results(ns, cache_key, [])
+            return []
 
-    matches: List[NoteSearchResult] = []
-
-    for id_, doc, score, meta in zip(ids, docs, scores, metas):
-        metadata = None
+    fetch = top_k * SEARCH_CHUNK_OVERFETCH
+    if mode == "lexical":
+        hits = await lexical_search(ns, query, fetch, ids)
+        matches = _build_results(
+            [hit[0] for hit in hits],
+            [hit[2] for hit in hits],
+            [hit[1] for hit in hits],
+            [hit[3] for hit in hits],
+        )
 
-        if isinstance(meta, dict):
-            metadata = NoteMetadata(
-                title=str(meta.get("title")),
-                created_at=parse_datetime(meta.get("created_at")),
-                updated_at=parse_datetime(meta.get("updated_at"))
+    elif mode == "hybrid":
+        candidates = max(fetch, HYBRID_CANDIDATES)
+        results, hits = await asyncio.gather(
+            _vector_query(ns, query, candidates, exact, filters, ids),
+            lexical_search(ns, query, candidates, ids),
+        )
+        stored: Dict[str, Tuple[str, Any]] = {
+            id_: (doc, meta)
+            for id_, doc, meta in zip(
+                _first_row(results, "ids"), _first_row(results, "documents"), _first_row(results, "metadatas")
             )
+        }
+        stored.update({hit[0]: (hit[2], hit[3]) for hit in hits})
 
-        matches.append(
-            NoteSearchResult(
-                id=id_,
-                content=doc,
-                score=score,
-                metadata=metadata
-            )
+        fused = reciprocal_rank_fusion(
+            [_first_row(results, "ids"), [hit[0] for hit in hits]], k=RRF_K
+        )[:fetch]
+        matches = _build_results(
+            [id_ for id_, _ in fused],
+            [stored[id_][0] for id_, _ in fused],
+            [score for _, score in fused],
+            [stored[id_][1] for id_, _ in fused],
         )
 
+    else:
+        results = await _vector_query(ns, query, fetch, exact, filters, ids)
+        matches = _build_results(
+            _first_row(results, "ids"),
+            _first_row(results, "documents"),
+            _first_row(results, "distances"),
+            _first_row(results, "metadatas"),
+        )
+
+    matches = _collapse_chunks(matches, top_k)
+    cache_results(ns, cache_key, matches)
     return matches
+
+
+async def search_notes_batch_service(
+    ns: Namespace,
+    queries: List[str],
+    top_k: int = 5,
+    engine: str = "auto",
+    filters: Optional[NoteFilters] = None,
+    merge: bool = False,
+) -> Tuple[List[List[SearchResult]], Optional[List[SearchResult]]]:
+    """
+    Vector search for several queries at once.
+
+    Queries already in the search cache are answered from it. The rest are
+    embedded together (one batched provider call) and, on the HNSW engine,
+    sent to Chroma as a single multi-embedding `query`. Results share the
+    cache with `search_notes_service` in "vector" mode.
+
+    With `merge`, the per-query rankings are also fused with reciprocal-rank
+    fusion into one deduplicated top-k list.
+
+    Args:
+        ns (Namespace): Namespace holding the notes.
+        queries (List[str]): Search phrases, e.g. paraphrases of one question.
+        top_k (int): Number of results per query (and in the merged list).
+        engine (str): "auto", "hnsw" or "exact". Defaults to "auto".
+        filters (Optional[NoteFilters]): Timestamp ranges, title and content filters.
+        merge (bool): Whether to return the fused list too.
+
+    Returns:
+        Tuple[List[List[SearchResult]], Optional[List[SearchResult]]]:
+        Results per query, in input order, and the fused list (None unless
+        `merge`). Fused scores are RRF scores (higher is better).
+    """
+    exact = await use_exact_search(ns, engine)
+    filter_key = filters_cache_key(filters)
+    cache_keys = [search_cache_key(ns, query, top_k, exact, "vector", filter_key) for query in queries]
+    per_query: List[Optional[List[SearchResult]]] = [get_cached_results(key) for key in cache_keys]
+    pending = [i for i, cached in enumerate(per_query) if cached is None]
+
+    if pending:
+        ids: Optional[Set[str]] = None
+        if has_filters(filters) and exact:
+            ids = await filtered_note_ids(ns, filters)
+
+        fetch = top_k * SEARCH_CHUNK_OVERFETCH
+        embeddings = await embed_texts_async([queries[i] for i in pending])
+        if ids is not None and not ids:
+            rows = [{} for _ in pending]
+        elif exact:
+            rows = await asyncio.gather(*(_exact_query(ns, embedding, fetch, ids) for embedding in embeddings))
+        else:
+            where, where_document = build_where(filters)
+            results = await ns.store.query(
+                query_embeddings=embeddings,
+                n_results=fetch,
+                where=where,
+                where_document=where_document
+            ) or {}
+            rows = [_query_row(results, n) for n in range(len(pending))]
+
+        for i, row in zip(pending, rows):
+            per_query[i] = _collapse_chunks(_build_results(
+                _first_row(row, "ids"),
+                _first_row(row, "documents"),
+                _first_row(row, "distances"),
+                _first_row(row, "metadatas"),
+            ), top_k)
+            cache_results(ns, cache_keys[i], per_query[i])
+
+    answered: List[List[SearchResult]] = [matches or [] for matches in per_query]
+    if not merge:
+        return answered, None
+
+    by_id = {match["id"]: match for matches in answered for match in matches}
+    fused = reciprocal_rank_fusion([[match["id"] for match in matches] for matches in answered], k=RRF_K)[:top_k]
+    merged = [{**by_id[note_id], "score": score} for note_id, score in fused]
+    return answered, merged
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Optional
+
+from app.core.chroma_client import chroma_pool, warm_index
+from app.core.config import DEDUP_POLICY
+from app.core.embeddings import get_cache, get_provider
+from app.core.logger import logger
+from app.core.namespaces import namespaces
+from app.service.dedup_service import ensure_dedup_index
+from app.service.exact_search_service import ensure_matrix_synced
+from app.service.lexical_search_service import ensure_lexical_index
+
+_ready = threading.Event()
+_error: Optional[str] = None
+
+
+def warm_up() -> None:
+    """
+    Open every client and load the search indexes into memory.
+
+    Runs once at startup, off the event loop: builds the embedding provider
+    and cache, opens the default namespace's Chroma collection and loads its
+    HNSW index, syncs its exact-search matrix and builds its lexical index
+    (when enabled) and dedup index (when DEDUP_POLICY is not "off"). Tenant namespaces are loaded when first requested.
+    Readiness is only reported once all of it has succeeded; a failure is
+    logged and kept for `/ready`.
+    """
+    global _error
+    started = time.perf_counter()
+    try:
+        get_provider()
+        get_cache()
+        default = namespaces.default
+        total = warm_index(default.collection())
+        ensure_matrix_synced(default)
+        ensure_lexical_index(default)
+        if DEDUP_POLICY != "off":
+            ensure_dedup_index(default)
+    except Exception as e:
+        _error = f"{type(e).__name__}: {e}"
+        logger.exception("Startup warm-up failed")
+        return
+
+    _error = None
+    _ready.set()
+    logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s ({total} notes loaded)")
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def warm_up_error() -> Optional[str]:
+    """Why the last warm-up failed, or None."""
+    return _error
+
+
+def shut_down() -> None:
+    """Finish in-flight storage calls and flush the vector matrices and embedding cache to disk."""
+    _ready.clear()
+    chroma_pool.shutdown()
+    cache = get_cache()
+    if cache is not None:
+        cache.flush()
+    for namespace in namespaces.open_namespaces():
+        namespace.flush()
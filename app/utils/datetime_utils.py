@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Any, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
 
 def parse_datetime(value: Any) -> Optional[datetime]:
@@ -10,3 +10,18 @@ def parse_datetime(value: Any) -> Optional[datetime]:
         except ValueError:
             return None
     return None
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Milliseconds since the Unix epoch. Naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def timestamp_fields(field: str, value: datetime) -> Dict[str, Any]:
+    """
+    Metadata for one note timestamp: the ISO string under `field` and the
+    epoch milliseconds under `<field>_ms`, which Chroma can range-filter.
+    """
+    return {field: value.isoformat(), f"{field}_ms": to_epoch_ms(value)}
@@ -0,0 +1,19 @@
+from typing import Dict, List, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Merge several rankings of IDs with reciprocal-rank fusion.
+
+    Each ID scores the sum of 1 / (k + rank) over the rankings it appears in
+    (rank starting at 1), so IDs ranked well by several lists rise to the top
+    without having to compare their raw scores.
+
+    Returns:
+        List[Tuple[str, float]]: (ID, fused score), best first.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,23 @@
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi import Response
+
+# UTC datetimes end in "Z" and naive ones carry no offset, as Pydantic writes them.
+JSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Encode plain dicts/lists straight to a JSON response with orjson.
+
+    Returning a Response skips FastAPI's response-model validation and
+    `jsonable_encoder`, so routes using this keep `response_model` only for
+    the OpenAPI schema and must build content of the same shape.
+    """
+    return Response(
+        content=orjson.dumps(content, option=JSON_OPTIONS),
+        status_code=status_code,
+        headers=dict(headers) if headers else None,
+        media_type="application/json",
+    )
@@ -0,0 +1,68 @@
+from typing import Iterable, Iterator, List
+
+
+class TextChunker:
+    """
+    Incremental splitter of a text stream into overlapping chunks.
+
+    Text is fed in arbitrary pieces (e.g. decoded upload blocks). A chunk is
+    emitted as soon as `chunk_size` characters are buffered, cut at the last
+    whitespace in its second half so words are not split, and the next chunk
+    starts `overlap` characters before the cut (at a word boundary). Only
+    about one chunk of text is held in memory at a time.
+    """
+
+    def __init__(self, chunk_size: int = 2000, overlap: int = 200):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= overlap < chunk_size // 2:
+            raise ValueError("overlap must be at least 0 and less than half of chunk_size")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._buffer = ""
+        # Length of the buffer prefix already emitted as the previous chunk's tail.
+        self._carried = 0
+
+    def feed(self, text: str) -> List[str]:
+        """Add text; return the chunks that became complete."""
+        self._buffer += text
+        chunks = []
+        while len(self._buffer) >= self.chunk_size:
+            chunk = self._cut()
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def finish(self) -> List[str]:
+        """Flush the remaining text as a last chunk (unless it was all overlap)."""
+        tail, carried = self._buffer, self._carried
+        self._buffer, self._carried = "", 0
+        if len(tail) > carried and tail[carried:].strip():
+            return [tail.strip()]
+        return []
+
+    def _cut(self) -> str:
+        window = self._buffer[: self.chunk_size]
+        cut = max(window.rfind(" ", self.chunk_size // 2), window.rfind("\n", self.chunk_size // 2))
+        if cut <= 0:
+            cut = self.chunk_size
+
+        start = cut - self.overlap
+        if self.overlap:
+            # Begin the overlap at a word boundary when there is one.
+            space = self._buffer.find(" ", start, cut)
+            if space != -1:
+                start = space + 1
+
+        chunk = self._buffer[:cut].strip()
+        self._buffer = self._buffer[start:]
+        self._carried = cut - start
+        return chunk
+
+
+def chunk_text(pieces: Iterable[str], chunk_size: int = 2000, overlap: int = 200) -> Iterator[str]:
+    """Split an iterable of text pieces into overlapping chunks (see `TextChunker`)."""
+    chunker = TextChunker(chunk_size, overlap)
+    for piece in pieces:
+        yield from chunker.feed(piece)
+    yield from chunker.finish()
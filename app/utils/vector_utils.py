@@ -0,0 +1,15 @@
+import math
+from typing import Sequence, List
+
+
+def truncate_embedding(vector: Sequence[float], dimension: int) -> List[float]:
+    """
+    Keep the first `dimension` values of a Matryoshka-style embedding and
+    re-normalize to unit length. A `dimension` of 0 (or one at least as large
+    as the vector) only normalizes.
+    """
+    values = [float(v) for v in (vector[:dimension] if 0 < dimension < len(vector) else vector)]
+    norm = math.sqrt(sum(v * v for v in values))
+    if norm == 0:
+        return values
+    return [v / norm for v in values]
@@ -0,0 +1,218 @@
+"""
+In-process benchmarks for note storage and search.
+
+Every corpus size runs in a fresh subprocess against a temporary Chroma
+directory, with the deterministic hashing embedder (no network) and the
+embedding/search caches disabled, so numbers measure storage and search
+rather than cache hits. Results are written as JSON tagged with the current
+git commit, for comparison across commits.
+
+Usage:
+    python -m benchmarks.bench_notes --sizes 1000,10000,100000 --output bench.json
+    python -m benchmarks.bench_notes --sizes 1000000 --queries 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SINGLE_CREATES = 200
+BATCH_SIZE = 500
+LIST_PAGE = 100
+MUTATIONS = 100
+TOP_KS = (1, 10, 50, 100)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+    return {"p50_ms": at(0.50), "p90_ms": at(0.90), "p99_ms": at(0.99), "mean_ms": round(sum(ordered) / len(ordered), 3)}
+
+
+async def timed(samples: List[float], fn: Callable[[], Awaitable[Any]]) -> Any:
+    started = time.perf_counter()
+    result = await fn()
+    samples.append((time.perf_counter() - started) * 1000)
+    return result
+
+
+def sentence(rng: random.Random, vocabulary: List[str]) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 40)))
+
+
+async def run_size(size: int, queries: int, seed: int) -> Dict[str, Any]:
+    """Benchmark one corpus size. Runs inside the worker subprocess."""
+    from app.core.embeddings import embed_texts_async
+    from app.core.namespaces import namespaces
+    from app.schemas.note_schema import NoteCreate, NoteUpdate
+    from app.service.note_service import (
+        create_note_service,
+        create_notes_batch_service,
+        delete_note_service,
+        list_notes_service,
+        update_note_service,
+    )
+    from app.service.search_service import search_notes_service
+
+    ns = namespaces.default
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    result: Dict[str, Any] = {"size": size}
+
+    # Single creates: one embed + one add per note
+    singles = min(SINGLE_CREATES, size)
+    samples: List[float] = []
+    ids: List[str] = []
+    for i in range(singles):
+        item = NoteCreate(title=f"note {i}", content=sentence(rng, vocabulary))
+        embedding = (await embed_texts_async([item.content]))[0]
+        ids.append(await timed(samples, lambda: create_note_service(ns, item, embedding)))
+    result["create"] = {**percentiles(samples), "notes_per_sec": round(singles / (sum(samples) / 1000), 1)}
+
+    # Batch creates fill the rest of the corpus
+    remaining = size - singles
+    started = time.perf_counter()
+    while remaining > 0:
+        count = min(BATCH_SIZE, remaining)
+        items = [NoteCreate(title=f"note {size - remaining + i}", content=sentence(rng, vocabulary)) for i in range(count)]
+        embeddings = await embed_texts_async([item.content for item in items])
+        ids.extend(await create_notes_batch_service(ns, items, embeddings))
+        remaining -= count
+    elapsed = time.perf_counter() - started
+    if size > singles:
+        result["batch_create"] = {"notes": size - singles, "seconds": round(elapsed, 3),
+                                  "notes_per_sec": round((size - singles) / elapsed, 1)}
+
+    # Listing
+    samples = []
+    for _ in range(20):
+        offset = rng.randrange(0, max(size - LIST_PAGE, 1))
+        await timed(samples, lambda: list_notes_service(ns, limit=LIST_PAGE, offset=offset))
+    result["list_page"] = percentiles(samples)
+    samples = []
+    for _ in range(3):
+        await timed(samples, lambda: list_notes_service(ns, limit=LIST_PAGE, sort="-updated_at"))
+    result["list_sorted"] = percentiles(samples)
+
+    # Search, per engine and top_k
+    result["search"] = {}
+    for engine in ("hnsw", "exact"):
+        for top_k in TOP_KS:
+            samples = []
+            for _ in range(queries):
+                query = sentence(rng, vocabulary)
+                await timed(samples, lambda: search_notes_service(ns, query, top_k, engine))
+            result["search"][f"{engine}@{top_k}"] = percentiles(samples)
+
+    # Updates (content change -> re-embed) and deletes
+    targets = rng.sample(ids, min(MUTATIONS, len(ids)))
+    samples = []
+    for note_id in targets:
+        content = sentence(rng, vocabulary)
+        embedding = (await embed_texts_async([content]))[0]
+        await timed(samples, lambda: update_note_service(ns, note_id, NoteUpdate(content=content), embedding))
+    result["update"] = percentiles(samples)
+
+    samples = []
+    for note_id in targets:
+        await timed(samples, lambda: delete_note_service(ns, note_id))
+    result["delete"] = percentiles(samples)
+
+    result["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def run_worker(size: int, queries: int, seed: int) -> None:
+    sys.path.insert(0, ROOT_DIR)
+    print(json.dumps(asyncio.run(run_size(size, queries, seed))))
+
+
+def spawn(size: int, queries: int, seed: int, dim: int) -> Dict[str, Any]:
+    """Run one size in a clean subprocess with an isolated data directory."""
+    workdir = tempfile.mkdtemp(prefix="bench-notes-")
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT_DIR,
+        "EMBED_PROVIDER": "hashing",
+        "HASHING_EMBED_DIMENSION": str(dim),
+        "EMBED_CACHE_ENABLED": "false",
+        "SEARCH_CACHE_MAX_ENTRIES": "0",
+        "CHROMA_PATH": os.path.join(workdir, "chroma_db"),
+        "VECTOR_MATRIX_PATH": os.path.join(workdir, "vector_matrix"),
+    }
+    try:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_notes", "--worker", "--sizes", str(size),
+             "--queries", str(queries), "--seed", str(seed)],
+            cwd=workdir, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark note storage and search.")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated corpus sizes (up to 1000000).")
+    parser.add_argument("--queries", type=int, default=100, help="Search queries per engine/top_k.")
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension of the fake embedder.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if args.worker:
+        run_worker(sizes[0], args.queries, args.seed)
+        return
+
+    results = []
+    for size in sizes:
+        print(f"⏱  Benchmarking {size} notes...", file=sys.stderr)
+        row = spawn(size, args.queries, args.seed, args.dim)
+        results.append(row)
+        print(
+            f"   create p50={row['create']['p50_ms']}ms "
+            f"batch={row.get('batch_create', {}).get('notes_per_sec', '-')} notes/s "
+            f"search hnsw@10 p50={row['search']['hnsw@10']['p50_ms']}ms "
+            f"exact@10 p50={row['search']['exact@10']['p50_ms']}ms "
+            f"rss={row['max_rss_mb']}MB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "embedding_dim": args.dim,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Local stand-in for the Gemini embedding endpoint.
+
+Answers `models/<model>:batchEmbedContents` and `models/<model>:embedContent`
+with deterministic hashing-embedder vectors, after an injected latency, and
+fails a configurable fraction of requests with 429 or 500. Point the app at it
+with `GEMINI_BASE_URL=http://127.0.0.1:<port>`.
+
+Usage:
+    python -m benchmarks.fake_gemini --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from app.core.embedding_providers import HashingEmbeddingProvider
+
+
+class FakeGeminiServer:
+    """Threaded HTTP server imitating the Gemini embedding API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        dimension: int = 768,
+        latency_ms: float = 50.0,
+        jitter_ms: float = 20.0,
+        error_rate: float = 0.0,
+        rate_limit_share: float = 0.5,
+        seed: Optional[int] = None,
+    ):
+        self.embedder = HashingEmbeddingProvider(dimension)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_share = rate_limit_share
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "texts": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                server.handle(self, json.loads(self.rfile.read(length) or b"{}"))
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGeminiServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-gemini", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, request: BaseHTTPRequestHandler, body: Dict[str, Any]) -> None:
+        with self._lock:
+            delay = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms))
+            fail = self.random.random() < self.error_rate
+            rate_limited = self.random.random() < self.rate_limit_share
+            self.stats["requests"] += 1
+        time.sleep(delay / 1000)
+
+        if fail:
+            with self._lock:
+                self.stats["errors"] += 1
+            if rate_limited:
+                self.respond(request, 429, {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}})
+            else:
+                self.respond(request, 500, {"error": {"code": 500, "message": "Injected failure", "status": "INTERNAL"}})
+            return
+
+        if request.path.endswith(":batchEmbedContents"):
+            texts = [self.text_of(item) for item in body.get("requests", [])]
+            dims = [item.get("outputDimensionality") for item in body.get("requests", [])]
+            vectors = [self.vector(t, d) for t, d in zip(texts, dims)]
+            payload: Dict[str, Any] = {"embeddings": [{"values": v} for v in vectors]}
+        elif request.path.endswith(":embedContent"):
+            texts = [self.text_of(body)]
+            payload = {"embedding": {"values": self.vector(texts[0], body.get("outputDimensionality"))}}
+        else:
+            self.respond(request, 404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+
+        with self._lock:
+            self.stats["texts"] += len(texts)
+        self.respond(request, 200, payload)
+
+    def vector(self, text: str, dimension: Optional[int]) -> List[float]:
+        values = self.embedder.embed([text])[0]
+        return values[:dimension] if dimension else values
+
+    @staticmethod
+    def text_of(item: Dict[str, Any]) -> str:
+        parts = (item.get("content") or {}).get("parts") or []
+        return " ".join(part.get("text", "") for part in parts)
+
+    @staticmethod
+    def respond(request: BaseHTTPRequestHandler, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake Gemini embedding endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dim", type=int, default=768, help="Vector dimension returned.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean injected latency.")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Uniform jitter around the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail.")
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(args.host, args.port, args.dim, args.latency_ms, args.jitter_ms, args.error_rate)
+    print(f"Fake Gemini listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
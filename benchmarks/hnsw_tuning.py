@@ -0,0 +1,154 @@
+"""
+Sweep HNSW parameters and report build time, index size, latency and recall.
+
+Each (M, construction_ef, search_ef) combination gets a fresh Chroma
+collection in a temporary directory, built from either a synthetic clustered
+corpus or an NDJSON export with embeddings
+(`python -m app.scripts.export_notes --include-embeddings`). Recall@k is
+measured against exact brute-force search over the same vectors.
+
+Usage:
+    python -m benchmarks.hnsw_tuning --n 20000 --dim 768 --m 8,16,32 --search-ef 10,50,100
+    python -m benchmarks.hnsw_tuning --corpus notes.ndjson --output hnsw.json
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import chromadb
+import numpy as np
+import orjson
+from chromadb.config import Settings
+
+from app.core.chroma_client import hnsw_metadata
+from app.core.vector_matrix import normalize_rows
+
+ADD_BATCH = 1000
+
+
+def synthetic_corpus(n: int, dim: int, queries: int, clusters: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Clustered unit vectors, which is closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+
+    def sample(count: int) -> np.ndarray:
+        points = centers[rng.integers(0, clusters, size=count)] + 0.5 * rng.normal(size=(count, dim))
+        return normalize_rows(points.astype(np.float32))
+
+    return sample(n), sample(queries)
+
+
+def load_corpus(path: str, queries: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectors from an NDJSON export; queries are perturbed copies of random notes."""
+    with open(path, "rb") as f:
+        vectors = [orjson.loads(line)["embedding"] for line in f if line.strip()]
+    data = normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+    rng = np.random.default_rng(seed)
+    picks = data[rng.integers(0, len(data), size=queries)]
+    noise = 0.05 * rng.normal(size=picks.shape).astype(np.float32)
+    return data, normalize_rows(picks + noise)
+
+
+def exact_top_k(data: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    truth = []
+    for q in queries:
+        scores = data @ q
+        top = np.argpartition(-scores, k - 1)[:k]
+        truth.append({str(i) for i in top})
+    return truth
+
+
+def directory_size(path: str, exclude: str = "chroma.sqlite3") -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            if not name.startswith(exclude):
+                total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def run_one(data: np.ndarray, queries: np.ndarray, truth: List[set], k: int, m: int, cef: int, sef: int) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix="hnsw-tuning-")
+    try:
+        client = chromadb.PersistentClient(path=workdir, settings=Settings(anonymized_telemetry=False))
+        collection = client.create_collection(name="tuning", metadata=hnsw_metadata(m, cef, sef))
+
+        started = time.perf_counter()
+        for start in range(0, len(data), ADD_BATCH):
+            chunk = data[start : start + ADD_BATCH]
+            collection.add(ids=[str(i) for i in range(start, start + len(chunk))], embeddings=chunk)
+        build_seconds = time.perf_counter() - started
+
+        latencies = []
+        hits = 0
+        for q, expected in zip(queries, truth):
+            started = time.perf_counter()
+            result = collection.query(query_embeddings=[q], n_results=k, include=[])
+            latencies.append((time.perf_counter() - started) * 1000)
+            hits += len(expected & set(result["ids"][0]))
+
+        return {
+            "M": m,
+            "construction_ef": cef,
+            "search_ef": sef,
+            "build_seconds": round(build_seconds, 3),
+            "index_bytes": directory_size(workdir),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+            f"recall@{k}": round(hits / (k * len(queries)), 4),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep HNSW parameters for the notes collection.")
+    parser.add_argument("--corpus", help="NDJSON export with embeddings (default: synthetic corpus).")
+    parser.add_argument("--n", type=int, default=10_000, help="Synthetic corpus size.")
+    parser.add_argument("--dim", type=int, default=768, help="Synthetic vector dimension.")
+    parser.add_argument("--clusters", type=int, default=50, help="Synthetic cluster count.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries.")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query.")
+    parser.add_argument("--m", type=int_list, default=[16], help="Comma-separated M values.")
+    parser.add_argument("--construction-ef", type=int_list, default=[100], help="Comma-separated construction_ef values.")
+    parser.add_argument("--search-ef", type=int_list, default=[10, 50, 100], help="Comma-separated search_ef values.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    if args.corpus:
+        data, queries = load_corpus(args.corpus, args.queries, args.seed)
+    else:
+        data, queries = synthetic_corpus(args.n, args.dim, args.queries, args.clusters, args.seed)
+    k = min(args.k, len(data))
+    truth = exact_top_k(data, queries, k)
+    print(f"Corpus: {data.shape[0]} x {data.shape[1]}, {len(queries)} queries, k={k}")
+
+    results = []
+    for m, cef, sef in itertools.product(args.m, args.construction_ef, args.search_ef):
+        row = run_one(data, queries, truth, k, m, cef, sef)
+        results.append(row)
+        print(
+            f"M={m:<3} construction_ef={cef:<4} search_ef={sef:<4} "
+            f"build={row['build_seconds']:.2f}s size={row['index_bytes'] / 1e6:.1f}MB "
+            f"p50={row['p50_ms']:.2f}ms p99={row['p99_ms']:.2f}ms recall@{k}={row[f'recall@{k}']:.4f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"corpus": args.corpus or "synthetic", "n": int(data.shape[0]), "dim": int(data.shape[1]),
+                       "k": k, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
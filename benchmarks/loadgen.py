@@ -0,0 +1,248 @@
+"""
+HTTP load generator for the notes API, backed by a fake Gemini endpoint.
+
+Starts `benchmarks.fake_gemini` in-process, launches the FastAPI app under
+uvicorn in a subprocess pointed at it (temporary Chroma directory, caches
+off), seeds the collection, then drives an open-loop mix of create / search /
+list / update requests at a target rate. Latency is measured from each
+request's scheduled start, so queueing delay is included when the app falls
+behind. Per-route throughput, latency percentiles and error rates are
+printed and optionally written as JSON.
+
+Usage:
+    python -m benchmarks.loadgen --rps 200 --duration 30 --mix create=1,search=6,list=2,update=1
+    python -m benchmarks.loadgen --rps 50 --latency-ms 300 --error-rate 0.05 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.fake_gemini import FakeGeminiServer
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WORDS = [f"term{i}" for i in range(2000)]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"create", "search", "list", "update"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown routes in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def text(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+
+
+def percentile(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2) if ordered else 0.0
+
+
+class LoadGenerator:
+    def __init__(self, base_url: str, mix: Dict[str, float], seed: int, max_in_flight: int):
+        self.base_url = base_url
+        self.routes = list(mix)
+        self.weights = [mix[r] for r in self.routes]
+        self.rng = random.Random(seed)
+        self.note_ids: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.limit = asyncio.Semaphore(max_in_flight)
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+        )
+
+    async def seed(self, count: int) -> None:
+        for start in range(0, count, 500):
+            batch = [{"title": f"seed {i}", "content": text(self.rng)} for i in range(start, min(start + 500, count))]
+            response = await self.client.post("/notes/batch", json=batch)
+            response.raise_for_status()
+            self.note_ids.extend(i for i in response.json()["note_ids"] if i)
+
+    def request_for(self, route: str) -> Tuple[str, str, Dict[str, Any]]:
+        if route == "create":
+            return "POST", "/notes/", {"json": {"title": "load", "content": text(self.rng)}}
+        if route == "search":
+            return "GET", "/notes/search", {"params": {"q": text(self.rng), "top_k": 10}}
+        if route == "list":
+            return "GET", "/notes/", {"params": {"limit": 50, "fields": "title,updated_at"}}
+        note_id = self.rng.choice(self.note_ids) if self.note_ids else "missing"
+        return "PUT", f"/notes/{note_id}", {"json": {"content": text(self.rng)}}
+
+    async def fire(self, route: str, scheduled: float) -> None:
+        method, path, kwargs = self.request_for(route)
+        async with self.limit:
+            try:
+                response = await self.client.request(method, path, **kwargs)
+                ok = response.status_code < 400
+                if ok and route == "create":
+                    self.note_ids.append(response.json()["note_id"])
+            except httpx.HTTPError:
+                ok = False
+        self.latencies[route].append((time.perf_counter() - scheduled) * 1000)
+        if not ok:
+            self.errors[route] += 1
+
+    async def run(self, rps: float, duration: float) -> float:
+        tasks = []
+        started = time.perf_counter()
+        total = int(rps * duration)
+        for i in range(total):
+            scheduled = started + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            route = self.rng.choices(self.routes, self.weights)[0]
+            tasks.append(asyncio.create_task(self.fire(route, scheduled)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / elapsed, 1),
+                "error_rate": round(self.errors[route] / len(samples), 4),
+                "p50_ms": percentile(samples, 0.50),
+                "p90_ms": percentile(samples, 0.90),
+                "p99_ms": percentile(samples, 0.99),
+                "max_ms": round(max(samples), 2),
+            }
+        return routes
+
+
+def start_app(port: int, gemini_url: str, workdir: str, dim: int, extra_env: Dict[str, str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": ROOT_DIR,
+        "EMBED_PROVIDER": "gemini",
+        "GEN_API_KEY": "load-test",
+        "GEMINI_BASE_URL": gemini_url,
+        "EMBED_OUTPUT_DIM": str(dim),
+        "EMBED_CACHE_ENABLED": "false",
+        "SEARCH_CACHE_MAX_ENTRIES": "0",
+        "CHROMA_PATH": os.path.join(workdir, "chroma_db"),
+        "VECTOR_MATRIX_PATH": os.path.join(workdir, "vector_matrix"),
+        **extra_env,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+
+
+async def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("App exited during startup")
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError("App did not become healthy in time")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    gemini = FakeGeminiServer(
+        dimension=args.dim,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ).start()
+    workdir = tempfile.mkdtemp(prefix="loadgen-")
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    app: Optional[subprocess.Popen] = None
+
+    try:
+        app = start_app(port, gemini.url, workdir, args.dim, dict(e.split("=", 1) for e in args.app_env))
+        await wait_ready(base_url, app)
+
+        generator = LoadGenerator(base_url, args.mix, args.seed, args.max_in_flight)
+        print(f"🌱 Seeding {args.seed_notes} notes...", file=sys.stderr)
+        await generator.seed(args.seed_notes)
+
+        print(f"🚀 {args.rps} req/s for {args.duration}s, mix={args.mix}", file=sys.stderr)
+        elapsed = await generator.run(args.rps, args.duration)
+        routes = generator.report(elapsed)
+        await generator.client.aclose()
+
+        return {
+            "target_rps": args.rps,
+            "duration_s": round(elapsed, 2),
+            "achieved_rps": round(sum(r["requests"] for r in routes.values()) / elapsed, 1),
+            "fake_gemini": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+                            "error_rate": args.error_rate, **gemini.stats},
+            "routes": routes,
+        }
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait(timeout=10)
+        gemini.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the notes API against a fake Gemini endpoint.")
+    parser.add_argument("--rps", type=float, default=50, help="Target requests per second.")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load.")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("create=1,search=6,list=2,update=1"),
+                        help="Route weights, e.g. create=1,search=6,list=2,update=1.")
+    parser.add_argument("--seed-notes", type=int, default=1000, help="Notes created before the run.")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Concurrent request cap.")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension served by the fake endpoint.")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Fake Gemini mean latency.")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Fake Gemini latency jitter.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake Gemini failure fraction.")
+    parser.add_argument("--app-env", action="append", default=[], help="Extra KEY=VALUE for the app process.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    print(f"\nachieved {report['achieved_rps']} req/s (target {report['target_rps']})")
+    print(f"{'route':<8} {'reqs':>6} {'rps':>7} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8}")
+    for route, row in report["routes"].items():
+        print(f"{route:<8} {row['requests']:>6} {row['throughput_rps']:>7} {row['error_rate'] * 100:>6.2f} "
+              f"{row['p50_ms']:>8} {row['p90_ms']:>8} {row['p99_ms']:>8}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
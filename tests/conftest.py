@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+# Point every store at a scratch directory and use the offline hashing
+# provider; app.core.config reads these once, at import.
+_data = tempfile.mkdtemp(prefix="notes-tests-")
+os.environ["EMBED_PROVIDER"] = "hashing"
+os.environ["CHROMA_PATH"] = os.path.join(_data, "chroma_db")
+os.environ["EMBED_CACHE_PATH"] = os.path.join(_data, "embedding_cache.sqlite3")
+os.environ["VECTOR_MATRIX_PATH"] = os.path.join(_data, "vector_matrix")
+os.environ["INGEST_QUEUE_PATH"] = os.path.join(_data, "ingest_queue.sqlite3")
@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.namespaces import namespaces
+from app.main import app
+from app.routes import notes as notes_routes
+from app.service import note_service
+
+client = TestClient(app)
+BASE = "/tenants/batch-create/notes"
+
+
+@pytest.fixture
+def ns():
+    namespace = namespaces.acquire("batch-create")
+    yield namespace
+    namespaces.release(namespace)
+
+
+def _create(items):
+    return client.post(f"{BASE}/batch", params={"dedup": "off"}, json=items)
+
+
+def test_ids_are_returned_in_input_order_and_written_with_one_add(ns, monkeypatch):
+    adds = []
+    add = ns.store.add
+
+    async def counting_add(**kwargs):
+        adds.append(kwargs["ids"])
+        return await add(**kwargs)
+
+    monkeypatch.setattr(ns.store, "add", counting_add)
+    items = [{"title": f"title {i}", "content": f"batch note {i}"} for i in range(3)]
+
+    response = _create(items)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["errors"] == [] and body["message"] == "Created 3 of 3 notes"
+    stored = ns.collection().get(ids=body["note_ids"])
+    contents = dict(zip(stored["ids"], stored["documents"]))
+    assert [contents[note_id] for note_id in body["note_ids"]] == [item["content"] for item in items]
+    assert adds == [body["note_ids"]]
+
+
+def test_failed_items_get_errors_and_the_others_are_created(ns, monkeypatch):
+    embed = note_service.embed_text_async
+
+    async def embed_or_fail(text):
+        if text == "poison":
+            raise RuntimeError("provider rejected the text")
+        return await embed(text)
+
+    monkeypatch.setattr(note_service, "embed_text_async", embed_or_fail)
+
+    response = _create([
+        {"title": "a", "content": "fine note"},
+        {"title": "b", "content": "poison"},
+        {"title": "c", "content": "   "},
+        {"title": "d", "content": "another fine note"},
+    ])
+
+    body = response.json()
+    assert response.status_code == 201
+    assert [note_id is not None for note_id in body["note_ids"]] == [True, False, False, True]
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert "provider rejected the text" in body["errors"][0]["error"]
+    assert body["message"] == "Created 2 of 4 notes"
+
+
+def test_batches_over_the_limit_are_rejected(monkeypatch):
+    monkeypatch.setattr(notes_routes, "NOTES_BATCH_MAX_ITEMS", 2)
+
+    response = _create([{"title": "t", "content": f"note {i}"} for i in range(3)])
+
+    assert response.status_code == 400
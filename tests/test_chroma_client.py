@@ -0,0 +1,31 @@
+from chromadb.api.rust import RustBindingsAPI
+
+from app.core.chroma_client import open_client
+
+
+def _roundtrip(client):
+    collection = client.get_or_create_collection("notes-client")
+    collection.add(ids=["a", "b"], embeddings=[[1.0, 0.0], [0.0, 1.0]])
+    return collection.query(query_embeddings=[[1.0, 0.1]], n_results=1)["ids"][0]
+
+
+def test_bounded_client_stores_and_searches(tmp_path):
+    assert _roundtrip(open_client(str(tmp_path), index_cache_size=8)) == ["a"]
+
+
+def test_falls_back_to_a_plain_client_when_the_cache_size_is_not_exposed(tmp_path, monkeypatch, caplog):
+    init = RustBindingsAPI.__init__
+    calls = []
+
+    def without_cache_size(self, system):
+        init(self, system)
+        calls.append(self)
+        if len(calls) == 1:  # only the API open_client inspects, not the fallback's
+            del self.hnsw_cache_size
+
+    monkeypatch.setattr(RustBindingsAPI, "__init__", without_cache_size)
+
+    client = open_client(str(tmp_path), index_cache_size=8)
+
+    assert "CHROMA_INDEX_CACHE_SIZE is ignored" in caplog.text
+    assert _roundtrip(client) == ["a"]
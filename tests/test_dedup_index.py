@@ -0,0 +1,72 @@
+from app.core.dedup_index import EXACT, NEAR, DedupIndex, content_hash, simhash
+from app.core.lexical_index import tokenize
+
+TEXT = (
+    "The quarterly report shows revenue growth across all regions, with the strongest "
+    "gains in the northern markets and a modest decline in operating costs overall."
+)
+
+
+def test_content_hash_folds_whitespace_and_compatibility_forms():
+    assert content_hash("a  b\n c") == content_hash(" a b c ")
+    assert content_hash("ﬁle") == content_hash("file")
+    assert content_hash("a b") != content_hash("a c")
+
+
+def test_simhash_is_stable_and_close_for_similar_texts():
+    tokens = tokenize(TEXT)
+    edited = tokenize(TEXT.replace("modest", "slight"))
+
+    assert simhash(tokens) == simhash(list(tokens))
+    assert 0 <= simhash(tokens) < 1 << 64
+    assert bin(simhash(tokens, 2) ^ simhash(edited, 2)).count("1") < bin(
+        simhash(tokens, 2) ^ simhash(tokenize("an entirely unrelated note about gardening and tomatoes"), 2)
+    ).count("1")
+
+
+def test_exact_duplicate_is_found_by_content():
+    index = DedupIndex()
+    index.upsert(["a"], [TEXT])
+
+    match = index.find(index.fingerprint("  " + TEXT.replace(" ", "\n", 3)))
+
+    assert (match.note_id, match.kind, match.distance) == ("a", EXACT, 0)
+
+
+def test_near_duplicate_is_found_within_the_distance():
+    index = DedupIndex(max_distance=15, shingle_size=2, min_tokens=8)
+    index.upsert(["a"], [TEXT])
+
+    match = index.find(index.fingerprint(TEXT.replace("modest", "slight")))
+
+    assert match.note_id == "a" and match.kind == NEAR and 0 < match.distance <= 15
+
+
+def test_distant_text_is_not_a_duplicate():
+    index = DedupIndex(max_distance=0)
+    index.upsert(["a"], [TEXT])
+
+    assert index.find(index.fingerprint(TEXT.replace("modest", "slight"))) is None
+    assert index.find(index.fingerprint("an entirely unrelated note about gardening and tomatoes")) is None
+
+
+def test_short_notes_only_match_exactly():
+    index = DedupIndex(max_distance=15, min_tokens=8)
+    index.upsert(["a"], ["buy milk and eggs"])
+
+    assert index.fingerprint("buy milk and eggs")[1] is None
+    assert index.find(index.fingerprint("buy milk and eggs")).kind == EXACT
+    assert index.find(index.fingerprint("buy milk and bread")) is None
+
+
+def test_delete_and_reindex_remove_old_entries():
+    index = DedupIndex(max_distance=15)
+    index.upsert(["a", "b"], [TEXT, "something else entirely, long enough to get a fingerprint of its own"])
+    index.upsert(["a"], ["a rewritten note with different content that no longer matches the report"])
+
+    assert index.find(index.fingerprint(TEXT)) is None
+
+    index.delete(["b", "missing"])
+
+    assert len(index) == 1
+    assert index._buckets and all(members == {"a"} for members in index._buckets.values())
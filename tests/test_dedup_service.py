@@ -0,0 +1,22 @@
+import asyncio
+
+from app.core.dedup_index import EXACT
+from app.core.namespaces import Namespace
+from app.service import dedup_service
+from app.service.dedup_service import dedup_delete, find_duplicates
+
+
+def test_duplicates_match_stored_notes_then_earlier_notes_of_the_batch(monkeypatch):
+    ns = Namespace("dedup-find")
+    rows = [{"id": "stored", "content": "apples and pears"}, {"id": "gone", "content": "plums"}]
+    monkeypatch.setattr(dedup_service, "iter_notes", lambda *args, **kwargs: iter(rows))
+    monkeypatch.setattr(Namespace, "collection", lambda self: None)
+
+    assert asyncio.run(find_duplicates(ns, ["x"], ["plums"]))[0].note_id == "gone"  # builds the index
+    dedup_delete(ns, ["gone"])
+
+    matches = asyncio.run(
+        find_duplicates(ns, ["n1", "n2", "n3", "n4"], ["apples  and pears", "plums", "plums", "cherries"])
+    )
+
+    assert [(m.note_id, m.kind) if m else None for m in matches] == [("stored", EXACT), None, ("n2", EXACT), None]
@@ -0,0 +1,98 @@
+import threading
+from typing import List
+
+import pytest
+
+from app.core.embed_batcher import EmbeddingBatcher
+
+
+class FakeModel:
+    """Embeds a text as [len(text)] and records every batch it is sent."""
+
+    def __init__(self, reject: str = "", gate: threading.Event = None):
+        self.reject = reject
+        self.gate = gate
+        self.batches: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        with self._lock:
+            self.batches.append(list(texts))
+        if self.reject in texts:
+            raise ValueError(f"rejected {self.reject!r}")
+        return [[float(len(text))] for text in texts]
+
+
+def test_concurrent_texts_are_merged_into_one_call():
+    model = FakeModel()
+    batcher = EmbeddingBatcher(model, max_batch_size=10, max_wait_ms=200)
+
+    futures = [batcher.submit(text) for text in ("a", "bb", "ccc")]
+
+    assert [f.result(timeout=5) for f in futures] == [[1.0], [2.0], [3.0]]
+    assert model.batches == [["a", "bb", "ccc"]]
+
+
+def test_full_batch_is_sent_without_waiting_and_leftovers_follow():
+    model = FakeModel()
+    batcher = EmbeddingBatcher(model, max_batch_size=2, max_wait_ms=50)
+
+    assert batcher.embed_many(["a", "b", "c"]) == [[1.0], [1.0], [1.0]]
+    assert model.batches == [["a", "b"], ["c"]]
+
+
+def test_identical_texts_share_one_future_and_are_sent_once():
+    model = FakeModel()
+    batcher = EmbeddingBatcher(model, max_batch_size=10, max_wait_ms=200)
+
+    first, second = batcher.submit("same"), batcher.submit("same")
+
+    assert first is second
+    assert first.result(timeout=5) == [4.0]
+    assert model.batches == [["same"]]
+
+
+def test_identical_text_in_flight_is_not_sent_again():
+    gate = threading.Event()
+    model = FakeModel(gate=gate)
+    batcher = EmbeddingBatcher(model, max_batch_size=1, max_wait_ms=0)
+
+    first = batcher.submit("same")
+    second = batcher.submit("same")
+    gate.set()
+
+    assert first.result(timeout=5) == second.result(timeout=5) == [4.0]
+    assert model.batches == [["same"]]
+
+
+def test_failed_batch_is_retried_per_text_and_only_fails_the_bad_one():
+    model = FakeModel(reject="bad")
+    batcher = EmbeddingBatcher(model, max_batch_size=10, max_wait_ms=200)
+
+    good, bad, other = batcher.submit("good"), batcher.submit("bad"), batcher.submit("other")
+
+    assert good.result(timeout=5) == [4.0]
+    assert other.result(timeout=5) == [5.0]
+    with pytest.raises(ValueError, match="rejected"):
+        bad.result(timeout=5)
+    assert model.batches[0] == ["good", "bad", "other"]
+    assert sorted(map(tuple, model.batches[1:])) == [("bad",), ("good",), ("other",)]
+
+
+def test_wrong_number_of_vectors_fails_the_callers():
+    batcher = EmbeddingBatcher(lambda texts: [], max_batch_size=10, max_wait_ms=0)
+
+    with pytest.raises(ValueError, match="returned 0 vectors"):
+        batcher.embed("a")
+
+
+def test_failed_text_can_be_submitted_again():
+    model = FakeModel(reject="bad")
+    batcher = EmbeddingBatcher(model, max_batch_size=10, max_wait_ms=0)
+
+    with pytest.raises(ValueError):
+        batcher.embed("bad")
+    model.reject = ""
+    assert batcher.embed("bad") == [3.0]
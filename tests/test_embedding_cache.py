@@ -0,0 +1,34 @@
+from app.core.embedding_cache import EmbeddingCache
+
+
+def test_get_many_reads_disk_hits_into_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    EmbeddingCache(path).put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+
+    cache = EmbeddingCache(path)
+    assert cache.get_memory("a") is None
+    assert cache.get_many(["a", "b", "c"]) == {"a": [1.0, 2.0], "b": [3.0, 4.0]}
+    assert cache.get_memory("a") == [1.0, 2.0]
+
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["misses"], stats["memory_hits"]) == (2, 1, 1)
+
+
+def test_last_used_updates_are_written_in_batches(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    EmbeddingCache(path).put_many(["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    cache = EmbeddingCache(path, touch_batch=2)
+
+    def last_used(key):
+        return cache._db.execute("SELECT last_used FROM embeddings WHERE key = ?", (key,)).fetchone()[0]
+
+    before = last_used("a")
+    cache.get("a")
+    assert last_used("a") == before  # pending
+
+    cache.get("b")  # second touch fills the batch
+    assert last_used("a") > before and last_used("b") > before
+
+    cache.get("c")
+    cache.flush()
+    assert last_used("c") > before
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+from app.core.namespaces import namespaces
+from app.service.exact_search_service import get_notes_matrix, matrix_delete, matrix_upsert
+
+
+def test_mirroring_waits_for_a_rebuild_off_the_event_loop():
+    ns = namespaces.acquire("mirroring")
+    try:
+        get_notes_matrix(ns)
+        locked, release = threading.Event(), threading.Event()
+
+        def rebuild():  # stands in for rebuild_notes_matrix holding the lock
+            with ns.matrix_lock:
+                locked.set()
+                release.wait(timeout=5)
+
+        async def scenario():
+            holder = threading.Thread(target=rebuild)
+            holder.start()
+            locked.wait(timeout=5)
+
+            write = asyncio.create_task(matrix_upsert(ns, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]]))
+            ticks = 0
+            for _ in range(5):  # the loop keeps running while the write waits
+                await asyncio.sleep(0.01)
+                ticks += 1
+            assert not write.done()
+
+            release.set()
+            await write
+            await matrix_delete(ns, ["a"])
+            holder.join()
+            return ticks
+
+        assert asyncio.run(scenario()) == 5
+        assert "b" in ns.matrix and "a" not in ns.matrix
+    finally:
+        namespaces.release(ns)
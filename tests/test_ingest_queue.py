@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.core.ingest_queue import DONE, FAILED, PROCESSING, QUEUED, IngestQueue
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "queue.sqlite3")
+
+
+def _notes(count):
+    return [(f"title {i}", f"content {i}") for i in range(count)]
+
+
+def test_claim_returns_the_oldest_queued_jobs_as_processing(path):
+    queue = IngestQueue(path)
+    queue.enqueue(None, ["a", "b"], _notes(2))
+    queue.enqueue("tenant", ["c"], _notes(1))
+
+    first = queue.claim(2)
+    second = queue.claim(5)
+
+    assert [job["id"] for job in first] == ["a", "b"]
+    assert first[0] == {"id": "a", "namespace": None, "title": "title 0", "content": "content 0", "attempts": 1}
+    assert [(job["id"], job["namespace"]) for job in second] == [("c", "tenant")]
+    assert queue.get("a")["status"] == PROCESSING
+    assert queue.claim(5) == []
+    assert queue.depth() == 3
+
+
+def test_complete_marks_jobs_done_and_drops_their_content(path):
+    queue = IngestQueue(path)
+    queue.enqueue(None, ["a"], _notes(1))
+    queue.claim(1)
+
+    queue.complete(["a"])
+
+    assert queue.get("a")["status"] == DONE and queue.depth() == 0
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT content FROM jobs WHERE id = 'a'").fetchone() == ("",)
+
+
+def test_failed_jobs_are_requeued_until_max_attempts(path):
+    queue = IngestQueue(path, max_attempts=2)
+    queue.enqueue(None, ["a"], _notes(1))
+
+    queue.claim(1)
+    assert queue.fail(["a"], "boom") == 0
+    assert (queue.get("a")["status"], queue.get("a")["error"]) == (QUEUED, "boom")
+
+    assert [job["attempts"] for job in queue.claim(1)] == [2]
+    assert queue.fail(["a"], "boom again") == 1
+    assert queue.get("a")["status"] == FAILED
+    assert queue.claim(1) == [] and queue.depth() == 0
+
+
+def test_jobs_left_processing_are_queued_again_on_open(path):
+    queue = IngestQueue(path)
+    queue.enqueue(None, ["a", "b"], _notes(2))
+    queue.claim(1)
+
+    reopened = IngestQueue(path)
+
+    assert reopened.get("a")["status"] == QUEUED
+    assert [job["id"] for job in reopened.claim(5)] == ["a", "b"]
+
+
+def test_prune_deletes_only_old_finished_jobs(path):
+    queue = IngestQueue(path, max_attempts=1)
+    queue.enqueue(None, ["done", "failed", "queued"], _notes(3))
+    queue.claim(2)
+    queue.complete(["done"])
+    queue.fail(["failed"], "boom")
+
+    assert queue.prune(3600) == 0
+    time.sleep(0.01)
+    assert queue.prune(0) == 2
+
+    assert queue.get("done") is None and queue.get("failed") is None
+    assert queue.get("queued")["status"] == QUEUED
+
+
+def test_enqueue_rejects_jobs_past_the_limit(path):
+    queue = IngestQueue(path)
+
+    assert queue.enqueue(None, ["a", "b"], _notes(2), max_queued=3) == 2
+    with pytest.raises(ValueError):
+        queue.enqueue(None, ["c", "d"], _notes(2), max_queued=3)
+
+    assert queue.depth() == 2 and queue.get("c") is None
+
+
+def test_concurrent_enqueues_cannot_overfill_the_queue(path):
+    queues = [IngestQueue(path) for _ in range(8)]  # separate connections, like separate processes
+    accepted = []
+
+    def enqueue(i, queue):
+        try:
+            queue.enqueue(None, [f"{i}-a", f"{i}-b"], _notes(2), max_queued=5)
+            accepted.append(i)
+        except ValueError:
+            pass
+
+    threads = [threading.Thread(target=enqueue, args=(i, queue)) for i, queue in enumerate(queues)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(accepted) == 2 and queues[0].depth() == 4
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.core.embeddings import embed_text_async
+from app.core.ingest_queue import DONE, QUEUED, IngestQueue
+from app.core.namespaces import namespaces
+from app.service import ingest_service
+from app.service.ingest_service import IngestWorker
+
+
+def test_a_poison_note_fails_only_its_own_job(tmp_path, monkeypatch):
+    async def embed(text):
+        if text == "poison":
+            raise ValueError("rejected by the provider")
+        return await embed_text_async(text)
+
+    monkeypatch.setattr(ingest_service, "embed_text_async", embed)
+    queue = IngestQueue(str(tmp_path / "queue.sqlite3"))
+    ids = ["ingest-1", "ingest-2", "ingest-3"]
+    queue.enqueue("ingest", ids, [("one", "first note"), ("two", "poison"), ("three", "third note")])
+
+    succeeded = asyncio.run(IngestWorker()._process(queue, queue.claim(10)))
+
+    assert succeeded is False
+    assert [queue.get(job_id)["status"] for job_id in ids] == [DONE, QUEUED, DONE]
+    assert "rejected by the provider" in queue.get("ingest-2")["error"]
+    ns = namespaces.acquire("ingest")
+    try:
+        assert sorted(ns.collection().get(ids=ids)["ids"]) == ["ingest-1", "ingest-3"]
+    finally:
+        namespaces.release(ns)
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from app.core.journaled_index import JournaledIndex
+
+
+class SetIndex:
+    def __init__(self):
+        self.ids = set()
+
+    def upsert(self, ids):
+        self.ids.update(ids)
+
+    def delete(self, ids):
+        self.ids.difference_update(ids)
+
+
+def test_writes_before_the_first_build_are_dropped():
+    holder = JournaledIndex(SetIndex)
+
+    holder.apply("upsert", ["a"])
+
+    assert not holder.built and holder.index.ids == set()
+
+
+def test_rebuild_replays_writes_made_while_loading_without_holding_the_write_lock():
+    holder = JournaledIndex(SetIndex)
+    holder.rebuild(lambda index: index.upsert(["old"]))
+
+    def load(index):
+        index.upsert(["a", "b"])
+        # Another thread writes while the load is in progress; it must not wait for it.
+        writer = threading.Thread(target=lambda: (holder.apply("upsert", ["c"]), holder.apply("delete", ["a"])))
+        writer.start()
+        writer.join(timeout=1)
+        assert not writer.is_alive()
+
+    index = holder.rebuild(load)
+
+    assert holder.index is index and holder.built
+    assert index.ids == {"b", "c"}
+
+
+def test_a_failed_rebuild_keeps_the_current_index():
+    holder = JournaledIndex(SetIndex)
+    current = holder.rebuild(lambda index: index.upsert(["a"]))
+
+    def load(index):
+        raise RuntimeError("chroma is down")
+
+    with pytest.raises(RuntimeError):
+        holder.rebuild(load)
+    holder.apply("upsert", ["b"])
+
+    assert holder.index is current and current.ids == {"a", "b"}
+
+
+def test_ensure_builds_once_and_reset_drops_the_index():
+    holder = JournaledIndex(SetIndex)
+    builds = []
+
+    def build():
+        builds.append(1)
+        holder.rebuild(lambda index: index.upsert(["a"]))
+
+    assert holder.ensure(build).ids == {"a"}
+    assert holder.ensure(build).ids == {"a"}
+    assert len(builds) == 1
+
+    holder.reset()
+
+    assert not holder.built and holder.index.ids == set()
@@ -0,0 +1,25 @@
+import asyncio
+
+from app.core.namespaces import Namespace
+from app.service import lexical_search_service
+from app.service.lexical_search_service import lexical_search, lexical_upsert, rebuild_lexical_index
+
+
+def _row(note_id, content):
+    return {"id": note_id, "content": content, "metadata": {"title": f"title {note_id}"}}
+
+
+def test_rebuild_indexes_stored_notes_for_search(monkeypatch):
+    ns = Namespace("lexical-rebuild")
+    rows = [_row("a", "apples and pears"), _row("b", "bananas and apples")]
+    monkeypatch.setattr(lexical_search_service, "iter_notes", lambda *args, **kwargs: iter(rows))
+    monkeypatch.setattr(Namespace, "collection", lambda self: None)
+
+    assert rebuild_lexical_index(ns) == 2
+    lexical_upsert(ns, ["c"], ["cherries"], [{"title": "title c"}])
+
+    hits = asyncio.run(lexical_search(ns, "apples", 5, ids={"b", "c"}))
+    assert [(note_id, content, metadata) for note_id, _, content, metadata in hits] == [
+        ("b", "bananas and apples", {"title": "title b"})
+    ]
+    assert [hit[0] for hit in asyncio.run(lexical_search(ns, "cherries", 5))] == ["c"]
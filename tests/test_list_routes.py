@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.namespaces import namespaces
+from app.main import app
+
+client = TestClient(app)
+BASE = "/tenants/list-routes/notes"
+
+
+@pytest.fixture(scope="module")
+def note_ids():
+    ids = []
+    for i in range(5):
+        response = client.post(f"{BASE}/", params={"dedup": "off"}, json={"title": f"title {i % 2}", "content": f"note {i}"})
+        assert response.status_code == 201
+        ids.append(response.json()["note_id"])
+        time.sleep(0.002)  # distinct updated_at
+    return ids
+
+
+def _list(**params):
+    response = client.get(f"{BASE}/", params=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_cursor_pages_through_every_note_once(note_ids):
+    seen, cursor = [], None
+    while True:
+        response = _list(limit=2, **({"cursor": cursor} if cursor else {}))
+        body = response.json()
+        assert response.headers["X-Total-Count"] == "5"
+        seen.extend(note["id"] for note in body["notes"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(note_ids)
+    assert client.get(f"{BASE}/", params={"cursor": "nope"}).status_code == 400
+
+
+def test_fields_projects_each_note(note_ids):
+    notes = _list(fields="title, updated_at").json()["notes"]
+
+    assert all(set(note) == {"id", "title", "updated_at"} for note in notes)
+    assert client.get(f"{BASE}/", params={"fields": "title,secret"}).status_code == 400
+
+
+def test_sort_orders_by_last_update(note_ids):
+    assert client.put(f"{BASE}/{note_ids[0]}", json={"title": "renamed"}).status_code == 200
+
+    newest_first = [note["id"] for note in _list(sort="-updated_at").json()["notes"]]
+    oldest_first = [note["id"] for note in _list(sort="updated_at").json()["notes"]]
+
+    assert newest_first == [note_ids[0], *reversed(note_ids[1:])]
+    assert oldest_first == list(reversed(newest_first))
+
+
+def test_sorted_filtered_page_counts_from_the_sort_scan(note_ids, monkeypatch):
+    ns = namespaces.acquire("list-routes")
+    gets = []
+    original = ns.store.get
+
+    async def get(**kwargs):
+        gets.append(kwargs)
+        return await original(**kwargs)
+
+    monkeypatch.setattr(ns.store, "get", get)
+    try:
+        response = _list(sort="updated_at", title="title 1", limit=1)
+    finally:
+        namespaces.release(ns)
+
+    assert response.headers["X-Total-Count"] == "2"
+    assert response.json()["next_cursor"] == "1"
+    assert len(gets) == 2  # the sort scan and the page, no separate count
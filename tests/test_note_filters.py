@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.embeddings import embed_texts_async
+from app.core.namespaces import namespaces
+from app.main import app
+from app.schemas.note_schema import NoteCreate
+from app.service.note_service import create_notes_batch_service
+from app.utils.datetime_utils import timestamp_fields
+
+client = TestClient(app)
+
+
+def _at(year, month=1):
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def _create(name, notes):
+    """Create (title, content, created_at, updated_at) notes with the given timestamps."""
+    ns = namespaces.acquire(name)
+    try:
+        items = [NoteCreate(title=title, content=content) for title, content, _, _ in notes]
+        embeddings = asyncio.run(embed_texts_async([item.content for item in items]))
+        ids = asyncio.run(create_notes_batch_service(ns, items, embeddings))
+        ns.collection().update(
+            ids=ids,
+            metadatas=[
+                {"title": title, **timestamp_fields("created_at", created), **timestamp_fields("updated_at", updated)}
+                for title, _, created, updated in notes
+            ],
+        )
+        return ids
+    finally:
+        namespaces.release(ns)
+
+
+def _create_unbackfilled(name, notes):
+    """Add notes the way older releases stored them: ISO timestamps only, no `*_ms` fields."""
+    ns = namespaces.acquire(name)
+    try:
+        ids = [f"legacy-{i}" for i in range(len(notes))]
+        ns.collection().add(
+            ids=ids,
+            documents=[content for _, content, _ in notes],
+            embeddings=asyncio.run(embed_texts_async([content for _, content, _ in notes])),
+            metadatas=[
+                {"title": title, "created_at": updated.isoformat(), "updated_at": updated.isoformat()}
+                for title, _, updated in notes
+            ],
+        )
+        return ids
+    finally:
+        namespaces.release(ns)
+
+
+@pytest.fixture(scope="module")
+def notes():
+    a, b, c = _create("filters", [
+        ("alpha", "red apples", _at(2020), _at(2020, 2)),
+        ("beta", "green apples", _at(2021), _at(2024)),
+        ("alpha", "yellow bananas", _at(2023), _at(2023, 6)),
+    ])
+    return {"a": a, "b": b, "c": c}
+
+
+def _names(notes, items):
+    ids = {item["id"] for item in items}
+    return sorted(name for name, note_id in notes.items() if note_id in ids)
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({"created_after": "2020-06-01T00:00:00Z"}, ["b", "c"]),
+    ({"updated_before": "2023-12-31T00:00:00Z"}, ["a", "c"]),
+    ({"title": "alpha"}, ["a", "c"]),
+    ({"contains": "apples"}, ["a", "b"]),
+    ({"title": "alpha", "contains": "apples"}, ["a"]),
+])
+def test_list_filters_are_pushed_down(notes, params, expected):
+    response = client.get("/tenants/filters/notes/", params=params)
+
+    assert response.status_code == 200
+    assert _names(notes, response.json()["notes"]) == expected
+    assert response.headers["X-Total-Count"] == str(len(expected))
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({"engine": "exact"}, ["a", "c"]),
+    ({"engine": "hnsw"}, ["a", "c"]),
+    ({"mode": "lexical"}, ["a"]),
+])
+def test_search_only_scores_the_filtered_notes(notes, params, expected):
+    # "beta" is the closest match for "green apples" but is filtered out by title.
+    response = client.get(
+        "/tenants/filters/notes/search", params={"q": "green apples", "top_k": 5, "title": "alpha", **params}
+    )
+
+    assert response.status_code == 200
+    assert _names(notes, response.json()["results"]) == expected
+
+
+def test_delete_by_age_uses_the_epoch_fields(monkeypatch):
+    old, new = _create("age-backfilled", [
+        ("old", "old note", _at(2020), _at(2020)),
+        ("new", "new note", _at(2024), _at(2024)),
+    ])
+    ns = namespaces.acquire("age-backfilled")
+    requested = []
+    get = ns.store.get
+
+    async def spy(**kwargs):
+        requested.append(kwargs.get("include"))
+        return await get(**kwargs)
+
+    monkeypatch.setattr(ns.store, "get", spy)
+    try:
+        response = client.delete("/tenants/age-backfilled/notes/", params={"older_than": "2022-01-01T00:00:00Z"})
+
+        assert response.status_code == 200
+        assert response.json()["note_ids"] == [old]
+        assert ns.collection().get(include=[])["ids"] == [new]
+        assert not any("metadatas" in (include or []) for include in requested)
+    finally:
+        namespaces.release(ns)
+
+
+def test_delete_by_age_falls_back_to_iso_timestamps_for_unbackfilled_notes():
+    old, new = _create_unbackfilled("age-legacy", [
+        ("old", "old note", _at(2020)),
+        ("new", "new note", _at(2024)),
+    ])
+    (backfilled,) = _create("age-legacy", [("older", "older note", _at(2019), _at(2019))])
+
+    response = client.delete(
+        "/tenants/age-legacy/notes/", params={"older_than": "2022-01-01T00:00:00", "field": "created_at"}
+    )
+
+    assert response.status_code == 200
+    assert sorted(response.json()["note_ids"]) == sorted([backfilled, old])
+    ns = namespaces.acquire("age-legacy")
+    try:
+        assert ns.collection().get(include=[])["ids"] == [new]
+    finally:
+        namespaces.release(ns)
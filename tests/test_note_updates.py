@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.core.namespaces import namespaces
+from app.schemas.note_schema import NoteBatchUpdateItem, NoteCreate, NoteUpdate
+from app.service.dedup_service import ensure_dedup_index
+from app.service.lexical_search_service import ensure_lexical_index
+from app.service.note_service import (
+    create_notes_batch_service,
+    delete_notes_batch_service,
+    update_note_service,
+    update_notes_batch_service,
+)
+
+VECTOR = [0.5, -0.25, 0.125, 1.0]
+
+
+@pytest.fixture
+def notes():
+    ns = namespaces.acquire("updates")
+    items = [NoteCreate(title=f"title {i}", content=f"content {i}") for i in range(2)]
+    ids = asyncio.run(create_notes_batch_service(ns, items, [VECTOR, VECTOR]))
+    yield ns, ids
+    asyncio.run(delete_notes_batch_service(ns, ids))
+    namespaces.release(ns)
+
+
+def _stored(ns, note_id):
+    result = ns.collection().get(ids=[note_id], include=["documents", "metadatas", "embeddings"])
+    return result["documents"][0], result["metadatas"][0], [float(v) for v in result["embeddings"][0]]
+
+
+def test_title_only_update_keeps_the_stored_embedding(notes):
+    ns, ids = notes
+
+    asyncio.run(update_note_service(ns, ids[0], NoteUpdate(title="renamed"), None))
+
+    document, metadata, embedding = _stored(ns, ids[0])
+    assert (document, metadata["title"]) == ("content 0", "renamed")
+    assert embedding == pytest.approx(VECTOR)
+
+
+def test_batch_update_without_content_changes_keeps_the_stored_embeddings(notes):
+    ns, ids = notes
+    items = [
+        NoteBatchUpdateItem(id=ids[0], title="renamed"),
+        NoteBatchUpdateItem(id=ids[1], content="content 1"),  # unchanged content
+    ]
+
+    updated, not_found = asyncio.run(update_notes_batch_service(ns, items))
+
+    assert (updated, not_found) == (ids, [])
+    for note_id, title, content in zip(ids, ("renamed", "title 1"), ("content 0", "content 1")):
+        document, metadata, embedding = _stored(ns, note_id)
+        assert (document, metadata["title"]) == (content, title)
+        assert embedding == pytest.approx(VECTOR)
+
+
+def test_blank_content_counts_as_unchanged_in_single_and_batch_updates(notes):
+    ns, ids = notes
+    lexical = ensure_lexical_index(ns)
+    dedup = ensure_dedup_index(ns)
+
+    asyncio.run(update_note_service(ns, ids[0], NoteUpdate(content="   "), None))
+    asyncio.run(update_notes_batch_service(ns, [NoteBatchUpdateItem(id=ids[1], content=" \n ")]))
+
+    for i, note_id in enumerate(ids):
+        document, _, embedding = _stored(ns, note_id)
+        assert document == f"content {i}"
+        assert embedding == pytest.approx(VECTOR)
+        assert dedup.find(dedup.fingerprint(f"content {i}")).note_id == note_id
+    assert {note_id for note_id, _ in lexical.search("content", 5)} == set(ids)
@@ -0,0 +1,24 @@
+from app.core.namespaces import Namespace
+from app.service.search_cache import bump_collection_version, cache_results, get_cached_results, search_cache_key
+
+
+def test_a_write_hides_only_its_own_namespace_results():
+    written, other = Namespace("cache-written"), Namespace("cache-other")
+    keys = {ns: search_cache_key(ns, "  Some   query ", 5) for ns in (written, other)}
+    for ns, key in keys.items():
+        cache_results(ns, key, [ns.name])
+
+    bump_collection_version(written)
+
+    assert get_cached_results(search_cache_key(written, "Some query", 5)) is None
+    assert get_cached_results(search_cache_key(other, "Some query", 5)) == ["cache-other"]
+
+
+def test_results_of_a_search_overtaken_by_a_write_are_not_cached():
+    ns = Namespace("cache-race")
+    key = search_cache_key(ns, "query")
+
+    bump_collection_version(ns)
+    cache_results(ns, key, ["stale"])
+
+    assert get_cached_results(key) is None
@@ -0,0 +1,25 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import SEARCH_MAX_TOP_K
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("engine", ["auto", "hnsw", "exact"])
+@pytest.mark.parametrize("top_k", [0, -1, SEARCH_MAX_TOP_K + 1])
+def test_search_rejects_out_of_range_top_k(engine, top_k):
+    response = client.get("/notes/search", params={"q": "notes", "top_k": top_k, "engine": engine})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("engine", ["auto", "hnsw", "exact"])
+@pytest.mark.parametrize("top_k", [0, -1, SEARCH_MAX_TOP_K + 1])
+def test_batch_search_rejects_out_of_range_top_k(engine, top_k):
+    response = client.post(
+        "/notes/search/batch", params={"engine": engine}, json={"queries": ["notes"], "top_k": top_k}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+import pytest
+
+from app.utils.text_chunker import TextChunker, chunk_text
+
+TEXT = " ".join(f"word{i:03d}" for i in range(300))
+
+
+def test_short_text_is_one_chunk():
+    assert list(chunk_text(["  a short note  "], chunk_size=100, overlap=10)) == ["a short note"]
+
+
+def test_blank_text_has_no_chunks():
+    assert list(chunk_text(["", "   \n"], chunk_size=100, overlap=10)) == []
+
+
+def test_chunks_respect_size_and_word_boundaries():
+    chunks = list(chunk_text([TEXT], chunk_size=100, overlap=0))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == TEXT.split()
+
+
+def test_consecutive_chunks_overlap_on_whole_words():
+    chunks = list(chunk_text([TEXT], chunk_size=100, overlap=30))
+
+    for previous, current in zip(chunks, chunks[1:]):
+        first_word = current.split()[0]
+        assert first_word in previous.split()
+        assert previous.endswith(current[: len(previous) - previous.index(first_word)])
+
+
+def test_output_does_not_depend_on_how_the_text_is_fed():
+    whole = list(chunk_text([TEXT], chunk_size=120, overlap=20))
+    pieces = [TEXT[i : i + 7] for i in range(0, len(TEXT), 7)]
+
+    assert list(chunk_text(pieces, chunk_size=120, overlap=20)) == whole
+
+
+def test_text_without_whitespace_is_cut_at_chunk_size():
+    chunks = list(chunk_text(["x" * 250], chunk_size=100, overlap=0))
+
+    assert chunks == ["x" * 100, "x" * 100, "x" * 50]
+
+
+def test_trailing_overlap_is_not_emitted_again():
+    chunker = TextChunker(chunk_size=10, overlap=4)
+
+    assert chunker.feed("abcd efgh ") == ["abcd efgh"]
+    assert chunker.finish() == []
+
+
+@pytest.mark.parametrize("chunk_size, overlap", [(0, 0), (100, -1), (100, 50)])
+def test_invalid_settings_are_rejected(chunk_size, overlap):
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size, overlap)
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from app.core.vector_matrix import VectorMatrix
+
+
+def _ids(matrix):
+    return sorted(matrix._id_at(i) for i in range(len(matrix)))
+
+
+def test_search_ranks_by_cosine_similarity(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert(["x", "y", "xy"], [[1, 0], [0, 3], [1, 1]])
+
+    results = matrix.search([2, 0.1], k=2)
+
+    assert [note_id for note_id, _ in results] == ["x", "xy"]
+    assert results[0][1] == pytest.approx(2 / np.hypot(2, 0.1))
+    assert [note_id for note_id, _ in matrix.search([0, 1], k=5, ids=["x", "xy"])] == ["xy", "x"]
+
+
+def test_upsert_replaces_existing_rows(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert(["a", "b"], [[1, 0], [0, 1]])
+    matrix.upsert(["a"], [[0, 1]])
+
+    assert len(matrix) == 2
+    assert matrix.search([0, 1], k=2)[1][1] == pytest.approx(1.0)
+
+
+def test_wrong_dimension_is_rejected(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert(["a"], [[1, 0]])
+
+    with pytest.raises(ValueError, match="Expected 2-d"):
+        matrix.upsert(["b"], [[1, 0, 0]])
+
+
+def test_grows_past_initial_capacity(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    ids = [f"n{i}" for i in range(3000)]
+    vectors = np.random.default_rng(0).normal(size=(3000, 16)).astype(np.float32)
+    matrix.upsert(ids, vectors)
+
+    assert len(matrix) == 3000 and matrix.capacity == 4096
+    assert matrix.search(vectors[2999], k=1)[0][0] == "n2999"
+
+
+def test_delete_moves_the_last_row_into_the_gap(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert(["a", "b", "c"], [[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+
+    matrix.delete(["a", "missing"])
+
+    assert len(matrix) == 2 and "a" not in matrix
+    assert matrix._ids[0].decode("utf-8") == "c"
+    assert matrix.search([0, 0, 1], k=1)[0][0] == "c"
+    assert matrix.search([0, 1, 0], k=1)[0][0] == "b"
+
+
+def test_reload_after_flush(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert(["a", "b", "c"], [[1, 0], [0, 1], [1, 1]])
+    matrix.delete(["b"])
+    matrix.flush()
+
+    reloaded = VectorMatrix(str(tmp_path))
+
+    assert len(reloaded) == 2 and reloaded.dim == 2
+    assert _ids(reloaded) == ["a", "c"]
+    assert reloaded.search([1, 1], k=1)[0][0] == "c"
+
+
+def test_other_dtype_on_disk_starts_empty(tmp_path):
+    matrix = VectorMatrix(str(tmp_path), dtype="float32")
+    matrix.upsert(["a"], [[1, 0]])
+    matrix.flush()
+
+    assert len(VectorMatrix(str(tmp_path), dtype="float16")) == 0
+
+
+def test_clear_forgets_rows_and_dimension(tmp_path):
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert(["a"], [[1, 0]])
+    matrix.clear()
+    matrix.upsert(["b"], [[1, 0, 0]])
+
+    assert _ids(matrix) == ["b"] and matrix.dim == 3
+
+
+def test_ids_longer_than_the_id_column_round_trip(tmp_path):
+    long_id = "parent-" + "x" * 80 + ":3"
+    other = "é" * 40  # 80 bytes in UTF-8
+    matrix = VectorMatrix(str(tmp_path))
+    matrix.upsert([long_id, "short", other], [[1, 0], [0, 1], [1, 1]])
+
+    assert matrix.search([1, 0], k=1)[0][0] == long_id
+    assert matrix.search([1, 1], k=1, ids=[other])[0][0] == other
+
+    matrix.delete([long_id])  # moves `other` into the freed row
+    matrix.flush()
+    reopened = VectorMatrix(str(tmp_path))
+
+    assert _ids(reopened) == sorted(["short", other])
+    assert reopened.search([1, 1], k=1)[0][0] == other
+    assert long_id not in reopened